@@ -0,0 +1,83 @@
+"""
+Benchmark do custo fixo por relatório (estilos, modelos de tabela e logomarca)
+
+Gera várias vezes um PDF mínimo (cabeçalho com logomarca, resumo e uma
+tabela de despesas) com e sem os caches de estilos_relatorio. Sem cache,
+cada relatório recria os estilos e decodifica a logomarca, como antes; com
+cache, os relatórios de um lote compartilham esses objetos (a logomarca
+ainda é comprimida em cada PDF).
+
+Uso:
+    python benchmarks/benchmark_estilos_logo.py [relatorios]
+"""
+import io
+import logging
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.platypus import Paragraph, SimpleDocTemplate
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src import estilos_relatorio, relatorio_despesas_aprimorado
+from src.relatorio_despesas_aprimorado import RelatorioHandler
+
+RELATORIOS_PADRAO = 50
+
+DADOS = {
+    'data_relatorio': datetime(2025, 2, 20),
+    'nome_cliente': 'CLIENTE SINTÉTICO',
+    'endereco_cliente': 'RUA DOS TESTES, 100',
+    'numero_relatorio': 12,
+}
+
+DESPESAS = pd.DataFrame({
+    'NOME': [f'FORNECEDOR {i:02d}' for i in range(10)],
+    'VENCIMENTO': pd.date_range('2025-02-20', periods=10),
+    'REFERÊNCIA': ['MATERIAL'] * 10,
+    'VALOR': [1234.56] * 10,
+    'DADOS BANCÁRIOS': ['PIX: 31999999999'] * 10,
+})
+
+
+def limpar_caches():
+    """Volta ao comportamento sem cache: estilos, modelos de tabela e logomarca recriados"""
+    relatorio_despesas_aprimorado.ESTILOS = estilos_relatorio._criar_estilos()
+    estilos_relatorio.estilo_tabela_despesas.cache_clear()
+    estilos_relatorio.leitor_logo.cache_clear()
+
+
+def gerar_relatorio(handler):
+    elementos = []
+    handler.adicionar_cabecalho(elementos, DADOS)
+    elementos.append(Paragraph("RESUMO DAS DESPESAS", handler.config.style_heading))
+    elementos.append(handler.criar_tabela_despesas(
+        DESPESAS, ['NOME', 'VENCIMENTO', 'REFERÊNCIA', 'VALOR', 'DADOS BANCÁRIOS'], [240, 70, 220, 80, 170]))
+    SimpleDocTemplate(io.BytesIO(), pagesize=landscape(A4)).build(elementos)
+
+
+def medir(relatorios, com_cache):
+    inicio = time.perf_counter()
+    for _ in range(relatorios):
+        if not com_cache:
+            limpar_caches()
+        gerar_relatorio(RelatorioHandler())
+    return (time.perf_counter() - inicio) / relatorios
+
+
+def main(relatorios):
+    logging.disable(logging.INFO)
+    gerar_relatorio(RelatorioHandler())  # aquecimento (importações e fontes)
+    sem_cache = medir(relatorios, com_cache=False)
+    com_cache = medir(relatorios, com_cache=True)
+    print(f"{'relatórios':>10} | {'sem cache':>10} | {'com cache':>10} | {'ganho':>7}")
+    print(f"{relatorios:>10} | {sem_cache * 1000:8.1f}ms | {com_cache * 1000:8.1f}ms | "
+          f"{sem_cache / com_cache:6.1f}x")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else RELATORIOS_PADRAO)
@@ -0,0 +1,44 @@
+"""
+Benchmark da geração de relatórios em lote
+
+Gera os relatórios de todas as planilhas de uma pasta com diferentes
+quantidades de processos e mostra o tempo total, o ganho em relação a um
+processo e o tempo de cada arquivo. Os PDFs são gravados na própria pasta
+(use uma cópia da pasta de clientes).
+
+Uso:
+    python benchmarks/benchmark_lote_relatorios.py <pasta> <dd/mm/aaaa> [processos ...]
+"""
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.lote_relatorios import LoteRelatorios, arquivos_da_pasta
+
+
+def main(pasta, data_rel, processos):
+    arquivos = arquivos_da_pasta(pasta)
+    print(f"{len(arquivos)} arquivos, {os.cpu_count()} núcleos")
+
+    base = None
+    for max_workers in processos:
+        inicio = time.perf_counter()
+        resultados = LoteRelatorios(arquivos, data_rel, max_workers=max_workers).iniciar().aguardar()
+        total = time.perf_counter() - inicio
+        base = base or total
+        erros = sum(1 for r in resultados if not r.sucesso)
+        print(f"\n{max_workers:>2} processo(s): {total:7.2f}s | ganho {base / total:4.2f}x | erros: {erros}")
+        for r in resultados:
+            print(f"    {r.segundos:6.2f}s  {r.nome_arquivo}{'' if r.sucesso else ' - ' + r.erro}")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 3:
+        print(__doc__)
+        sys.exit(1)
+    main(sys.argv[1], datetime.strptime(sys.argv[2], '%d/%m/%Y'),
+         [int(p) for p in sys.argv[3:]] or [1, 2, 4, os.cpu_count() or 1])
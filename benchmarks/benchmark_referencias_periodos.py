@@ -0,0 +1,110 @@
+"""
+Benchmark da montagem de REFERÊNCIA (NF) e dos períodos dos lançamentos futuros
+
+Compara as versões linha a linha (apply com lambdas, comportamento anterior
+de carregar_dados_excel e processar_lancamentos_futuros) com as versões
+vetorizadas do RelatorioHandler, em uma aba Dados sintética. Também confere
+que os dois caminhos produzem o mesmo resultado.
+
+Uso:
+    python benchmarks/benchmark_referencias_periodos.py [linhas ...]
+"""
+import logging
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.cache_dados import normalizar_dados
+from src.relatorio_despesas_aprimorado import RelatorioHandler
+
+TAMANHOS_PADRAO = [50000]
+DATA_RELATORIO = pd.Timestamp(2025, 2, 20)
+
+
+class SessaoSintetica:
+    """Substitui a SessaoPlanilha: devolve a aba Dados já montada"""
+
+    def __init__(self, df):
+        self.df = df
+
+    def dados(self):
+        return self.df
+
+
+def criar_dados(linhas, semente=0):
+    rng = np.random.default_rng(semente)
+    datas_rel = DATA_RELATORIO + pd.to_timedelta(rng.integers(-24, 12, linhas) * 15, unit='D')
+    nf = rng.integers(1, 99999, linhas).astype(object)
+    nf[rng.random(linhas) < 0.4] = np.nan
+    return pd.DataFrame({
+        'DATA_REL': datas_rel,
+        'TP_DESP': rng.integers(1, 8, linhas).astype(float),
+        'NOME': [f'FORNECEDOR {i % 500:03d}' for i in range(linhas)],
+        'REFERÊNCIA': rng.choice(['MATERIAL', 'LOCAÇÃO', 'SERVIÇO', 'SALÁRIO'], linhas),
+        'NF': nf,
+        'VALOR': rng.integers(100, 500000, linhas) / 100,
+        'DT_VENCTO': datas_rel + pd.Timedelta(days=5),
+        'DADOS_BANCARIOS': 'PIX: 31999999999',
+    })
+
+
+def referencias_linha_a_linha(df):
+    df = df.copy()
+    mascara = (df['TP_DESP'] != 1) & (df['NF'].str.strip() != '') & (df['NF'] != 'nan')
+    df.loc[mascara, 'REFERÊNCIA'] = df[mascara].apply(
+        lambda row: f"{row['REFERÊNCIA']} (NF: {row['NF'].strip()})",
+        axis=1
+    )
+    return df
+
+
+def periodos_linha_a_linha(datas, data_ref):
+    tipos_despesas_futuras = {
+        "Próximos 30 dias": lambda x: x <= data_ref + pd.Timedelta(days=30),
+        "31 a 60 dias": lambda x: (x > data_ref + pd.Timedelta(days=30)) &
+                                 (x <= data_ref + pd.Timedelta(days=60)),
+        "Após 60 dias": lambda x: x > data_ref + pd.Timedelta(days=60)
+    }
+    return datas.apply(
+        lambda x: next((nome for nome, func in tipos_despesas_futuras.items() if func(x)), "Após 60 dias")
+    )
+
+
+def medir(funcao, *argumentos, repeticoes=5):
+    """Resultado e menor tempo entre as repetições"""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao(*argumentos)
+        tempos.append(time.perf_counter() - inicio)
+    return resultado, min(tempos)
+
+
+def main(tamanhos):
+    logging.disable(logging.INFO)
+    handler = RelatorioHandler()
+    print(f"{'linhas':>8} | {'etapa':<12} | {'apply':>8} | {'vetorizado':>10} | {'ganho':>7}")
+    for linhas in tamanhos:
+        dados = criar_dados(linhas)
+
+        antes, t_antes = medir(referencias_linha_a_linha, normalizar_dados(dados))
+        depois, t_depois = medir(handler.carregar_dados_excel, None, SessaoSintetica(dados))
+        # carregar_dados_excel também normaliza os tipos: descontar esse tempo
+        _, t_normalizar = medir(normalizar_dados, dados)
+        assert antes['REFERÊNCIA'].equals(depois['REFERÊNCIA'])
+        t_depois = max(t_depois - t_normalizar, 1e-9)
+        print(f"{linhas:>8} | {'REFERÊNCIA':<12} | {t_antes:7.3f}s | {t_depois:9.3f}s | {t_antes / t_depois:6.1f}x")
+
+        futuro, t_depois = medir(handler.processar_lancamentos_futuros, depois, DATA_RELATORIO)
+        periodos, t_antes = medir(periodos_linha_a_linha, futuro['DATA_REL'], DATA_RELATORIO)
+        assert (periodos == futuro['periodo'].astype(str)).all()
+        print(f"{linhas:>8} | {'períodos':<12} | {t_antes:7.3f}s | {t_depois:9.3f}s | {t_antes / t_depois:6.1f}x")
+
+
+if __name__ == '__main__':
+    main([int(t) for t in sys.argv[1:]] or TAMANHOS_PADRAO)
@@ -0,0 +1,49 @@
+"""
+Benchmark da memória da saída capturada pelo OutputManager
+
+Simula um dia de uso escrevendo muitas linhas (como os prints por célula e
+por linha dos laços de processamento) na captura anterior (StringIO) e na
+SaidaLimitada, e mede a memória retida (tracemalloc) ao longo da escrita.
+Com a SaidaLimitada a memória fica estável depois das primeiras max_linhas.
+
+Uso:
+    python benchmarks/benchmark_saida_limitada.py [linhas]
+"""
+import sys
+import time
+import tracemalloc
+from io import StringIO
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.saida_limitada import SaidaLimitada
+
+LINHAS_PADRAO = 1_000_000
+MEDICOES = 5
+
+
+def medir(buffer, linhas):
+    """Memória retida (MB) após cada quinto das linhas e o tempo por linha"""
+    memoria = []
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    for i in range(linhas):
+        print(f"Processando linha {i}: célula B{i % 150 + 9} = {i * 1.5:.2f}", file=buffer)
+        if (i + 1) % (linhas // MEDICOES) == 0:
+            memoria.append(tracemalloc.get_traced_memory()[0] / 2 ** 20)
+    segundos = time.perf_counter() - inicio
+    tracemalloc.stop()
+    return memoria, segundos / linhas
+
+
+def main(linhas):
+    print(f"{'captura':<14} | " + " | ".join(f"{linhas * (i + 1) // MEDICOES:>9}" for i in range(MEDICOES))
+          + f" | {'por linha':>9}")
+    for nome, buffer in [('StringIO', StringIO()), ('SaidaLimitada', SaidaLimitada())]:
+        memoria, por_linha = medir(buffer, linhas)
+        print(f"{nome:<14} | " + " | ".join(f"{m:7.1f}MB" for m in memoria) + f" | {por_linha * 1e6:7.2f}us")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else LINHAS_PADRAO)
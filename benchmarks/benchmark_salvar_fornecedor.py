@@ -0,0 +1,114 @@
+"""
+Benchmark da gravação de um fornecedor na base de fornecedores
+
+Compara a reescrita completa da aba (comportamento anterior de
+salvar_na_base_fornecedores: ler tudo, ordenar, limpar e regravar) com a
+gravação incremental do RegistroFornecedores, que altera apenas a linha do
+CNPJ/CPF. Para cada tamanho de base são medidos o tempo total (incluindo
+abrir e salvar o arquivo) e o tempo gasto apenas na edição da aba.
+
+Uso:
+    python benchmarks/benchmark_salvar_fornecedor.py [tamanho ...]
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from openpyxl import Workbook, load_workbook
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.registro_fornecedores import RegistroFornecedores, TOTAL_COLUNAS, normalizar_documento
+
+TAMANHOS_PADRAO = [1000, 5000, 20000]
+
+
+def criar_base(arquivo, tamanho):
+    wb = Workbook()
+    ws = wb.active
+    ws.title = 'Fornecedores'
+    ws.append(['CNPJ/CPF', 'TIPO', 'RAZÃO SOCIAL', 'NOME', 'TELEFONE', 'EMAIL', 'BANCO', 'OP',
+               'AGÊNCIA', 'CONTA', 'PIX', 'CATEGORIA', 'ESPECIFICAÇÃO', 'VÍNCULO', 'DADOS BANCÁRIOS'])
+    for i in range(tamanho):
+        ws.append([str(10 ** 13 + i), 'PJ', f'EMPRESA {i} LTDA', f'FORNECEDOR {i:06d}', '', '',
+                   'BANCO', '', '0001', str(i), f'pix{i}', 'MATERIAL', 'DIVERSOS', '', f'PIX: pix{i}'])
+    wb.save(arquivo)
+
+
+def fornecedor(cnpj_cpf, nome):
+    return [cnpj_cpf, 'PJ', f'{nome} LTDA', nome, '', '', 'BANCO', '', '0001', '1', 'pix', 'MATERIAL',
+            'DIVERSOS', '', 'PIX: pix']
+
+
+def reescrita_completa(arquivo, row):
+    """Reproduz a gravação anterior: reescreve toda a aba ordenada por nome"""
+    inicio = time.perf_counter()
+    wb = load_workbook(arquivo)
+    ws = wb['Fornecedores']
+    inicio_edicao = time.perf_counter()
+
+    linhas = [list(r) for r in ws.iter_rows(min_row=2, values_only=True) if r[0]]
+    for i, existente in enumerate(linhas):
+        if existente[0] == row[0]:
+            linhas[i] = list(row)
+            break
+    else:
+        linhas.append(list(row))
+    linhas.sort(key=lambda r: (r[3].upper(), r[0]))
+    for r in ws.iter_rows(min_row=2):
+        for cell in r:
+            cell.value = None
+    for i, valores in enumerate(linhas, start=2):
+        for coluna in range(TOTAL_COLUNAS):
+            ws.cell(row=i, column=coluna + 1, value=valores[coluna])
+
+    edicao = time.perf_counter() - inicio_edicao
+    wb.save(arquivo)
+    return time.perf_counter() - inicio, edicao
+
+
+def gravacao_incremental(registro, row):
+    """Gravação pelo registro; a edição é a localização pelo índice e a escrita de uma linha"""
+    inicio = time.perf_counter()
+    registro.salvar(row)
+    total = time.perf_counter() - inicio
+
+    # Tempo só da edição, repetindo os passos em memória num workbook já aberto
+    wb = load_workbook(registro.arquivo)
+    ws = wb['Fornecedores']
+    inicio_edicao = time.perf_counter()
+    posicao = registro._posicao(normalizar_documento(row[0]))
+    linha = posicao + 2 if posicao is not None else ws.max_row + 1
+    for coluna, valor in enumerate(row, start=1):
+        ws.cell(row=linha, column=coluna, value=valor)
+    edicao = time.perf_counter() - inicio_edicao
+    wb.close()
+    return total, edicao
+
+
+def main(tamanhos):
+    print(f"{'base':>7} | {'operação':<10} | {'reescrita total':>15} | {'reescrita edição':>16} | "
+          f"{'incremental total':>17} | {'incremental edição':>18}")
+    with tempfile.TemporaryDirectory() as pasta:
+        for tamanho in tamanhos:
+            antigo = Path(pasta) / f'antigo_{tamanho}.xlsx'
+            novo = Path(pasta) / f'novo_{tamanho}.xlsx'
+            criar_base(antigo, tamanho)
+            criar_base(novo, tamanho)
+            registro = RegistroFornecedores(novo)
+            registro.linhas()  # carga inicial do índice, fora da medição
+
+            casos = [
+                ('alteração', fornecedor(str(10 ** 13 + tamanho // 2), 'FORNECEDOR ALTERADO')),
+                ('inclusão', fornecedor('99999999000199', 'FORNECEDOR NOVO')),
+            ]
+            for operacao, row in casos:
+                total_antigo, edicao_antigo = reescrita_completa(antigo, row)
+                total_novo, edicao_novo = gravacao_incremental(registro, row)
+                print(f"{tamanho:>7} | {operacao:<10} | {total_antigo:>14.3f}s | {edicao_antigo:>15.3f}s | "
+                      f"{total_novo:>16.3f}s | {edicao_novo * 1000:>16.3f}ms")
+
+
+if __name__ == '__main__':
+    main([int(t) for t in sys.argv[1:]] or TAMANHOS_PADRAO)
@@ -0,0 +1,180 @@
+"""
+Benchmark das seções com tabelas longas de um cliente com muitos lançamentos
+
+Gera as seções LANÇAMENTOS FUTUROS e DETALHES DAS DESPESAS de um cliente
+sintético (20.000 lançamentos futuros por padrão) com as tabelas longas
+montadas em blocos de LongTable (criar_tabela_longa) e confere o tempo e o
+pico de memória (tracemalloc) contra os orçamentos abaixo. Com --comparar,
+mede também a Table única (modo anterior) para o mesmo cliente, o que pode
+levar vários minutos.
+
+Confere ainda a paginação dos detalhes, onde cada tabela segue um título com
+keepWithNext: com tabelas pequenas montadas em blocos, o número de páginas
+deve ser o mesmo da Table única.
+
+Uso:
+    python benchmarks/benchmark_tabela_longa.py [linhas] [--comparar]
+
+Sai com código 1 se algum orçamento for excedido ou se a paginação divergir.
+"""
+import io
+import logging
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.platypus import SimpleDocTemplate, Spacer
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.relatorio_despesas_aprimorado import LIMITE_TABELA_LONGA, RelatorioHandler
+
+LINHAS_PADRAO = 20000
+DATA_RELATORIO = pd.Timestamp(2025, 2, 20)
+DATA_DETALHES = DATA_RELATORIO + pd.Timedelta(days=15)
+
+# Paginação dos detalhes: lançamentos do cliente e altura ocupada antes do título
+LINHAS_PAGINACAO = (20, 60, 200)
+ESPACOS_PAGINACAO = (0, 250, 400)
+
+# Orçamentos do modo em blocos: tempo para LINHAS_PADRAO lançamentos (escalado
+# linearmente para outros tamanhos) e pico de memória (fixo: só o bloco da página
+# atual fica em memória, além dos dados e do PDF gerado)
+ORCAMENTO_SEGUNDOS = 30.0
+ORCAMENTO_MEMORIA_MB = 64.0
+
+
+class SessaoSintetica:
+    """Substitui a SessaoPlanilha: devolve a aba Dados já montada"""
+
+    def __init__(self, df):
+        self.df = df
+
+    def dados(self):
+        return self.df
+
+
+def criar_dados(linhas, semente=0):
+    """Aba Dados com todos os lançamentos após a data do relatório, concentrados em boletos"""
+    rng = np.random.default_rng(semente)
+    datas_rel = DATA_RELATORIO + pd.to_timedelta(rng.integers(1, 7, linhas) * 15, unit='D')
+    nf = rng.integers(1, 99999, linhas).astype(object)
+    nf[rng.random(linhas) < 0.4] = np.nan
+    referencias = rng.choice(['MATERIAL', 'LOCAÇÃO', 'SERVIÇO',
+                              'MATERIAL ELÉTRICO, HIDRÁULICO E DE ACABAMENTO PARA AS UNIDADES DO BLOCO B'],
+                             linhas, p=[0.4, 0.2, 0.3, 0.1])
+    return pd.DataFrame({
+        'DATA_REL': datas_rel,
+        'TP_DESP': rng.choice([2, 3, 4], linhas, p=[0.2, 0.7, 0.1]).astype(float),
+        'NOME': [f'FORNECEDOR {i % 500:03d}' for i in range(linhas)],
+        'REFERÊNCIA': referencias,
+        'NF': nf,
+        'VALOR': rng.integers(100, 500000, linhas) / 100,
+        'DT_VENCTO': datas_rel + pd.Timedelta(days=5),
+        'DADOS_BANCARIOS': 'PIX: 31999999999',
+    })
+
+
+def gravar(elementos):
+    """Grava os elementos em um PDF em memória; retorna o número de páginas"""
+    doc = SimpleDocTemplate(io.BytesIO(), pagesize=landscape(A4),
+                            rightMargin=30, leftMargin=30, topMargin=40, bottomMargin=30)
+    doc.build(elementos)
+    return doc.page
+
+
+def gerar_futuros(handler, df):
+    """Monta e grava a seção de lançamentos futuros; retorna o número de páginas"""
+    elementos = []
+    handler.adicionar_lancamentos_futuros(elementos, {'df_futuro': df})
+    return gravar(elementos)
+
+
+def gerar_detalhes(handler, df, espaco=0):
+    """Monta e grava a seção de detalhes após espaco pontos já ocupados; retorna o número de páginas"""
+    elementos = [Spacer(1, espaco)] if espaco else []
+    vazio = df.iloc[0:0]
+    handler.adicionar_detalhes(elementos, {'df_filtrado': df, 'df_diaria': vazio,
+                                           'df_tp_desp_1': vazio, 'df_tp_desp_2': vazio})
+    return gravar(elementos)
+
+
+def medir(gerar_secao, handler, df):
+    """Páginas, tempo (sem tracemalloc) e pico de memória em MB (com tracemalloc)"""
+    inicio = time.perf_counter()
+    paginas = gerar_secao(handler, df)
+    segundos = time.perf_counter() - inicio
+
+    tracemalloc.start()
+    gerar_secao(handler, df)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return paginas, segundos, pico / 2 ** 20
+
+
+def conferir_paginacao(handler):
+    """Casos (linhas, espaço, páginas em blocos, páginas com Table única) em que a paginação diverge"""
+    divergentes = []
+    for linhas in LINHAS_PAGINACAO:
+        df = handler.carregar_dados_excel(None, SessaoSintetica(criar_dados(linhas)))
+        df_filtrado = handler.processar_dados(df, DATA_DETALHES)[0]
+        for espaco in ESPACOS_PAGINACAO:
+            paginas = []
+            for limite in (3, np.inf):  # toda tabela com mais de 3 linhas em blocos / nenhuma
+                handler.limite_tabela_longa = limite
+                paginas.append(gerar_detalhes(handler, df_filtrado, espaco))
+            if paginas[0] != paginas[1]:
+                divergentes.append((linhas, espaco, *paginas))
+    handler.limite_tabela_longa = LIMITE_TABELA_LONGA
+    return divergentes
+
+
+def main(linhas, comparar):
+    logging.disable(logging.INFO)
+    handler = RelatorioHandler()
+    df = handler.carregar_dados_excel(None, SessaoSintetica(criar_dados(linhas)))
+    secoes = [('futuros', gerar_futuros, handler.processar_lancamentos_futuros(df, DATA_RELATORIO)),
+              ('detalhes', gerar_detalhes, handler.processar_dados(df, DATA_DETALHES)[0])]
+
+    modos = [('blocos', handler.limite_tabela_longa)]
+    if comparar:
+        modos.append(('tabela única', np.inf))
+
+    print(f"{'seção':<8} | {'linhas':>8} | {'modo':<12} | {'páginas':>7} | {'tempo':>8} | {'memória':>9}")
+    excedidos = []
+    for secao, gerar_secao, df_secao in secoes:
+        medicoes = {}
+        for modo, limite in modos:
+            handler.limite_tabela_longa = limite
+            paginas, segundos, memoria = medir(gerar_secao, handler, df_secao)
+            medicoes[modo] = (segundos, memoria)
+            print(f"{secao:<8} | {len(df_secao):>8} | {modo:<12} | {paginas:>7} | {segundos:7.2f}s | "
+                  f"{memoria:7.1f}MB")
+        handler.limite_tabela_longa = LIMITE_TABELA_LONGA
+
+        escala = len(df_secao) / LINHAS_PADRAO
+        segundos, memoria = medicoes['blocos']
+        if segundos > ORCAMENTO_SEGUNDOS * escala:
+            excedidos.append(f"{secao}: tempo {segundos:.2f}s > {ORCAMENTO_SEGUNDOS * escala:.2f}s")
+        if memoria > ORCAMENTO_MEMORIA_MB:
+            excedidos.append(f"{secao}: memória {memoria:.1f}MB > {ORCAMENTO_MEMORIA_MB:.1f}MB")
+
+    divergentes = conferir_paginacao(handler)
+    for linhas_cliente, espaco, paginas_blocos, paginas_tabela in divergentes:
+        print(f"Paginação dos detalhes divergente ({linhas_cliente} lançamentos, {espaco}pt antes do título): "
+              f"{paginas_blocos} página(s) em blocos, {paginas_tabela} com a Table única")
+    if excedidos:
+        print("Orçamento excedido: " + "; ".join(excedidos))
+    if excedidos or divergentes:
+        return 1
+    print("Dentro do orçamento; paginação dos detalhes igual à da Table única")
+    return 0
+
+
+if __name__ == '__main__':
+    argumentos = [a for a in sys.argv[1:] if a != '--comparar']
+    sys.exit(main(int(argumentos[0]) if argumentos else LINHAS_PADRAO, '--comparar' in sys.argv[1:]))
@@ -88,6 +88,11 @@ except Exception as e:
 
 # Modificação para usar o método de utils.py
 from src.config.utils import buscar_dados_bancarios_fornecedor
+from src.registro_fornecedores import obter_registro_fornecedores, CAMPOS_FORNECEDOR
+from src.registro_clientes import obter_registro_clientes
+from src.contratos_adm import ContratosADM
+from src.fechamento_quinzena import planejar_taxas_fixas, calcular_vencimento_fixo
+from src.quinzena import datas_quinzenais, deslocar, ajustar, eh_data_quinzena
 
 
 class VisualizadorLancamentos:
@@ -1080,26 +1085,22 @@ class SistemaEntradaDados:
             
             print("Arquivo copiado com sucesso")
                 
-            # Buscar data inicial do arquivo clientes.xlsx
-            wb_clientes = load_workbook(ARQUIVO_CLIENTES)
-            ws_clientes = wb_clientes['Clientes']
+            # Buscar data inicial do cliente no registro de clientes (clientes.xlsx)
+            cadastro = obter_registro_clientes(ARQUIVO_CLIENTES).buscar(nome_cliente)
             
             data_inicial = None
-            # Procurar o cliente e sua data inicial
-            for row in range(2, ws_clientes.max_row + 1):
-                if ws_clientes.cell(row=row, column=1).value == nome_cliente:
-                    data_valor = ws_clientes.cell(row=row, column=3).value  # Coluna C
-                    if not data_valor:
-                        raise Exception("Data inicial não informada no cadastro do cliente")
-                        
-                    if isinstance(data_valor, datetime):
-                        data_inicial = data_valor.date()
-                    else:
-                        try:
-                            data_inicial = datetime.strptime(str(data_valor), '%Y-%m-%d').date()
-                        except ValueError:
-                            raise Exception("Data inicial deve estar no formato AAAA-MM-DD")
-                    break
+            if cadastro:
+                data_valor = cadastro['data_inicial']  # Coluna C
+                if not data_valor:
+                    raise Exception("Data inicial não informada no cadastro do cliente")
+                    
+                if isinstance(data_valor, datetime):
+                    data_inicial = data_valor.date()
+                else:
+                    try:
+                        data_inicial = datetime.strptime(str(data_valor), '%Y-%m-%d').date()
+                    except ValueError:
+                        raise Exception("Data inicial deve estar no formato AAAA-MM-DD")
             
             if not data_inicial:
                 raise Exception("Cliente não encontrado no cadastro")
@@ -1125,31 +1126,14 @@ class SistemaEntradaDados:
             resumo_sheet["L3"] = data_inicial
             resumo_sheet["L3"].number_format = 'dd/mm/yyyy'
             
-            # Gerar as 96 datas quinzenais
-            data_atual = data_inicial
-            datas_geradas = []
-            
-            for i in range(96):  # 4 anos = 96 relatórios
-                row = i + 9  # Começar na linha 9
-                
-                # Verificar se a data já foi usada
-                if data_atual in datas_geradas:
-                    raise Exception(f"Data duplicada detectada: {data_atual.strftime('%d/%m/%Y')}")
-                datas_geradas.append(data_atual)
+            # Gerar as 96 datas quinzenais (4 anos = 96 relatórios), a partir da linha 9
+            for i, data_atual in enumerate(datas_quinzenais(data_inicial, 96)):
+                row = i + 9
                 
                 # Adicionar data e número do relatório
                 resumo_sheet.cell(row=row, column=1, value=data_atual)
                 resumo_sheet.cell(row=row, column=1).number_format = 'dd/mm/yyyy'
                 resumo_sheet.cell(row=row, column=2, value=i + 1)
-                
-                # Próxima data
-                if data_atual.day == 5:
-                    data_atual = data_atual.replace(day=20)
-                else:  # day == 20
-                    if data_atual.month == 12:
-                        data_atual = data_atual.replace(year=data_atual.year + 1, month=1, day=5)
-                    else:
-                        data_atual = data_atual.replace(month=data_atual.month + 1, day=5)
 
             # Criar aba Contratos_ADM
             contratos_sheet = workbook.create_sheet("Contratos_ADM")
@@ -1190,14 +1174,11 @@ class SistemaEntradaDados:
             
             # Salvar alterações
             workbook.save(novo_arquivo)
-            wb_clientes.close()
             
             return True
             
         except Exception as e:
             messagebox.showerror("Erro", f"Erro ao criar arquivo do cliente: {str(e)}")
-            if 'wb_clientes' in locals():
-                wb_clientes.close()
             return False
 
 
@@ -1211,22 +1192,7 @@ class SistemaEntradaDados:
 
         try:
             # Carregar dados do cliente
-            wb = load_workbook(ARQUIVO_CLIENTES)
-            ws = wb['Clientes']
-            
-            dados_cliente = None
-            
-            for row in ws.iter_rows(min_row=2, values_only=True):
-                if row[0] == cliente_selecionado:
-                    dados_cliente = {
-                        'nome': row[0],
-                        'endereco': row[1],
-                        'data_inicial': row[2],
-                        'observacoes': row[3]
-                    }
-                    break
-            
-            wb.close()
+            dados_cliente = obter_registro_clientes(ARQUIVO_CLIENTES).buscar(cliente_selecionado)
             
             if not dados_cliente:
                 messagebox.showerror("Erro", "Cliente não encontrado!")
@@ -1337,23 +1303,11 @@ class SistemaEntradaDados:
     def atualizar_lista_clientes(self):
         """Atualiza a lista de clientes baseado nos arquivos Excel disponíveis"""
         try:
-            # Carregar arquivo de clientes
-            caminho_base = ARQUIVO_CLIENTES
-            workbook = load_workbook(caminho_base)
-            sheet = workbook['Clientes']  # Assumindo que existe uma aba chamada 'Clientes'
-            
-            # Limpar lista atual
-            self.cliente_combobox['values'] = []
-            
-            # Pegar todos os clientes (pulando o cabeçalho)
-            clientes = []
-            for row in sheet.iter_rows(min_row=2, values_only=True):
-                if row[0]:  # Nome do cliente está na primeira coluna
-                    clientes.append(row[0])
+            # Pegar todos os clientes do registro (relido só se clientes.xlsx mudar)
+            clientes = obter_registro_clientes(ARQUIVO_CLIENTES).nomes()
             
             # Atualizar combobox
             self.cliente_combobox['values'] = sorted(clientes)
-            workbook.close()
             
         except FileNotFoundError:
             # Se o arquivo não existir, criar novo
@@ -1393,7 +1347,8 @@ class SistemaEntradaDados:
         ttk.Label(busca_interno, text="Nome:", font=('Arial', 10)).pack(side='left', padx=5)
         self.busca_entry = ttk.Entry(busca_interno, font=('Arial', 10), width=40)
         self.busca_entry.pack(side='left', padx=5)
-        self.busca_entry.bind('<Return>', lambda e: self.buscar_fornecedor())
+        # Busca enquanto digita (inclui a tecla Enter)
+        self.busca_entry.bind('<KeyRelease>', lambda e: self.buscar_fornecedor())
 
         # Botão de busca
         ttk.Button(busca_interno, 
@@ -1543,15 +1498,8 @@ class SistemaEntradaDados:
         ttk.Label(frame_data_interno, text="Data do Relatório:", font=('Arial', 10)).pack(side='left', padx=5)
         
         def calcular_data_rel():
-            hoje = datetime.now()
-            if 6 <= hoje.day <= 20:
-                data_rel = hoje.replace(day=20)
-            else:
-                if hoje.day > 20:
-                    data_rel = (hoje + relativedelta(months=1)).replace(day=5)
-                else:
-                    data_rel = hoje.replace(day=5)
-            return data_rel
+            # Próximo dia 5 ou 20 a partir de hoje
+            return ajustar(datetime.now())
 
         self.data_rel_entry = DateEntry(
             frame_data_interno,
@@ -1993,15 +1941,8 @@ class SistemaEntradaDados:
             if success:
                 messagebox.showinfo("Sucesso", 
                                   f"Todas as {len(self.gestor_parcelas.parcelas)} parcelas foram processadas!")
-                # Calcular a data de referência padrão
-                hoje = datetime.now()
-                if 6 <= hoje.day <= 20:
-                    data_rel = hoje.replace(day=20)
-                else:
-                    if hoje.day > 20:
-                        data_rel = (hoje + relativedelta(months=1)).replace(day=5)
-                    else:
-                        data_rel = hoje.replace(day=5)
+                # Calcular a data de referência padrão (próximo dia 5 ou 20)
+                data_rel = ajustar(datetime.now())
                 
                 # Restaurar a data de referência padrão
                 self.data_rel_entry.set_date(data_rel)
@@ -2265,16 +2206,12 @@ class SistemaEntradaDados:
 
     def buscar_dados_bancarios(self, cnpj_cpf):
         try:
-            wb = load_workbook(ARQUIVO_FORNECEDORES, data_only=True)
-            ws = wb['Fornecedores']
-        
-            for row in ws.iter_rows(min_row=2, values_only=True):
-                if row[0] == cnpj_cpf:
-                    print(f"CNPJ/CPF encontrado: {cnpj_cpf}")
-                    print(f"Dados da linha: {row}")
-                    if row[14]:  # coluna O com dados bancários consolidados
-                        return row[14]
-                    return ""
+            row = obter_registro_fornecedores(ARQUIVO_FORNECEDORES).buscar(cnpj_cpf)
+            if row is not None:
+                print(f"CNPJ/CPF encontrado: {cnpj_cpf}")
+                print(f"Dados da linha: {row}")
+                if row[14]:  # coluna O com dados bancários consolidados
+                    return row[14]
             return ""
         except Exception as e:
             print(f"Erro ao buscar dados bancários: {e}")
@@ -2302,32 +2239,8 @@ class SistemaEntradaDados:
     def buscar_fornecedor_completo(self, cnpj_cpf):
         """Busca todos os dados de um fornecedor"""
         try:
-            wb = load_workbook(ARQUIVO_FORNECEDORES, data_only=True)
-            ws = wb['Fornecedores']
-        
-            cnpj_cpf = str(cnpj_cpf).zfill(14)  # Preenche com zeros à esquerda
-            for row in ws.iter_rows(min_row=2):
-                # Garante que o CNPJ/CPF da planilha também tenha 14 dígitos
-                row_cnpj = str(row[0].value or '').zfill(14)
-                if row_cnpj == cnpj_cpf:
-                    fornecedor = {
-                        'cnpj_cpf': row[0].value,
-                        'tipo_pessoa': row[1].value,
-                        'razao_social': row[2].value,
-                        'nome': row[3].value,
-                        'telefone': row[4].value,
-                        'email': row[5].value,
-                        'banco': row[6].value,
-                        'op': row[7].value,
-                        'agencia': row[8].value,
-                        'conta': row[9].value,
-                        'chave_pix': row[10].value,
-                        'categoria': row[11].value,
-                        'especificacao': row[12].value,
-                        'vinculo': row[13].value,
-                    }
-                    return fornecedor
-            return None
+            # CNPJ/CPF normalizado (zeros à esquerda) no índice do registro
+            return obter_registro_fornecedores(ARQUIVO_FORNECEDORES).fornecedor_completo(cnpj_cpf)
         except Exception as e:
             print(f"Erro ao buscar fornecedor: {e}")
             return None
@@ -2570,78 +2483,11 @@ class SistemaEntradaDados:
             messagebox.showerror("Erro", f"Erro ao salvar fornecedor: {str(e)}")
 
     def salvar_na_base_fornecedores(self, dados):
-        """Salva os dados na planilha de fornecedores"""
+        """Salva os dados na planilha de fornecedores (atualiza ou inclui a linha do CNPJ/CPF)"""
         try:
-            wb = load_workbook(ARQUIVO_FORNECEDORES)
-            ws = wb['Fornecedores']
-            
-            # Coletar todos os dados existentes e o novo
-            fornecedores = []
-            
-            # Converter dados existentes mantendo formato original da planilha
-            for row in ws.iter_rows(min_row=2, values_only=True):
-                if row[0]:  # Se tem CNPJ/CPF
-                    fornecedor = {
-                        'cnpj_cpf': row[0],
-                        'tipo_pessoa': row[1],
-                        'razao_social': row[2],
-                        'nome': row[3],
-                        'telefone': row[4],
-                        'email': row[5],
-                        'banco': row[6],
-                        'op': row[7],
-                        'agencia': row[8],
-                        'conta': row[9],
-                        'chave_pix': row[10],
-                        'categoria': row[11],
-                        'especificacao': row[12],
-                        'vinculo': row[13],
-                        'dados_bancarios': row[14]
-                    }
-                    fornecedores.append(fornecedor)
-            
-            # Adicionar novo fornecedor ou atualizar existente
-            fornecedor_encontrado = False
-            for i, fornecedor in enumerate(fornecedores):
-                if fornecedor['cnpj_cpf'] == dados['cnpj_cpf']:
-                    fornecedores[i] = dados.copy()
-                    fornecedor_encontrado = True
-                    break
-            
-            if not fornecedor_encontrado:
-                fornecedores.append(dados.copy())
-            
-            # Ordenar por nome e CNPJ/CPF
-            fornecedores_ordenados = sorted(
-                fornecedores,
-                key=lambda x: (x['nome'].upper(), x['cnpj_cpf'])
+            obter_registro_fornecedores(ARQUIVO_FORNECEDORES).salvar(
+                [dados.get(campo) for campo in CAMPOS_FORNECEDOR + ['dados_bancarios']]
             )
-            
-            # Limpar planilha existente
-            for row in ws.iter_rows(min_row=2):
-                for cell in row:
-                    cell.value = None
-            
-            # Reescrever dados ordenados
-            for i, fornecedor in enumerate(fornecedores_ordenados, start=2):
-                ws.cell(row=i, column=1, value=fornecedor['cnpj_cpf'])
-                ws.cell(row=i, column=2, value=fornecedor['tipo_pessoa'])
-                ws.cell(row=i, column=3, value=fornecedor['razao_social'])
-                ws.cell(row=i, column=4, value=fornecedor['nome'])
-                ws.cell(row=i, column=5, value=fornecedor['telefone'])
-                ws.cell(row=i, column=6, value=fornecedor['email'])
-                ws.cell(row=i, column=7, value=fornecedor['banco'])
-                ws.cell(row=i, column=8, value=fornecedor['op'])
-                ws.cell(row=i, column=9, value=fornecedor['agencia'])
-                ws.cell(row=i, column=10, value=fornecedor['conta'])
-                ws.cell(row=i, column=11, value=fornecedor['chave_pix'])
-                ws.cell(row=i, column=12, value=fornecedor['categoria'])
-                ws.cell(row=i, column=13, value=fornecedor['especificacao'])
-                ws.cell(row=i, column=14, value=fornecedor['vinculo'])
-                ws.cell(row=i, column=15, value=fornecedor['dados_bancarios'])
-            
-            wb.save(ARQUIVO_FORNECEDORES)
-            
         except Exception as e:
             raise Exception(f"Erro ao salvar na planilha: {str(e)}")
 
@@ -3224,23 +3070,19 @@ class EditorCliente:
     def carregar_clientes(self):
         """Carrega a lista de clientes do arquivo Excel"""
         try:
-            wb = load_workbook(ARQUIVO_CLIENTES)
-            ws = wb['Clientes']
+            clientes = obter_registro_clientes(ARQUIVO_CLIENTES).clientes()
             
             # Limpar lista atual
             for item in self.tree_clientes.get_children():
                 self.tree_clientes.delete(item)
             
             # Adicionar clientes
-            for row in ws.iter_rows(min_row=2, values_only=True):
-                if row[0]:  # Nome não vazio
-                    self.tree_clientes.insert('', 'end', values=(
-                        row[0],  # Nome
-                        row[1],  # Endereço
-                        row[6] if row[6] else "0.00"  # Taxa ADM
-                    ))
-            
-            wb.close()
+            for cliente in clientes:
+                self.tree_clientes.insert('', 'end', values=(
+                    cliente['nome'],
+                    cliente['endereco'],
+                    cliente['taxa_adm'] if cliente['taxa_adm'] else "0.00"
+                ))
         except Exception as e:
             messagebox.showerror("Erro", f"Erro ao carregar clientes: {str(e)}")
 
@@ -3259,15 +3101,8 @@ class EditorCliente:
                 
             cliente = self.tree_clientes.item(selecionado)['values'][0]
             
-            # Atualizar no arquivo
-            wb = load_workbook(ARQUIVO_CLIENTES)
-            ws = wb['Clientes']
-            
-            for row in ws.iter_rows(min_row=2):
-                if row[0].value == cliente:
-                    row[6].value = taxa  # Coluna da taxa de administração
-                    
-            wb.save(ARQUIVO_CLIENTES)
+            # Atualizar no arquivo (somente a coluna da taxa de administração)
+            obter_registro_clientes(ARQUIVO_CLIENTES).definir_taxa(cliente, taxa)
             
             # Atualizar na treeview
             self.tree_clientes.set(selecionado, 'Taxa ADM', f"{taxa:.2f}")
@@ -3289,15 +3124,8 @@ class EditorCliente:
             try:
                 cliente = self.tree_clientes.item(selecionado)['values'][0]
                 
-                # Atualizar no arquivo
-                wb = load_workbook(ARQUIVO_CLIENTES)
-                ws = wb['Clientes']
-                
-                for row in ws.iter_rows(min_row=2):
-                    if row[0].value == cliente:
-                        row[6].value = None  # Remover taxa
-                        
-                wb.save(ARQUIVO_CLIENTES)
+                # Atualizar no arquivo (remover taxa)
+                obter_registro_clientes(ARQUIVO_CLIENTES).definir_taxa(cliente, None)
                 
                 # Atualizar na treeview
                 self.tree_clientes.set(selecionado, 'Taxa ADM', "0.00")
@@ -5283,34 +5111,27 @@ class GestaoTaxasFixas:
             arquivo_cliente = PASTA_CLIENTES / f"{cliente}.xlsx"
             wb = load_workbook(arquivo_cliente)
             ws = wb['Contratos_ADM']
+            contratos = ContratosADM.ler(ws)
             
             lancamentos_gerados = []
             
-            # Buscar contratos ativos com taxa fixa
-            for row in ws.iter_rows(min_row=3, values_only=True):
-                # Verifica se é registro de administrador e tipo fixo
-                if (row[6] and  # Tem nº contrato na coluna G
-                    row[9] == 'Fixo' and  # É tipo fixo
-                    self.contrato_ativo(ws, row[6])):  # Contrato está ativo
-                    
-                    # Verificar se já tem lançamento para este período
-                    if not self.tem_lancamento(ws, row[6], row[7], data_ref):
-                        # Preparar dados para o lançamento
-                        dados_lancamento = {
-                            'data_rel': data_ref,
-                            'cnpj_cpf': row[7],  # CNPJ/CPF
-                            'nome': row[8],      # Nome/Razão Social
-                            'referencia': f'ADM FIXA REF. {data_ref.strftime("%m/%Y")}',
-                            'valor': float(row[10].replace(',', '.')),  # Valor/Parcela
-                            'dt_vencto': self.calcular_vencimento(data_ref)
-                        }
-                        
-                        # Registrar lançamento no sistema
-                        self.sistema.dados_para_incluir.append(dados_lancamento)
-                        lancamentos_gerados.append(dados_lancamento)
-                        
-                        # Registrar na aba de controle
-                        self.registrar_lancamento(ws, dados_lancamento)
+            # Administradores tipo fixo de contratos ativos ainda sem lançamento no período
+            for fixa in planejar_taxas_fixas(contratos, data_ref, cliente):
+                dados_lancamento = {
+                    'data_rel': fixa.data_rel,
+                    'cnpj_cpf': fixa.cnpj_cpf,
+                    'nome': fixa.nome,
+                    'referencia': fixa.referencia,
+                    'valor': fixa.valor,  # Valor/Parcela
+                    'dt_vencto': fixa.dt_vencto
+                }
+                
+                # Registrar lançamento no sistema
+                self.sistema.dados_para_incluir.append(dados_lancamento)
+                lancamentos_gerados.append(dados_lancamento)
+                
+                # Registrar na aba de controle
+                self.registrar_lancamento(ws, dados_lancamento)
                         
             wb.save(arquivo_cliente)
             return lancamentos_gerados
@@ -5318,34 +5139,18 @@ class GestaoTaxasFixas:
         except Exception as e:
             raise Exception(f"Erro ao processar lançamentos fixos: {str(e)}")
 
-    def contrato_ativo(self, ws, num_contrato):
-        """Verifica se o contrato está ativo"""
-        for row in ws.iter_rows(min_row=3, values_only=True):
-            if row[0] == num_contrato:  # Coluna A (Nº Contrato)
-                return row[3] == 'ATIVO'  # Coluna D (Status)
-        return False
+    def contrato_ativo(self, contratos, num_contrato):
+        """Verifica se o contrato está ativo (contratos: ContratosADM)"""
+        return contratos.contrato_ativo(num_contrato)
 
-    def tem_lancamento(self, ws, num_contrato, cnpj_cpf, data_ref):
-        """Verifica se já existe lançamento para o período"""
+    def tem_lancamento(self, contratos, num_contrato, cnpj_cpf, data_ref):
+        """Verifica se já existe lançamento para o período (bloco PARCELAS)"""
         data_str = data_ref.strftime("%d/%m/%Y")
-        for row in ws.iter_rows(min_row=3, values_only=True):
-            if (row[25] and  # Tem referência na coluna PARCELAS
-                row[24] == num_contrato and  # Mesmo contrato
-                row[26] == cnpj_cpf and  # Mesmo CNPJ/CPF
-                row[28] == data_str):  # Mesma data
-                return True
-        return False
+        return contratos.tem_parcela(num_contrato, cnpj_cpf, data_str)
 
     def calcular_vencimento(self, data_ref):
         """Calcula data de vencimento (dia 5 do mês seguinte)"""
-        if data_ref.day == 5:
-            vencto = data_ref.replace(day=20)
-        else:  # day == 20
-            if data_ref.month == 12:
-                vencto = data_ref.replace(year=data_ref.year + 1, month=1, day=5)
-            else:
-                vencto = data_ref.replace(month=data_ref.month + 1, day=5)
-        return vencto
+        return calcular_vencimento_fixo(data_ref)
 
     def registrar_lancamento(self, ws, dados):
         """Registra o lançamento na aba de controle"""
@@ -6014,14 +5819,7 @@ class GestorParcelas:
             dt_vencto = self.proximo_dia_util(dt_vencto)
             
             if eh_primeira_parcela:
-                hoje = datetime.now()
-                if hoje.day <= 5:
-                    data_rel = hoje.replace(day=5)
-                elif hoje.day <= 20:
-                    data_rel = hoje.replace(day=20)
-                else:
-                    proximo_mes = hoje + relativedelta(months=1)
-                    data_rel = proximo_mes.replace(day=5)
+                data_rel = ajustar(datetime.now())
             else:
                 data_rel = self.calcular_data_rel(data_base, dt_vencto, False)
                 
@@ -6133,51 +5931,26 @@ class GestorParcelas:
         try:
             hoje = datetime.now()
             
-            # Se for entrada, calcula a partir da data atual
+            # Se for entrada, calcula a partir da data atual (próximo dia 5 ou 20)
             if eh_primeira_parcela and self.tem_entrada.get():
-                if hoje.day <= 5:
-                    data_rel = hoje.replace(day=5)
-                elif hoje.day <= 20:
-                    data_rel = hoje.replace(day=20)
-                else:
-                    proximo_mes = hoje + relativedelta(months=1)
-                    data_rel = proximo_mes.replace(day=5)
-                return data_rel
+                return ajustar(hoje)
                 
             # Para as demais parcelas, manter a lógica existente
             tp_desp = self.tipo_despesa_valor
             
-            if dt_vencto.day == 5:
-                # Se vence dia 5, relatório é dia 20 do mês anterior
-                data_rel = (dt_vencto - relativedelta(months=1)).replace(day=20)
-            elif dt_vencto.day == 20:
-                # Se vence dia 20, relatório é dia 5 do mesmo mês
-                data_rel = dt_vencto.replace(day=5)
+            if eh_data_quinzena(dt_vencto):
+                # Vence dia 5 ou 20: relatório da quinzena anterior
+                data_rel = deslocar(dt_vencto, -1)
             elif tp_desp == '5':
-                if dt_vencto.day <= 5:
-                    data_rel = dt_vencto.replace(day=5)
-                elif dt_vencto.day <= 20:
-                    data_rel = dt_vencto.replace(day=20)
-                else:
-                    proximo_mes = dt_vencto + relativedelta(months=1)
-                    data_rel = proximo_mes.replace(day=5)
+                # Despesa paga pelo cliente: próximo dia 5 ou 20
+                data_rel = ajustar(dt_vencto)
             else:
-                if dt_vencto.day <= 5:
-                    data_rel = (dt_vencto - relativedelta(months=1)).replace(day=20)
-                elif dt_vencto.day <= 20:
-                    data_rel = dt_vencto.replace(day=5)
-                else:
-                    data_rel = dt_vencto.replace(day=20)
+                # Demais: último dia 5 ou 20 antes do vencimento
+                data_rel = deslocar(dt_vencto, 0)
                     
             # Garantir que a data do relatório não seja anterior à data atual
             if data_rel < hoje:
-                if hoje.day <= 5:
-                    data_rel = hoje.replace(day=5)
-                elif hoje.day <= 20:
-                    data_rel = hoje.replace(day=20)
-                else:
-                    proximo_mes = hoje + relativedelta(months=1)
-                    data_rel = proximo_mes.replace(day=5)
+                data_rel = ajustar(hoje)
                     
             return data_rel
         except Exception as e:
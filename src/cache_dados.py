@@ -0,0 +1,442 @@
+"""
+Cache colunar da aba Dados dos clientes
+
+Cada <cliente>.xlsx ganha um arquivo <cliente>.dados.npz ao lado, com as
+colunas da aba Dados já tipadas (datas, números e textos em arrays NumPy).
+O cache é reconstruído apenas quando o tamanho, a data de modificação e o
+conteúdo (hash) da planilha mudam; caso contrário a leitura não passa pelo
+openpyxl. Células avulsas consultadas com frequência (ex.: RESUMO!A3) também
+ficam guardadas nos metadados do cache.
+
+normalizar_dados() converte a aba Dados para os tipos de ESQUEMA_DADOS uma
+única vez, na carga; as rotinas de relatório consomem as colunas já tipadas.
+
+O cache guarda também a série acumulada de VALOR por DATA_REL (datas
+ordenadas e somas acumuladas): o acumulado anterior a uma data de relatório
+é uma busca binária. Quando a planilha apenas recebe novas linhas, a série é
+atualizada somando só as linhas novas.
+"""
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime, date
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+logger = logging.getLogger(__name__)
+
+VERSAO_CACHE = 1
+SUFIXO_CACHE = '.dados.npz'
+
+# Arrays da série acumulada dentro do cache
+_ACUM_DATAS, _ACUM_TOTAIS, _ACUM_SOMAS = '__acum_datas', '__acum_totais', '__acum_somas'
+
+# Códigos usados nas colunas com tipos misturados
+_NULO, _NUMERO, _TEXTO, _DATA = 0, 1, 2, 3
+
+# Tipos das colunas da aba Dados após normalizar_dados(); colunas fora do
+# esquema são mantidas como lidas
+ESQUEMA_DADOS = {
+    'DATA_REL': 'data',
+    'DT_VENCTO': 'data',
+    'TP_DESP': 'categoria',
+    'CATEGORIA': 'categoria',
+    'VR_UNIT': 'numero',
+    'DIAS': 'numero',
+    'VALOR': 'numero',
+    'NOME': 'texto',
+    'REFERÊNCIA': 'texto',
+    'NF': 'texto',
+    'DADOS_BANCARIOS': 'texto',
+    'OBSERVAÇÃO': 'texto',
+}
+
+
+def caminho_cache(arquivo_excel):
+    """Retorna o caminho do cache colunar de uma planilha de cliente"""
+    arquivo_excel = Path(arquivo_excel)
+    return arquivo_excel.with_name(arquivo_excel.stem + SUFIXO_CACHE)
+
+
+def calcular_hash_arquivo(arquivo, tamanho_bloco=1024 * 1024):
+    """Calcula o hash SHA-1 do conteúdo de um arquivo"""
+    sha1 = hashlib.sha1()
+    with open(arquivo, 'rb') as f:
+        for bloco in iter(lambda: f.read(tamanho_bloco), b''):
+            sha1.update(bloco)
+    return sha1.hexdigest()
+
+
+def carregar_dados_cliente(arquivo_excel, abrir_workbook=None):
+    """
+    Retorna a aba Dados de uma planilha de cliente como DataFrame, no mesmo
+    formato de pd.read_excel(arquivo_excel, sheet_name='Dados').
+
+    Args:
+        arquivo_excel: Caminho do arquivo .xlsx do cliente
+        abrir_workbook (callable, optional): Função que devolve um workbook
+            openpyxl já aberto, usada para reconstruir o cache sem abrir o
+            arquivo novamente
+
+    Returns:
+        pd.DataFrame: Dados do cliente
+    """
+    arquivo_excel = Path(arquivo_excel)
+    cache = caminho_cache(arquivo_excel)
+    stat = arquivo_excel.stat()
+
+    meta, arrays = _ler_cache(cache)
+    if meta is not None:
+        if _assinatura_confere(meta, stat):
+            logger.debug(f"Cache de Dados válido: {cache.name}")
+            df = _decodificar(meta, arrays)
+            if _ACUM_SOMAS not in arrays:  # cache gravado antes da série acumulada
+                arrays.update(_arrays_acumulados(*_acumular_dados(df)))
+                _gravar_cache(cache, meta, arrays)
+            return df
+
+        # Data de modificação alterada (ex.: sincronização do Drive): conferir o conteúdo
+        hash_atual = calcular_hash_arquivo(arquivo_excel)
+        if meta['hash'] == hash_atual:
+            logger.debug(f"Conteúdo inalterado, atualizando metadados do cache: {cache.name}")
+            meta.update({'tamanho': stat.st_size, 'mtime_ns': stat.st_mtime_ns})
+            _gravar_cache(cache, meta, arrays)
+            return _decodificar(meta, arrays)
+    else:
+        hash_atual = calcular_hash_arquivo(arquivo_excel)
+
+    logger.info(f"Reconstruindo cache de Dados: {arquivo_excel.name}")
+    origem = abrir_workbook() if abrir_workbook else arquivo_excel
+    df = pd.read_excel(origem, sheet_name='Dados', engine='openpyxl')
+
+    meta_antigo, arrays_antigos = meta, arrays
+    meta, arrays = _codificar(df)
+    arrays.update(_arrays_acumulados(*_serie_atualizada(meta_antigo, arrays_antigos, df)))
+    meta.update({
+        'versao': VERSAO_CACHE,
+        'tamanho': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'hash': hash_atual,
+    })
+    _gravar_cache(cache, meta, arrays)
+    return df
+
+
+def cache_atualizado(arquivo_excel):
+    """
+    Indica se o cache colunar corresponde à planilha atual (tamanho e data de
+    modificação), lendo apenas os metadados do cache
+    """
+    arquivo_excel = Path(arquivo_excel)
+    meta = _ler_meta(caminho_cache(arquivo_excel))
+    return meta is not None and _assinatura_confere(meta, arquivo_excel.stat())
+
+
+def ler_celula(arquivo_excel, aba, celula):
+    """
+    Valor de uma única célula (ex.: RESUMO!A3, nome do cliente), guardado nos
+    metadados do cache colunar enquanto a planilha não mudar. Na primeira
+    leitura a planilha é aberta em modo somente leitura.
+    """
+    arquivo_excel = Path(arquivo_excel)
+    cache = caminho_cache(arquivo_excel)
+    chave = f"{aba}!{celula}"
+
+    meta = _ler_meta(cache)
+    cache_valido = meta is not None and _assinatura_confere(meta, arquivo_excel.stat())
+    if cache_valido and chave in meta.get('celulas', {}):
+        return meta['celulas'][chave]
+
+    wb = load_workbook(arquivo_excel, read_only=True, data_only=True)
+    try:
+        valor = wb[aba][celula].value
+    finally:
+        wb.close()
+
+    if isinstance(valor, (datetime, date)):
+        return valor  # apenas valores JSON são guardados nos metadados
+    if cache_valido:
+        meta, arrays = _ler_cache(cache)
+        if meta is not None:
+            meta.setdefault('celulas', {})[chave] = valor
+            _gravar_cache(cache, meta, arrays)
+    return valor
+
+
+def datas_referencia(df):
+    """Coluna DATA_REL como datetime64 (NaT nas células que não são datas)"""
+    datas = df['DATA_REL']
+    if not pd.api.types.is_datetime64_any_dtype(datas):
+        # Considerar apenas células com data, como na leitura pelo openpyxl
+        eh_data = datas.map(lambda v: isinstance(v, (datetime, date)))
+        datas = pd.to_datetime(datas.where(eh_data), errors='coerce')
+    return datas
+
+
+def lancamentos_da_data(df, data_ref):
+    """Filtra os lançamentos cuja DATA_REL cai no mesmo dia de data_ref"""
+    return df[datas_referencia(df).dt.normalize() == pd.Timestamp(data_ref).normalize()]
+
+
+def valores_numericos(serie):
+    """Converte a coluna VALOR (números ou textos com vírgula) para float"""
+    if pd.api.types.is_numeric_dtype(serie):
+        return serie.astype(float)
+    texto = serie.astype(str).str.replace(',', '.', regex=False)
+    return pd.to_numeric(texto, errors='coerce').where(serie.notna())
+
+
+def normalizar_dados(df):
+    """
+    Converte a aba Dados para os tipos declarados em ESQUEMA_DADOS:
+
+    - data: datetime64 (NaT nas células vazias ou inválidas)
+    - numero: float (NaN nas células vazias ou inválidas)
+    - categoria: categórica (TP_DESP com categorias inteiras)
+    - texto: str, com '' nas células vazias
+
+    Returns:
+        pd.DataFrame: Novo DataFrame; o original não é alterado
+    """
+    colunas = {}
+    for nome, tipo in ESQUEMA_DADOS.items():
+        if nome not in df.columns:
+            continue
+        serie = df[nome]
+        if tipo == 'data':
+            colunas[nome] = datas_referencia(df) if nome == 'DATA_REL' else _datas(serie)
+        elif tipo == 'numero':
+            colunas[nome] = valores_numericos(serie)
+        elif tipo == 'categoria' and nome == 'TP_DESP':
+            codigos = pd.to_numeric(serie, errors='coerce')
+            if (codigos.dropna() % 1 == 0).all():
+                codigos = codigos.astype('Int64')
+            colunas[nome] = codigos.astype('category')
+        elif tipo == 'categoria':
+            colunas[nome] = _textos(serie).astype('category')
+        else:
+            colunas[nome] = _textos(serie)
+    return df.assign(**colunas)
+
+
+def _datas(serie):
+    """Datas lidas como datetime ou digitadas como texto (dd/mm/aaaa)"""
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        return serie
+    eh_data = serie.map(lambda v: isinstance(v, (datetime, date)))
+    datas = pd.to_datetime(serie.where(eh_data), errors='coerce')
+    eh_texto = serie.map(lambda v: isinstance(v, str) and v.strip() != '')
+    if eh_texto.any():
+        datas[eh_texto] = pd.to_datetime(serie[eh_texto], format='mixed', dayfirst=True, errors='coerce')
+    return datas
+
+
+def _textos(serie):
+    return serie.fillna('').astype(str)
+
+
+def ler_serie_acumulada(arquivo_excel):
+    """
+    Série acumulada de VALOR por DATA_REL guardada no cache da planilha
+
+    Returns:
+        tuple (datas, somas) ou None se o cache estiver ausente ou desatualizado:
+        datas (datetime64[D]) ordenadas e sem repetição; somas[i] é o total de
+        VALOR com DATA_REL até datas[i] (inclusive)
+    """
+    arquivo_excel = Path(arquivo_excel)
+    cache = caminho_cache(arquivo_excel)
+    if not cache.exists():
+        return None
+    try:
+        with np.load(cache, allow_pickle=False) as npz:
+            meta = json.loads(str(npz['__meta__']))
+            if (meta.get('versao') != VERSAO_CACHE or _ACUM_SOMAS not in npz.files
+                    or not _assinatura_confere(meta, arquivo_excel.stat())):
+                return None
+            return npz[_ACUM_DATAS], npz[_ACUM_SOMAS]
+    except Exception:
+        return None
+
+
+def serie_acumulada(df):
+    """Série acumulada (datas, somas) calculada a partir da aba Dados"""
+    datas, totais = _acumular_dados(df)
+    return datas, np.cumsum(totais)
+
+
+def acumulado_ate(serie, data_ref):
+    """Soma de VALOR com DATA_REL anterior a data_ref (busca binária na série acumulada)"""
+    datas, somas = serie
+    posicao = np.searchsorted(datas, np.datetime64(pd.Timestamp(data_ref).date(), 'D'), side='left')
+    return float(somas[posicao - 1]) if posicao else 0.0
+
+
+def _acumular_dados(df):
+    """Datas de DATA_REL (sem repetição) e o total de VALOR de cada uma"""
+    if 'DATA_REL' not in df.columns or 'VALOR' not in df.columns:
+        return np.array([], dtype='datetime64[D]'), np.array([], dtype=float)
+    datas = datas_referencia(df).to_numpy(dtype='datetime64[D]')
+    valores = valores_numericos(df['VALOR']).to_numpy(dtype=float)
+    return _acumular(datas, valores)
+
+
+def _acumular(datas, valores):
+    validos = ~np.isnat(datas) & ~np.isnan(valores)
+    unicas, posicoes = np.unique(datas[validos], return_inverse=True)
+    return unicas, np.bincount(posicoes, weights=valores[validos], minlength=len(unicas))
+
+
+def _arrays_acumulados(datas, totais):
+    return {_ACUM_DATAS: datas, _ACUM_TOTAIS: totais, _ACUM_SOMAS: np.cumsum(totais)}
+
+
+def _serie_atualizada(meta_antigo, arrays_antigos, df):
+    """
+    Totais por DATA_REL da nova aba Dados. Se a versão anterior do cache for
+    um prefixo da nova (apenas linhas acrescentadas), soma só as linhas novas
+    aos totais já guardados; caso contrário recalcula tudo.
+    """
+    if meta_antigo is not None and _ACUM_TOTAIS in arrays_antigos and 'VALOR' in df.columns:
+        linhas = meta_antigo['linhas']
+        try:
+            anterior = _decodificar(meta_antigo, arrays_antigos)
+            prefixo = df.iloc[:linhas]
+            if (len(df) >= linhas
+                    and datas_referencia(anterior).reset_index(drop=True).equals(
+                        datas_referencia(prefixo).reset_index(drop=True))
+                    and valores_numericos(anterior['VALOR']).reset_index(drop=True).equals(
+                        valores_numericos(prefixo['VALOR']).reset_index(drop=True))):
+                logger.debug(f"Série acumulada atualizada com {len(df) - linhas} linha(s) nova(s)")
+                novas = df.iloc[linhas:]
+                return _acumular(
+                    np.concatenate([arrays_antigos[_ACUM_DATAS],
+                                    datas_referencia(novas).to_numpy(dtype='datetime64[D]')]),
+                    np.concatenate([arrays_antigos[_ACUM_TOTAIS],
+                                    valores_numericos(novas['VALOR']).to_numpy(dtype=float)]))
+        except Exception as e:
+            logger.debug(f"Série acumulada será recalculada: {str(e)}")
+    return _acumular_dados(df)
+
+
+def _ler_cache(cache):
+    """Lê o arquivo de cache; retorna (None, None) se ausente ou inválido"""
+    if not cache.exists():
+        return None, None
+    try:
+        with np.load(cache, allow_pickle=False) as npz:
+            arrays = {nome: npz[nome] for nome in npz.files}
+        meta = json.loads(str(arrays.pop('__meta__')))
+        if meta.get('versao') != VERSAO_CACHE:
+            return None, None
+        return meta, arrays
+    except Exception as e:
+        logger.warning(f"Cache de Dados inválido, será reconstruído ({cache.name}): {str(e)}")
+        return None, None
+
+
+def _ler_meta(cache):
+    """Lê apenas os metadados do cache (sem carregar as colunas)"""
+    if not cache.exists():
+        return None
+    try:
+        with np.load(cache, allow_pickle=False) as npz:
+            meta = json.loads(str(npz['__meta__']))
+        return meta if meta.get('versao') == VERSAO_CACHE else None
+    except Exception:
+        return None
+
+
+def _assinatura_confere(meta, stat):
+    return meta['tamanho'] == stat.st_size and meta['mtime_ns'] == stat.st_mtime_ns
+
+
+def _gravar_cache(cache, meta, arrays):
+    """Grava o cache de forma atômica (arquivo temporário + substituição)"""
+    temporario = cache.with_name(f"{cache.name}.{os.getpid()}.tmp.npz")
+    try:
+        np.savez(temporario, __meta__=np.array(json.dumps(meta)), **arrays)
+        os.replace(temporario, cache)
+    except Exception as e:
+        logger.warning(f"Não foi possível gravar o cache de Dados ({cache.name}): {str(e)}")
+        if temporario.exists():
+            temporario.unlink()
+
+
+def _codificar(df):
+    """Converte o DataFrame em arrays NumPy sem objetos Python"""
+    colunas = []
+    arrays = {}
+    for i, nome in enumerate(df.columns):
+        serie = df[nome]
+        chave = f"c{i}"
+        if pd.api.types.is_datetime64_any_dtype(serie):
+            tipo = 'data'
+            arrays[chave] = serie.to_numpy()
+        elif pd.api.types.is_bool_dtype(serie) or pd.api.types.is_numeric_dtype(serie):
+            tipo = 'numero'
+            arrays[chave] = serie.to_numpy()
+        else:
+            valores = serie.to_numpy(dtype=object)
+            codigos = np.array([_codigo(v) for v in valores], dtype=np.uint8)
+            if np.isin(codigos, (_NULO, _TEXTO)).all():
+                tipo = 'texto'
+                arrays[chave] = np.array(['' if c == _NULO else v for v, c in zip(valores, codigos)], dtype=str)
+                arrays[f"{chave}_nulo"] = codigos == _NULO
+            else:
+                tipo = 'misto'
+                arrays[f"{chave}_codigo"] = codigos
+                arrays[f"{chave}_numero"] = np.array(
+                    [float(v) if c == _NUMERO else np.nan for v, c in zip(valores, codigos)], dtype=float)
+                arrays[f"{chave}_texto"] = np.array(
+                    [str(v) if c == _TEXTO else '' for v, c in zip(valores, codigos)], dtype=str)
+                arrays[f"{chave}_data"] = np.array(
+                    [np.datetime64(pd.Timestamp(v), 'us') if c == _DATA else np.datetime64('NaT', 'us')
+                     for v, c in zip(valores, codigos)], dtype='datetime64[us]')
+        colunas.append({'nome': str(nome), 'tipo': tipo})
+    return {'colunas': colunas, 'linhas': len(df)}, arrays
+
+
+def _codigo(valor):
+    # Outros tipos (ex.: horas digitadas por engano) são gravados como texto
+    if valor is None or (isinstance(valor, float) and np.isnan(valor)) or valor is pd.NaT:
+        return _NULO
+    if isinstance(valor, (datetime, date, np.datetime64)):
+        return _DATA
+    if isinstance(valor, (int, float, np.number)) and not isinstance(valor, bool):
+        return _NUMERO
+    return _TEXTO
+
+
+def _decodificar(meta, arrays):
+    """Reconstrói o DataFrame a partir dos arrays do cache"""
+    dados = {}
+    for i, coluna in enumerate(meta['colunas']):
+        chave = f"c{i}"
+        tipo = coluna['tipo']
+        if tipo in ('data', 'numero'):
+            dados[coluna['nome']] = arrays[chave]
+        elif tipo == 'texto':
+            valores = arrays[chave].astype(object)
+            valores[arrays[f"{chave}_nulo"]] = np.nan
+            dados[coluna['nome']] = valores
+        else:
+            codigos = arrays[f"{chave}_codigo"]
+            valores = np.full(len(codigos), np.nan, dtype=object)
+            for codigo, sufixo in ((_NUMERO, 'numero'), (_TEXTO, 'texto'), (_DATA, 'data')):
+                mascara = codigos == codigo
+                if mascara.any():
+                    origem = arrays[f"{chave}_{sufixo}"][mascara]
+                    if codigo == _DATA:
+                        origem = [pd.Timestamp(v).to_pydatetime() for v in origem]
+                    elif codigo == _NUMERO:
+                        origem = [int(v) if float(v).is_integer() else float(v) for v in origem]
+                    else:
+                        origem = origem.tolist()
+                    valores[np.flatnonzero(mascara)] = origem
+            dados[coluna['nome']] = valores
+    return pd.DataFrame(dados, columns=[c['nome'] for c in meta['colunas']])
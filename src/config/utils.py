@@ -15,6 +15,7 @@ from datetime import datetime
 from pathlib import Path
 
 
+from src import quinzena
 from src.config.config import (
     BASE_PATH,
     PASTA_CLIENTES,
@@ -39,31 +40,20 @@ def validar_data(data_str):
 
 def validar_data_quinzena(data):
     """Valida se a data é dia 5 ou 20 e ajusta se necessário"""
-    if not (data.day == 5 or data.day == 20):
+    if not quinzena.eh_data_quinzena(data):
+        data_ajustada = quinzena.ajustar(data)
         if data.day < 5:
-            data_ajustada = data.replace(day=5)
             msg = f"Data ajustada para dia 5: {data_ajustada.strftime('%d/%m/%Y')}"
         elif data.day < 20:
-            data_ajustada = data.replace(day=20)
             msg = f"Data ajustada para dia 20: {data_ajustada.strftime('%d/%m/%Y')}"
         else:
-            if data.month == 12:
-                data_ajustada = data.replace(year=data.year + 1, month=1, day=5)
-            else:
-                data_ajustada = data.replace(month=data.month + 1, day=5)
             msg = f"Data ajustada para dia 5 do próximo mês: {data_ajustada.strftime('%d/%m/%Y')}"
         return data_ajustada, msg
     return data, None
 
 def calcular_proxima_data_quinzena(data):
-    """Calcula a próxima data quinzenal"""
-    if data.day == 5:
-        return data.replace(day=20)
-    else:
-        if data.month == 12:
-            return data.replace(year=data.year + 1, month=1, day=5)
-        else:
-            return data.replace(month=data.month + 1, day=5)
+    """Calcula a próxima data quinzenal (dia 5 ou 20)"""
+    return quinzena.proxima(data)
 
 # === DOCUMENT VALIDATION ===
 def validar_cnpj_cpf(documento):
@@ -108,16 +98,11 @@ def buscar_fornecedor(tree_fornecedores, termo_busca):
     for item in tree_fornecedores.get_children():
         tree_fornecedores.delete(item)
         
-    termo = termo_busca.lower()
     try:
-        wb = load_workbook(ARQUIVO_FORNECEDORES)
-        ws = wb['Fornecedores']
-        
-        for row in ws.iter_rows(min_row=2, values_only=True):
-            if termo in str(row[3]).lower():  # Busca no nome
-                tree_fornecedores.insert('', 'end', values=(row[0], row[3], row[11]))
-        
-        wb.close()
+        # Busca no índice de trigramas (nome, razão social, CNPJ/CPF e especificação)
+        from src.registro_fornecedores import obter_registro_fornecedores
+        for row in obter_registro_fornecedores(ARQUIVO_FORNECEDORES).pesquisar(termo_busca):
+            tree_fornecedores.insert('', 'end', values=(row[0], row[3], row[11]))
     except Exception as e:
         messagebox.showerror("Erro", f"Erro ao buscar fornecedores: {str(e)}")
 
@@ -243,52 +228,12 @@ def buscar_dados_bancarios_fornecedor(cnpj_cpf, forma_pagamento="PIX", arquivo_f
         str: Dados bancários formatados para o fornecedor
     """
     try:
-        # Se arquivo_fornecedores não foi informado, usar o da configuração
-        if not arquivo_fornecedores:
-            from src.config.config import ARQUIVO_FORNECEDORES
-            arquivo_fornecedores = ARQUIVO_FORNECEDORES
-            
-        from openpyxl import load_workbook
-        
-        # Garantir que o CNPJ/CPF está formatado corretamente
-        cnpj_cpf = str(cnpj_cpf).strip()
-        
-        # Abrir arquivo de fornecedores
-        wb = load_workbook(arquivo_fornecedores, data_only=True)
-        ws = wb['Fornecedores']
-    
-        for row in ws.iter_rows(min_row=2, values_only=True):
-            if row[0] == cnpj_cpf:
-                # Encontrou o fornecedor
-                if forma_pagamento == "PIX" and row[10]:  # Chave PIX está na coluna K
-                    dados_bancarios = f"PIX: {row[10]}"
-                else:
-                    # Construir dados para TED, SEMPRE incluindo CNPJ/CPF
-                    partes_dados = []
-                    if row[6]: partes_dados.append(str(row[6]))  # Banco
-                    if row[7]: partes_dados.append(str(row[7]))  # OP
-                    if row[8]: partes_dados.append(str(row[8]))  # Agência
-                    if row[9]: partes_dados.append(str(row[9]))  # Conta
-                    
-                    # SEMPRE incluir CNPJ/CPF para TED, independente da forma de pagamento selecionada
-                    if row[0]: partes_dados.append(str(row[0]))
-                    
-                    dados_bancarios = ' - '.join(filter(None, partes_dados))
-                    
-                # Se não encontrou dados bancários
-                if not dados_bancarios or dados_bancarios.strip() == '-':
-                    dados_bancarios = 'DADOS BANCÁRIOS NÃO CADASTRADOS'
-                    
-                wb.close()
-                return dados_bancarios
-        
-        wb.close()
-        return 'DADOS BANCÁRIOS NÃO CADASTRADOS'
-        
+        # Consulta pelo índice de CNPJ/CPF (a base é lida uma vez por processo)
+        from src.registro_fornecedores import obter_registro_fornecedores
+        return obter_registro_fornecedores(arquivo_fornecedores).dados_bancarios(cnpj_cpf, forma_pagamento)
+
     except Exception as e:
         print(f"Erro ao buscar dados bancários: {str(e)}")
-        if 'wb' in locals():
-            wb.close()
         return 'ERRO AO BUSCAR DADOS BANCÁRIOS'
 
 # === CONSTANTS ===
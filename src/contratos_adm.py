@@ -0,0 +1,279 @@
+"""
+Modelo da aba Contratos_ADM
+
+A aba guarda cinco blocos lado a lado (CONTRATOS, ADMINISTRADORES_CONTRATO,
+ADITIVOS, ADMINISTRADORES_ADITIVO e PARCELAS), com os dados a partir da
+linha 3. ContratosADM lê a aba em uma única passada e monta registros
+tipados, indexados por número de contrato e por CNPJ/CPF, para que as
+consultas não precisem percorrer a aba novamente. ler_bloco_parcelas lê
+apenas as colunas do bloco PARCELAS (Y–AF) como DataFrame, para o relatório.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional
+
+import pandas as pd
+from openpyxl import load_workbook
+
+try:
+    from src.registro_fornecedores import normalizar_documento
+except ImportError:
+    from registro_fornecedores import normalizar_documento
+
+LINHA_INICIAL = 3
+TOTAL_COLUNAS = 32
+
+# Primeira coluna (índice base 0) de cada bloco
+COL_CONTRATOS = 0
+COL_ADMINISTRADORES_CONTRATO = 6
+COL_ADITIVOS = 13
+COL_ADMINISTRADORES_ADITIVO = 17
+COL_PARCELAS = 24
+
+# Colunas do bloco PARCELAS (Y–AF), na ordem da aba
+COLUNAS_PARCELAS = ['referencia', 'numero_parcela', 'cpf_cnpj', 'administrador',
+                    'data_vencimento', 'valor_parcela', 'status', 'data_pagamento']
+
+
+def _percentual(valor):
+    """Converte Valor/Percentual (número ou texto com vírgula) para float"""
+    return float(str(valor).replace(',', '.'))
+
+
+@dataclass
+class Contrato:
+    numero: Any
+    data_inicio: Any
+    data_fim: Any
+    status: Any
+    observacoes: Any
+    linha: int
+
+    @property
+    def ativo(self):
+        return self.status == 'ATIVO'
+
+    def vigente_em(self, data):
+        """Contrato ativo e com a data dentro do período de vigência"""
+        return (self.ativo and
+                isinstance(self.data_inicio, datetime) and
+                isinstance(self.data_fim, datetime) and
+                self.data_inicio <= data <= self.data_fim)
+
+
+@dataclass
+class AdministradorContrato:
+    numero_contrato: Any
+    cnpj_cpf: Any
+    nome: Any
+    tipo: Any
+    valor_percentual: Any
+    valor_total: Any
+    num_parcelas: Any
+    linha: int
+
+    @property
+    def percentual(self):
+        """Valor/Percentual como float (ValueError/TypeError se inválido)"""
+        return _percentual(self.valor_percentual)
+
+
+@dataclass
+class Aditivo:
+    numero_contrato: Any
+    numero_aditivo: Any
+    data_inicio: Any
+    data_fim: Any
+    linha: int
+
+
+@dataclass
+class AdministradorAditivo:
+    numero_contrato: Any
+    numero_aditivo: Any
+    cnpj_cpf: Any
+    nome: Any
+    tipo: Any
+    valor_percentual: Any
+    valor_total: Any
+    linha: int
+
+    @property
+    def percentual(self):
+        return _percentual(self.valor_percentual)
+
+
+@dataclass
+class Parcela:
+    referencia: Any
+    numero: Any
+    cnpj_cpf: Any
+    nome: Any
+    data_vencimento: Any
+    valor: Any
+    status: Any
+    data_pagamento: Any
+    linha: int
+
+
+class ContratosADM:
+    """Registros da aba Contratos_ADM de um cliente"""
+
+    def __init__(self):
+        self.contratos = []
+        self.administradores_contrato = []
+        self.aditivos = []
+        self.administradores_aditivo = []
+        self.parcelas = []
+
+        self._contratos = {}                 # nº contrato -> [Contrato]
+        self._administradores = {}           # nº contrato -> [AdministradorContrato]
+        self._administradores_cnpj = {}      # CNPJ/CPF -> [AdministradorContrato]
+        self._aditivos = {}                  # nº contrato -> [Aditivo]
+        self._administradores_aditivo = {}   # nº contrato -> [AdministradorAditivo]
+        self._parcelas = {}                  # nº contrato -> [Parcela]
+        self._parcelas_cnpj = {}             # CNPJ/CPF -> [Parcela]
+
+    @classmethod
+    def ler(cls, ws):
+        """Monta o modelo a partir da aba Contratos_ADM (uma única leitura das linhas)"""
+        modelo = cls()
+        for linha, row in enumerate(
+                ws.iter_rows(min_row=LINHA_INICIAL, max_col=TOTAL_COLUNAS, values_only=True),
+                start=LINHA_INICIAL):
+            row = tuple(row) + (None,) * (TOTAL_COLUNAS - len(row))
+
+            c = COL_CONTRATOS
+            if row[c]:
+                modelo._adicionar(modelo.contratos, modelo._contratos, row[c],
+                                  Contrato(*row[c:c + 5], linha))
+
+            c = COL_ADMINISTRADORES_CONTRATO
+            if row[c]:
+                adm = AdministradorContrato(*row[c:c + 7], linha)
+                modelo._adicionar(modelo.administradores_contrato, modelo._administradores, row[c], adm)
+                modelo._indexar_cnpj(modelo._administradores_cnpj, adm)
+
+            c = COL_ADITIVOS
+            if row[c]:
+                modelo._adicionar(modelo.aditivos, modelo._aditivos, row[c], Aditivo(*row[c:c + 4], linha))
+
+            c = COL_ADMINISTRADORES_ADITIVO
+            if row[c]:
+                modelo._adicionar(modelo.administradores_aditivo, modelo._administradores_aditivo, row[c],
+                                  AdministradorAditivo(*row[c:c + 7], linha))
+
+            c = COL_PARCELAS
+            if row[c] or row[c + 1]:
+                parcela = Parcela(*row[c:c + 8], linha)
+                modelo._adicionar(modelo.parcelas, modelo._parcelas, row[c], parcela)
+                modelo._indexar_cnpj(modelo._parcelas_cnpj, parcela)
+        return modelo
+
+    @staticmethod
+    def _adicionar(lista, indice, chave, registro):
+        lista.append(registro)
+        indice.setdefault(chave, []).append(registro)
+
+    @staticmethod
+    def _indexar_cnpj(indice, registro):
+        chave = normalizar_documento(registro.cnpj_cpf)
+        if chave:
+            indice.setdefault(chave, []).append(registro)
+
+    # === CONTRATOS ===
+    def contrato(self, numero) -> Optional[Contrato]:
+        """Primeiro registro do contrato com o número informado"""
+        registros = self._contratos.get(numero)
+        return registros[0] if registros else None
+
+    def contrato_ativo(self, numero):
+        contrato = self.contrato(numero)
+        return contrato is not None and contrato.ativo
+
+    def numeros_contratos_ativos(self):
+        """Números (sem repetição, na ordem da aba) dos contratos com status ATIVO"""
+        return list(dict.fromkeys(c.numero for c in self.contratos if c.ativo))
+
+    def contratos_vigentes(self, data):
+        """Contratos ativos cuja vigência inclui a data"""
+        return [c for c in self.contratos if c.vigente_em(data)]
+
+    # === ADMINISTRADORES ===
+    def administradores(self, numero_contrato, tipo=None):
+        """Administradores do contrato, opcionalmente filtrados por tipo ('Fixo'/'Percentual')"""
+        registros = self._administradores.get(numero_contrato, [])
+        if tipo is None:
+            return list(registros)
+        return [adm for adm in registros if adm.tipo == tipo]
+
+    def administradores_por_cnpj(self, cnpj_cpf):
+        return list(self._administradores_cnpj.get(normalizar_documento(cnpj_cpf), []))
+
+    def aditivos_do_contrato(self, numero_contrato):
+        return list(self._aditivos.get(numero_contrato, []))
+
+    def administradores_do_aditivo(self, numero_contrato, numero_aditivo=None):
+        registros = self._administradores_aditivo.get(numero_contrato, [])
+        if numero_aditivo is None:
+            return list(registros)
+        return [adm for adm in registros if adm.numero_aditivo == numero_aditivo]
+
+    # === PARCELAS ===
+    def parcelas_do_contrato(self, numero_contrato):
+        return list(self._parcelas.get(numero_contrato, []))
+
+    def parcelas_por_cnpj(self, cnpj_cpf):
+        return list(self._parcelas_cnpj.get(normalizar_documento(cnpj_cpf), []))
+
+    def tem_parcela(self, numero_contrato, cnpj_cpf, data_vencimento):
+        """Verifica se existe parcela do contrato/CNPJ com a data de vencimento informada"""
+        return any(
+            p.numero and p.referencia == numero_contrato and p.data_vencimento == data_vencimento
+            for p in self.parcelas_por_cnpj(cnpj_cpf)
+        )
+
+
+def carregar_contratos_adm(arquivo_excel):
+    """
+    Lê a aba Contratos_ADM de uma planilha de cliente (modo somente leitura)
+
+    Returns:
+        ContratosADM ou None se a planilha não tiver a aba
+    """
+    wb = load_workbook(arquivo_excel, read_only=True)
+    try:
+        if 'Contratos_ADM' not in wb.sheetnames:
+            return None
+        return ContratosADM.ler(wb['Contratos_ADM'])
+    finally:
+        wb.close()
+
+
+def ler_bloco_parcelas(ws, linha_inicial=LINHA_INICIAL):
+    """
+    Valores das colunas Y–AF (bloco PARCELAS) em uma única leitura das linhas
+
+    Returns:
+        pd.DataFrame: Colunas COLUNAS_PARCELAS com os valores das células
+            (dtype object, sem conversão), uma linha por linha da aba
+    """
+    linhas = ws.iter_rows(min_row=linha_inicial, min_col=COL_PARCELAS + 1,
+                          max_col=COL_PARCELAS + len(COLUNAS_PARCELAS), values_only=True)
+    return pd.DataFrame(list(linhas), columns=COLUNAS_PARCELAS, dtype=object)
+
+
+def carregar_bloco_parcelas(arquivo_excel, linha_inicial=LINHA_INICIAL):
+    """
+    Lê o bloco PARCELAS da aba Contratos_ADM (modo somente leitura, valores calculados)
+
+    Returns:
+        pd.DataFrame ou None se a planilha não tiver a aba
+    """
+    wb = load_workbook(arquivo_excel, read_only=True, data_only=True)
+    try:
+        if 'Contratos_ADM' not in wb.sheetnames:
+            return None
+        return ler_bloco_parcelas(wb['Contratos_ADM'], linha_inicial)
+    finally:
+        wb.close()
@@ -2,7 +2,6 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import os
 from pathlib import Path
-from openpyxl import load_workbook
 
 # Adicionar diretório raiz ao path
 def add_project_root():
@@ -25,6 +24,11 @@ except ImportError:
         messagebox.showerror("Erro", "Não foi possível importar as configurações.")
         raise
 
+try:
+    from src.registro_clientes import obter_registro_clientes
+except ImportError:
+    from registro_clientes import obter_registro_clientes
+
 def carregar_lista_clientes():
     """Carrega a lista de clientes disponíveis"""
     try:
@@ -34,19 +38,7 @@ def carregar_lista_clientes():
             print(f"Arquivo não encontrado: {ARQUIVO_CLIENTES}")
             return []
             
-        workbook = load_workbook(ARQUIVO_CLIENTES)
-        sheet = workbook['Clientes']
-        print(f"Planilha aberta, abas disponíveis: {workbook.sheetnames}")
-        print(f"Número de linhas na planilha: {sheet.max_row}")
-        
-        clientes = []
-        
-        for row in sheet.iter_rows(min_row=2, values_only=True):
-            if row[0]:  # Nome do cliente
-                print(f"Cliente encontrado: {row[0]}")
-                clientes.append(row[0])
-                
-        workbook.close()
+        clientes = obter_registro_clientes(ARQUIVO_CLIENTES).nomes()
         print(f"Total de clientes carregados: {len(clientes)}")
         return sorted(clientes)
         
@@ -0,0 +1,313 @@
+"""
+Estilos, modelos de tabela e logomarca compartilhados pelos relatórios PDF
+
+Tudo aqui é criado uma única vez por processo e reutilizado por todos os
+relatórios (e por todos os RelatorioHandler): os ParagraphStyle ficam em
+ESTILOS, os TableStyle fixos em constantes e os das tabelas de despesas em
+cache por conjunto de colunas; a logomarca é lida e decodificada uma vez
+(leitor_logo). Esses objetos são
+compartilhados e não devem ser alterados: para variar um estilo, crie um
+novo com parent=<estilo compartilhado>.
+"""
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_LEFT
+from reportlab.lib.styles import ParagraphStyle, StyleSheet1, getSampleStyleSheet
+from reportlab.lib.utils import ImageReader
+from reportlab.platypus import Image, TableStyle
+
+# Colunas das tabelas de despesas formatadas como número (à direita) e centralizadas
+COLUNAS_NUMERICAS = ('VALOR', 'TOTAL', 'SALÁRIO', 'RESCISÃO', '13º SALÁRIO',
+                     'TRANSPORTE', 'CAFÉ', 'FÉRIAS', 'DIÁRIA', 'DIAS')
+COLUNAS_CENTRALIZADAS = ('DT_VENCTO', 'VENCIMENTO')
+
+
+@dataclass(frozen=True)
+class EstilosRelatorio:
+    """ParagraphStyle usados nos relatórios"""
+    styles: StyleSheet1
+    heading: ParagraphStyle
+    normal: ParagraphStyle
+    despesa: ParagraphStyle
+    periodo: ParagraphStyle
+    subtotal_periodo: ParagraphStyle
+    cabecalho_tabela: ParagraphStyle
+    celula_tabela: ParagraphStyle
+    cabecalho_empresa: ParagraphStyle
+    subtitulo_taxas: ParagraphStyle
+    administrador: ParagraphStyle
+    cpf_cnpj: ParagraphStyle
+    contrato: ParagraphStyle
+    subtotal_administrador: ParagraphStyle
+    total_taxas: ParagraphStyle
+
+
+def _criar_estilos():
+    styles = getSampleStyleSheet()
+
+    heading = ParagraphStyle(
+        'HeadingStyle',
+        parent=styles['Heading1'],
+        fontSize=12,
+        leading=14,
+        alignment=TA_LEFT,
+        leftIndent=0,
+        textColor=colors.black,
+        spaceBefore=20,
+        spaceAfter=12
+    )
+
+    normal = ParagraphStyle(
+        'NormalStyle',
+        parent=styles['Normal'],
+        fontSize=10,
+        leading=12,
+        textColor=colors.black,
+        spaceBefore=12,
+        spaceAfter=6
+    )
+
+    despesa = ParagraphStyle(
+        name='TipoDespesa',
+        parent=styles['Normal'],
+        fontSize=12,
+        leading=14,
+        alignment=TA_LEFT,
+        leftIndent=0,
+        firstLineIndent=0,
+        rightIndent=0,
+        spaceBefore=12,
+        spaceAfter=6,
+        keepWithNext=True
+    )
+
+    return EstilosRelatorio(
+        styles=styles,
+        heading=heading,
+        normal=normal,
+        despesa=despesa,
+        # Lançamentos futuros
+        periodo=ParagraphStyle(
+            'PeriodoStyle',
+            parent=heading,
+            fontSize=14,
+            leading=16,
+            spaceBefore=12,
+            spaceAfter=6,
+            textColor=colors.HexColor('#2F4F4F')  # Cor mais escura para destaque
+        ),
+        subtotal_periodo=ParagraphStyle(
+            'SubtotalStyle',
+            parent=normal,
+            fontSize=10,
+            leading=12,
+            spaceBefore=6,
+            spaceAfter=12,
+            textColor=colors.HexColor('#4A4A4A')
+        ),
+        # Tabelas de despesas
+        cabecalho_tabela=ParagraphStyle(
+            'CabecalhoTabela',
+            parent=normal,
+            fontSize=8,
+            leading=10,
+            alignment=1,
+            textColor=colors.whitesmoke
+        ),
+        celula_tabela=ParagraphStyle(
+            'CelulaTabela',
+            parent=normal,
+            fontSize=8,
+            leading=10,
+            alignment=0  # Alinhamento à esquerda
+        ),
+        # Cabeçalho (endereço e contatos da empresa)
+        cabecalho_empresa=ParagraphStyle(
+            'CabecalhoStyle',
+            parent=normal,
+            alignment=2,
+            spaceBefore=0,
+            spaceAfter=0,
+            leading=12
+        ),
+        # Taxas de administração
+        subtitulo_taxas=ParagraphStyle(
+            'SubtitleStyle',
+            parent=normal,
+            fontSize=9,
+            leading=12,
+            textColor=colors.HexColor('#4A4A4A'),
+            spaceBefore=2,
+            spaceAfter=12
+        ),
+        administrador=ParagraphStyle(
+            'AdminStyle',
+            parent=despesa,
+            fontSize=11,
+            leading=13,
+            textColor=colors.HexColor('#2F4F4F'),
+            spaceBefore=12,
+            spaceAfter=2
+        ),
+        cpf_cnpj=ParagraphStyle(
+            'CpfCnpjStyle',
+            parent=normal,
+            fontSize=8,
+            leading=10,
+            leftIndent=10,
+            textColor=colors.HexColor('#666666'),
+            spaceBefore=0,
+            spaceAfter=6
+        ),
+        contrato=ParagraphStyle(
+            'ContratoStyle',
+            parent=normal,
+            fontSize=9,
+            leading=11,
+            leftIndent=20,
+            textColor=colors.HexColor('#2F4F4F'),
+            spaceBefore=6,
+            spaceAfter=3
+        ),
+        subtotal_administrador=ParagraphStyle(
+            'SubtotalStyle',
+            parent=normal,
+            fontSize=9,
+            leading=11,
+            leftIndent=30,
+            textColor=colors.HexColor('#2F4F4F'),
+            spaceBefore=3,
+            spaceAfter=12,
+            alignment=TA_CENTER  # Centraliza o texto
+        ),
+        total_taxas=ParagraphStyle(
+            'TotalStyle',
+            parent=heading,
+            fontSize=10,
+            leading=12,
+            textColor=colors.HexColor('#2F4F4F'),
+            spaceBefore=12,
+            spaceAfter=6
+        ),
+    )
+
+
+ESTILOS = _criar_estilos()
+
+# === MODELOS DE TABELA ===
+ESTILO_SUBTOTAIS = TableStyle([
+    ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+    ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+    ('FONTSIZE', (0, 0), (-1, -1), 9),
+])
+
+ESTILO_TOTAIS = TableStyle([
+    ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+    ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+    ('FONTSIZE', (0, 0), (-1, -1), 9),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+    ('BOX', (0, 0), (-1, 0), 1, colors.grey),
+    ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+    ('TEXTCOLOR', (0, -1), (-1, -1), colors.black),
+])
+
+ESTILO_CABECALHO_EMPRESA = TableStyle([
+    ('ALIGN', (0, 0), (0, 0), 'LEFT'),
+    ('ALIGN', (1, 0), (1, 0), 'RIGHT'),
+    ('VALIGN', (0, 0), (1, 0), 'TOP'),
+    ('RIGHTPADDING', (1, 0), (1, 0), 0),
+])
+
+ESTILO_INFO_CLIENTE = TableStyle([
+    ('ALIGN', (0, 0), (0, -1), 'LEFT'),    # Alinhar informações do cliente à esquerda
+    ('ALIGN', (1, 0), (1, -1), 'RIGHT'),   # Alinhar número e data à direita
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+])
+
+ESTILO_PARCELAS = TableStyle([
+    # Estilo do cabeçalho
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#E6E6E6')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#2F4F4F')),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 8),
+    ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
+    ('TOPPADDING', (0, 0), (-1, 0), 6),
+
+    # Estilo das células de dados
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 1), (-1, -1), 8),
+    ('ALIGN', (0, 1), (1, -1), 'LEFT'),
+    ('ALIGN', (-1, 1), (-1, -1), 'RIGHT'),
+    ('BOTTOMPADDING', (0, 1), (-1, -1), 4),
+    ('TOPPADDING', (0, 1), (-1, -1), 4),
+    ('LEFTPADDING', (0, 0), (-1, -1), 10),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 10),
+
+    # Grades e bordas
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#CCCCCC')),
+    ('BOX', (0, 0), (-1, -1), 1, colors.HexColor('#999999')),
+])
+
+
+@lru_cache(maxsize=None)
+def estilo_tabela_despesas(colunas, incluir_total=True):
+    """
+    TableStyle das tabelas de despesas para um conjunto de colunas
+
+    Args:
+        colunas (tuple): Colunas exibidas, na ordem da tabela
+        incluir_total (bool): Se a última linha é a de subtotal
+    """
+    estilo_tabela = [
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 8),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('TOPPADDING', (0, 0), (-1, 0), 12),
+        ('GRID', (0, 0), (-1, -1), 1, colors.grey),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ]
+
+    # Alinhar colunas numéricas à direita
+    for i, col in enumerate(colunas):
+        if col in COLUNAS_NUMERICAS:
+            estilo_tabela.append(('ALIGN', (i, 1), (i, -1), 'RIGHT'))
+
+    # Alinhar colunas de data e outras centralizadas ao centro
+    for i, col in enumerate(colunas):
+        if col in COLUNAS_CENTRALIZADAS:
+            estilo_tabela.append(('ALIGN', (i, 0), (i, -1), 'CENTER'))
+
+    if incluir_total:
+        estilo_tabela.extend([
+            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+            ('BACKGROUND', (0, -1), (-1, -1), colors.lightgrey),
+        ])
+
+    return TableStyle(estilo_tabela)
+
+
+# === LOGOMARCA ===
+@lru_cache(maxsize=None)
+def leitor_logo(caminho):
+    """ImageReader da logomarca, decodificado uma única vez (None se o arquivo não existir)"""
+    if not caminho or not os.path.exists(caminho):
+        return None
+    leitor = ImageReader(caminho)
+    leitor.getRGBData()  # decodifica agora: os PDFs usam os pixels já convertidos
+    return leitor
+
+
+class LogoRelatorio(Image):
+    """Image da logomarca que desenha a partir do leitor compartilhado (leitor_logo)"""
+
+    def __init__(self, caminho, width=None, height=None):
+        super().__init__(caminho, width=width, height=height)
+        self._img = leitor_logo(caminho)
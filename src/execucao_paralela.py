@@ -0,0 +1,117 @@
+"""
+Execução de tarefas independentes em um pool de processos
+
+Usado pelas rotinas em lote (planejamento do fechamento, relatórios) em que
+cada cliente é processado isoladamente e a leitura das planilhas (openpyxl)
+é CPU-bound. A função executada deve ser de nível de módulo (para poder ser
+enviada aos processos) e os resultados, serializáveis.
+
+O callback ao_concluir(chave, resultado, erro) é chamado à medida que cada
+tarefa termina, a partir de uma thread do executor: interfaces Tk devem
+apenas enfileirar o resultado e consumi-lo na thread principal (root.after).
+O callback é chamado antes de a tarefa entrar em concluidos: lendo concluidos
+antes de esvaziar a fila, todos os resultados contados já estão nela.
+"""
+import logging
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, CancelledError
+
+logger = logging.getLogger(__name__)
+
+
+def numero_processos(total_tarefas, max_workers=None):
+    """Quantidade de processos do pool: max_workers ou um por núcleo, sem exceder as tarefas"""
+    limite = max_workers or os.cpu_count() or 1
+    return max(1, min(limite, total_tarefas))
+
+
+class ExecucaoParalela:
+    """
+    Executa funcao(*argumentos) para cada tarefa em um ProcessPoolExecutor
+
+    Args:
+        funcao: Função de nível de módulo
+        tarefas (dict): chave -> tupla de argumentos (a ordem é preservada
+            em resultados())
+        max_workers (int, optional): Limite de processos (padrão: núcleos)
+    """
+
+    def __init__(self, funcao, tarefas, max_workers=None):
+        self.funcao = funcao
+        self.tarefas = dict(tarefas)
+        self.max_workers = numero_processos(len(self.tarefas), max_workers)
+        self._futures = {}
+        self._resultados = {}
+        self._cancelado = threading.Event()
+        self._lock = threading.Condition()
+        self._pendentes = 0
+
+    @property
+    def total(self):
+        return len(self.tarefas)
+
+    @property
+    def concluidos(self):
+        with self._lock:
+            return len(self._resultados)
+
+    @property
+    def cancelado(self):
+        return self._cancelado.is_set()
+
+    def iniciar(self, ao_concluir=None):
+        """Submete todas as tarefas ao pool e retorna sem aguardar"""
+        if not self.tarefas:
+            return self
+        executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        with self._lock:
+            self._pendentes = len(self.tarefas)
+        for chave, argumentos in self.tarefas.items():
+            future = executor.submit(self.funcao, *argumentos)
+            self._futures[future] = chave
+            future.add_done_callback(lambda f, chave=chave: self._concluir(chave, f, ao_concluir))
+        # Os processos encerram sozinhos quando a fila esvaziar
+        executor.shutdown(wait=False)
+        return self
+
+    def _concluir(self, chave, future, ao_concluir):
+        try:
+            try:
+                resultado, erro = future.result(), None
+            except CancelledError:
+                return
+            except Exception as e:  # exceção da tarefa ou processo encerrado de forma anormal
+                logger.error(f"Erro na tarefa {chave}: {str(e)}")
+                resultado, erro = None, e
+            try:
+                if ao_concluir and not self.cancelado:
+                    ao_concluir(chave, resultado, erro)
+            finally:
+                # Registrado só depois do callback: quem vê a tarefa em concluidos
+                # já recebeu o resultado pelo callback
+                with self._lock:
+                    self._resultados[chave] = (resultado, erro)
+        finally:
+            # aguardar() só retorna depois de o resultado ter sido registrado
+            with self._lock:
+                self._pendentes -= 1
+                self._lock.notify_all()
+
+    def cancelar(self):
+        """Cancela as tarefas ainda não iniciadas; as em andamento são descartadas"""
+        self._cancelado.set()
+        for future in self._futures:
+            future.cancel()
+
+    def aguardar(self):
+        """Bloqueia até todas as tarefas terminarem (ou serem canceladas)"""
+        with self._lock:
+            self._lock.wait_for(lambda: self._pendentes <= 0)
+        return self.resultados()
+
+    def resultados(self):
+        """Lista (chave, resultado, erro) das tarefas concluídas, na ordem das tarefas"""
+        with self._lock:
+            concluidos = dict(self._resultados)
+        return [(chave, *concluidos[chave]) for chave in self.tarefas if chave in concluidos]
@@ -0,0 +1,601 @@
+"""
+Fechamento de quinzena - Taxa ADM percentual
+
+Calcula uma única vez, para cada cliente, o plano de fechamento da quinzena:
+valor base (tipos 1 a 6), percentual dos contratos vigentes, rateio entre os
+administradores e data de vencimento. O plano é imutável; a tela exibe o
+plano e depois o executa, sem recalcular nada. Não depende de tkinter.
+
+Aberturas de planilha por cliente num fechamento completo:
+    - planejamento: aba Contratos_ADM em modo somente leitura (a aba Dados
+      vem do índice/cache colunar)
+    - execução: uma abertura para acrescentar os lançamentos e salvar
+
+Linha de comando (fechamento completo sem interface):
+    python -m src.fechamento_quinzena --data 20/03/2025 --dry-run
+    python -m src.fechamento_quinzena --data 20/03/2025 --commit --workers 4
+    python -m src.fechamento_quinzena --data 20/03/2025 --commit --incluir-fixas
+
+As taxas fixas sempre entram no plano; com --incluir-fixas, o --commit também
+as lança (aba Dados e parcela no bloco PARCELAS de Contratos_ADM) no mesmo
+salvamento da planilha. Sem a opção, o lançamento delas continua pela tela de
+entrada de dados.
+"""
+import argparse
+import contextlib
+import json
+import logging
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Optional, Tuple
+
+from openpyxl import load_workbook
+
+try:
+    from src.contratos_adm import ContratosADM, COL_PARCELAS, LINHA_INICIAL, carregar_contratos_adm
+    from src.execucao_paralela import ExecucaoParalela
+    from src.indice_dados import obter_indice_dados
+    from src.registro_clientes import obter_registro_clientes
+    from src.registro_fornecedores import obter_registro_fornecedores
+    from src import quinzena
+except ImportError:
+    from contratos_adm import ContratosADM, COL_PARCELAS, LINHA_INICIAL, carregar_contratos_adm
+    from execucao_paralela import ExecucaoParalela
+    from indice_dados import obter_indice_dados
+    from registro_clientes import obter_registro_clientes
+    from registro_fornecedores import obter_registro_fornecedores
+    import quinzena
+
+logger = logging.getLogger(__name__)
+
+TIPO_TAXA_ADM = 7
+# Tipos de despesa que compõem a base de cálculo da Taxa ADM percentual
+TIPOS_BASE_TAXA = range(1, 7)
+
+STATUS_PENDENTE = "PENDENTE"
+STATUS_LANCADO = "LANÇADO"
+
+
+@dataclass(frozen=True)
+class RateioAdministrador:
+    """Parte da Taxa ADM de um administrador"""
+    cnpj_cpf: Any
+    nome: Any
+    percentual: float
+    valor: float
+
+
+@dataclass(frozen=True)
+class PlanoCliente:
+    """Lançamentos de Taxa ADM calculados para um cliente"""
+    cliente: str
+    arquivo: Path
+    data_ref: datetime
+    valor_base: float
+    quantidade_base: int
+    percentual_total: float
+    valor_taxa: float
+    dt_vencto: datetime
+    rateio: Tuple[RateioAdministrador, ...]
+    status: str = STATUS_PENDENTE
+
+    @property
+    def referencia(self):
+        return referencia_taxa(self.data_ref)
+
+
+@dataclass(frozen=True)
+class LancamentoFixo:
+    """Taxa ADM fixa (Valor/Parcela de administrador tipo 'Fixo') a lançar na data"""
+    cliente: str
+    numero_contrato: Any
+    cnpj_cpf: Any
+    nome: Any
+    referencia: str
+    valor: float
+    data_rel: datetime
+    dt_vencto: datetime
+    arquivo: Optional[Path] = None
+
+
+@dataclass(frozen=True)
+class PlanoFechamento:
+    """Plano de fechamento de uma data de referência"""
+    data_ref: datetime
+    clientes: Tuple[PlanoCliente, ...]
+    ignorados: Tuple[Tuple[str, str], ...]  # (cliente, motivo)
+    taxas_fixas: Tuple[LancamentoFixo, ...] = ()
+
+    def cliente(self, nome) -> Optional[PlanoCliente]:
+        for plano in self.clientes:
+            if plano.cliente == nome:
+                return plano
+        return None
+
+    @property
+    def valor_total(self):
+        return sum(plano.valor_taxa for plano in self.clientes)
+
+    def para_dict(self):
+        """Plano em estruturas simples (datas dd/mm/aaaa), pronto para json.dump"""
+        return {
+            'data_ref': _data_br(self.data_ref),
+            'valor_total': round(self.valor_total, 2),
+            'clientes': [{
+                'cliente': plano.cliente,
+                'arquivo': str(plano.arquivo),
+                'valor_base': round(plano.valor_base, 2),
+                'quantidade_base': plano.quantidade_base,
+                'percentual_total': plano.percentual_total,
+                'valor_taxa': round(plano.valor_taxa, 2),
+                'referencia': plano.referencia,
+                'dt_vencto': _data_br(plano.dt_vencto),
+                'status': plano.status,
+                'rateio': [{
+                    'cnpj_cpf': str(adm.cnpj_cpf),
+                    'nome': adm.nome,
+                    'percentual': adm.percentual,
+                    'valor': round(adm.valor, 2),
+                } for adm in plano.rateio],
+            } for plano in self.clientes],
+            'taxas_fixas': [{
+                'cliente': fixa.cliente,
+                'numero_contrato': fixa.numero_contrato,
+                'cnpj_cpf': str(fixa.cnpj_cpf),
+                'nome': fixa.nome,
+                'referencia': fixa.referencia,
+                'valor': round(fixa.valor, 2),
+                'dt_vencto': _data_br(fixa.dt_vencto),
+            } for fixa in self.taxas_fixas],
+            'ignorados': [{'cliente': cliente, 'motivo': motivo} for cliente, motivo in self.ignorados],
+        }
+
+
+def _data_br(data):
+    return data.strftime('%d/%m/%Y')
+
+
+def calcular_vencimento_taxa(data_ref):
+    """
+    Vencimento da Taxa ADM: na quinzena do dia 05, o próprio dia ou o
+    próximo dia útil; na do dia 20, sempre o dia 20
+    """
+    dt_vencto = data_ref
+    if data_ref.day == 5:
+        while dt_vencto.weekday() >= 5:  # 5 = Sábado, 6 = Domingo
+            dt_vencto += timedelta(days=1)
+    return dt_vencto
+
+
+def referencia_taxa(data_ref):
+    """Texto da coluna REFERÊNCIA do lançamento de Taxa ADM"""
+    quinzena = "1ª" if data_ref.day == 5 else "2ª"
+    return f"ADM. OBRA REF. {quinzena} QUINZ. {data_ref.strftime('%m/%Y')}"
+
+
+def calcular_vencimento_fixo(data_ref):
+    """Vencimento da taxa fixa: dia 20 para a quinzena do dia 05; dia 05 do mês seguinte para a do dia 20"""
+    return quinzena.proxima(data_ref)
+
+
+def planejar_taxas_fixas(contratos, data_ref, nome_cliente=None, arquivo_cliente=None):
+    """
+    Taxas fixas a lançar na data: administradores tipo 'Fixo' de contratos
+    ativos que ainda não têm parcela registrada para a data
+
+    Args:
+        contratos (ContratosADM): Aba Contratos_ADM do cliente
+        arquivo_cliente (Path, optional): Planilha do cliente, usada na execução
+    """
+    data_str = data_ref.strftime("%d/%m/%Y")
+    lancamentos = []
+    for adm in contratos.administradores_contrato:
+        if adm.tipo != 'Fixo' or not contratos.contrato_ativo(adm.numero_contrato):
+            continue
+        if contratos.tem_parcela(adm.numero_contrato, adm.cnpj_cpf, data_str):
+            continue
+        lancamentos.append(LancamentoFixo(
+            cliente=nome_cliente,
+            numero_contrato=adm.numero_contrato,
+            cnpj_cpf=adm.cnpj_cpf,
+            nome=adm.nome,
+            referencia=f'ADM FIXA REF. {data_ref.strftime("%m/%Y")}',
+            valor=adm.percentual,  # coluna Valor/Percentual
+            data_rel=data_ref,
+            dt_vencto=calcular_vencimento_fixo(data_ref),
+            arquivo=arquivo_cliente,
+        ))
+    return tuple(lancamentos)
+
+
+def planejar_cliente(nome_cliente, data_ref, pasta_clientes):
+    """
+    Calcula o plano de fechamento (Taxa ADM percentual) de um cliente
+
+    Returns:
+        tuple: (PlanoCliente, None) ou (None, motivo) quando não há o que lançar
+    """
+    plano, motivo, _ = _planejar(nome_cliente, data_ref, pasta_clientes)
+    return plano, motivo
+
+
+def _planejar(nome_cliente, data_ref, pasta_clientes):
+    """Plano percentual e taxas fixas do cliente a partir de uma única leitura de Contratos_ADM"""
+    arquivo_cliente = Path(pasta_clientes) / f"{nome_cliente}.xlsx"
+    if not arquivo_cliente.exists():
+        return None, f"Arquivo não encontrado: {arquivo_cliente}", ()
+
+    contratos = carregar_contratos_adm(arquivo_cliente)
+    if contratos is None:
+        return None, "Aba Contratos_ADM não encontrada", ()
+
+    try:
+        taxas_fixas = planejar_taxas_fixas(contratos, data_ref, nome_cliente, arquivo_cliente)
+    except (ValueError, TypeError, AttributeError) as e:
+        logger.warning(f"{nome_cliente}: taxa fixa inválida: {e}")
+        taxas_fixas = ()
+
+    plano, motivo = _planejar_percentual(nome_cliente, arquivo_cliente, contratos, data_ref)
+    return plano, motivo, taxas_fixas
+
+
+def _planejar_percentual(nome_cliente, arquivo_cliente, contratos, data_ref):
+    indice_dados = obter_indice_dados(arquivo_cliente)
+    if indice_dados.tem_lancamento(data_ref, TIPO_TAXA_ADM):
+        return None, "Já possui lançamento de Taxa ADM na data"
+
+    valor_base = indice_dados.subtotal(data_ref, TIPOS_BASE_TAXA)
+    quantidade_base = indice_dados.quantidade(data_ref, TIPOS_BASE_TAXA)
+    if quantidade_base == 0:
+        return None, "Sem lançamentos base para cálculo"
+
+    # Percentual dos contratos vigentes; o rateio considera cada administrador uma vez
+    percentual_total = 0
+    administradores = {}
+    for contrato in contratos.contratos_vigentes(data_ref):
+        for adm in contratos.administradores(contrato.numero, tipo='Percentual'):
+            try:
+                percentual = adm.percentual
+            except (ValueError, TypeError) as e:
+                logger.warning(f"{nome_cliente}: percentual inválido no contrato {contrato.numero}: {e}")
+                continue
+            percentual_total += percentual
+            administradores.setdefault(adm.cnpj_cpf, (adm.nome, percentual))
+
+    if percentual_total <= 0:
+        return None, "Sem taxa percentual ativa no período"
+
+    valor_taxa = valor_base * percentual_total / 100
+    soma_rateio = sum(percentual for _, percentual in administradores.values())
+    rateio = tuple(
+        RateioAdministrador(cnpj_cpf, nome, percentual, valor_taxa * percentual / soma_rateio)
+        for cnpj_cpf, (nome, percentual) in administradores.items()
+    )
+
+    return PlanoCliente(
+        cliente=nome_cliente,
+        arquivo=arquivo_cliente,
+        data_ref=data_ref,
+        valor_base=valor_base,
+        quantidade_base=quantidade_base,
+        percentual_total=percentual_total,
+        valor_taxa=valor_taxa,
+        dt_vencto=calcular_vencimento_taxa(data_ref),
+        rateio=rateio,
+    ), None
+
+
+def planejar_fechamento(data_ref, pasta_clientes, clientes=None, max_workers=None):
+    """
+    Calcula o plano de fechamento de todos os clientes
+
+    Args:
+        data_ref (datetime): Data de referência (dia 5 ou 20)
+        pasta_clientes: Pasta com as planilhas dos clientes
+        clientes (list, optional): Nomes dos clientes; se não informado, usa o
+            registro de clientes (clientes.xlsx)
+        max_workers (int, optional): Se informado, os clientes são analisados
+            em um pool com esse limite de processos
+    """
+    if clientes is None:
+        clientes = obter_registro_clientes().nomes()
+
+    if max_workers:
+        return PlanejamentoParalelo(data_ref, pasta_clientes, clientes, max_workers).iniciar().aguardar()
+
+    return _montar_plano(data_ref, [(nome, _planejar_isolado(nome, data_ref, pasta_clientes))
+                                    for nome in clientes])
+
+
+def _planejar_isolado(nome_cliente, data_ref, pasta_clientes):
+    """_planejar sem propagar exceções (usado também nos processos do pool)"""
+    try:
+        return _planejar(nome_cliente, data_ref, pasta_clientes)
+    except Exception as e:
+        return None, f"Erro: {str(e)}", ()
+
+
+def _montar_plano(data_ref, resultados):
+    planos = []
+    ignorados = []
+    taxas_fixas = []
+    for nome_cliente, (plano, motivo, fixas) in resultados:
+        if plano is None:
+            ignorados.append((nome_cliente, motivo))
+        else:
+            planos.append(plano)
+        taxas_fixas.extend(fixas)
+    return PlanoFechamento(data_ref, tuple(planos), tuple(ignorados), tuple(taxas_fixas))
+
+
+class PlanejamentoParalelo(ExecucaoParalela):
+    """
+    Calcula os planos dos clientes em um pool de processos
+
+    O callback ao_concluir(nome, plano, motivo) é chamado à medida que cada
+    cliente termina, a partir de uma thread do executor.
+    """
+
+    def __init__(self, data_ref, pasta_clientes, clientes, max_workers=None):
+        self.data_ref = data_ref
+        self.clientes = list(clientes)
+        super().__init__(_planejar_isolado,
+                         {nome: (nome, data_ref, pasta_clientes) for nome in self.clientes},
+                         max_workers)
+
+    def iniciar(self, ao_concluir=None):
+        def repassar(nome_cliente, resultado, erro):
+            if ao_concluir:
+                plano, motivo, _ = _resultado_planejamento(resultado, erro)
+                ao_concluir(nome_cliente, plano, motivo)
+        return super().iniciar(repassar)
+
+    def aguardar(self):
+        super().aguardar()
+        return self.plano()
+
+    def plano(self):
+        """PlanoFechamento com os clientes concluídos até o momento, na ordem original"""
+        return _montar_plano(self.data_ref, [(nome_cliente, _resultado_planejamento(resultado, erro))
+                                             for nome_cliente, resultado, erro in self.resultados()])
+
+
+def _resultado_planejamento(resultado, erro):
+    if erro is not None:  # processo do pool encerrado de forma anormal
+        return None, f"Erro: {str(erro)}", ()
+    return resultado
+
+
+def executar_plano_cliente(plano, arquivo_fornecedores=None):
+    """
+    Acrescenta à aba Dados os lançamentos de Taxa ADM do plano (uma abertura
+    da planilha). Administradores que já têm lançamento na data são ignorados.
+
+    Args:
+        plano (PlanoCliente): Plano calculado por planejar_cliente
+        arquivo_fornecedores (str, optional): Base de fornecedores (dados
+            bancários); se não informado, usa a da configuração
+
+    Returns:
+        int: Quantidade de lançamentos gravados
+    """
+    gravados, _ = executar_cliente(plano.arquivo, plano, (), arquivo_fornecedores)
+    return gravados
+
+
+def executar_cliente(arquivo, plano=None, taxas_fixas=(), arquivo_fornecedores=None):
+    """
+    Lança a Taxa ADM percentual do plano e as taxas fixas do cliente em uma
+    única abertura e um único salvamento da planilha
+
+    Cada taxa fixa vira um lançamento tipo 7 na aba Dados e uma parcela com
+    status LANÇADO no bloco PARCELAS de Contratos_ADM (a parcela é o que
+    planejar_taxas_fixas consulta, evitando lançar a mesma taxa de novo).
+
+    Args:
+        arquivo (Path): Planilha do cliente
+        plano (PlanoCliente, optional): Plano percentual (None se só houver taxas fixas)
+        taxas_fixas (tuple): LancamentoFixo do cliente
+        arquivo_fornecedores (str, optional): Base de fornecedores (dados bancários)
+
+    Returns:
+        tuple: (lançamentos percentuais gravados, taxas fixas gravadas)
+    """
+    indice_dados = obter_indice_dados(arquivo)
+    fornecedores = obter_registro_fornecedores(arquivo_fornecedores)
+
+    wb = load_workbook(arquivo)
+    try:
+        ws_dados = wb["Dados"]
+        lancados = []  # entram no índice só depois do salvamento
+        gravados = 0
+        for adm in (plano.rateio if plano else ()):
+            if indice_dados.tem_lancamento(plano.data_ref, TIPO_TAXA_ADM, adm.cnpj_cpf):
+                logger.info(f"Já existe lançamento para {adm.nome} nesta data")
+                continue
+
+            linha = ws_dados.max_row + 1
+            _gravar_lancamento_taxa(ws_dados, linha, plano.data_ref, adm.cnpj_cpf, adm.nome, plano.referencia,
+                                    adm.valor, plano.dt_vencto, fornecedores.dados_bancarios(adm.cnpj_cpf))
+            lancados.append((linha, plano.data_ref, TIPO_TAXA_ADM, adm.cnpj_cpf, adm.valor))
+            gravados += 1
+
+        fixas_gravadas = 0
+        if taxas_fixas:
+            ws_contratos = wb["Contratos_ADM"]
+            contratos = ContratosADM.ler(ws_contratos)
+            # Novas parcelas vão após a última linha ocupada do bloco PARCELAS
+            linha_parcela = max((p.linha for p in contratos.parcelas), default=LINHA_INICIAL - 1) + 1
+            ultimo_numero = {}  # nº contrato -> último nº de parcela
+            for fixa in taxas_fixas:
+                data_str = fixa.data_rel.strftime("%d/%m/%Y")
+                if contratos.tem_parcela(fixa.numero_contrato, fixa.cnpj_cpf, data_str):
+                    logger.info(f"Já existe parcela fixa para {fixa.nome} nesta data")
+                    continue
+
+                linha = ws_dados.max_row + 1
+                _gravar_lancamento_taxa(ws_dados, linha, fixa.data_rel, fixa.cnpj_cpf, fixa.nome, fixa.referencia,
+                                        fixa.valor, fixa.dt_vencto, fornecedores.dados_bancarios(fixa.cnpj_cpf))
+                lancados.append((linha, fixa.data_rel, TIPO_TAXA_ADM, fixa.cnpj_cpf, fixa.valor))
+
+                if fixa.numero_contrato not in ultimo_numero:
+                    ultimo_numero[fixa.numero_contrato] = max(
+                        (p.numero for p in contratos.parcelas_do_contrato(fixa.numero_contrato)
+                         if isinstance(p.numero, int)), default=0)
+                ultimo_numero[fixa.numero_contrato] += 1
+                _gravar_parcela_fixa(ws_contratos, linha_parcela, fixa, ultimo_numero[fixa.numero_contrato],
+                                     data_str)
+                linha_parcela += 1
+                fixas_gravadas += 1
+
+        if gravados or fixas_gravadas:
+            wb.save(arquivo)
+            indice_dados.confirmar_gravacao(lancados)
+        return gravados, fixas_gravadas
+    finally:
+        wb.close()
+
+
+class ExecucaoFechamento(ExecucaoParalela):
+    """
+    Executa os planos dos clientes em um pool de processos (uma planilha por
+    processo). O callback ao_concluir(cliente, gravados, erro) é chamado à
+    medida que cada cliente termina, com gravados = (percentuais, fixas).
+
+    Com incluir_fixas, as taxas fixas do plano são lançadas junto com a
+    Taxa ADM percentual do mesmo cliente.
+    """
+
+    def __init__(self, plano_fechamento, arquivo_fornecedores=None, max_workers=None, incluir_fixas=False):
+        self.plano_fechamento = plano_fechamento
+        tarefas = {plano.cliente: (plano.arquivo, plano, (), arquivo_fornecedores)
+                   for plano in plano_fechamento.clientes}
+        if incluir_fixas:
+            fixas_por_cliente = {}
+            for fixa in plano_fechamento.taxas_fixas:
+                fixas_por_cliente.setdefault(fixa.cliente, []).append(fixa)
+            for cliente, fixas in fixas_por_cliente.items():
+                plano = plano_fechamento.cliente(cliente)
+                tarefas[cliente] = (fixas[0].arquivo, plano, tuple(fixas), arquivo_fornecedores)
+        super().__init__(executar_cliente, tarefas, max_workers)
+
+
+def _gravar_lancamento_taxa(ws_dados, linha, data_rel, cnpj_cpf, nome, referencia, valor, dt_vencto,
+                            dados_bancarios):
+    """Preenche uma linha da aba Dados com o lançamento de Taxa ADM (tipo 7)"""
+    ws_dados.cell(row=linha, column=1, value=data_rel).number_format = 'DD/MM/YYYY'
+    ws_dados.cell(row=linha, column=2, value=TIPO_TAXA_ADM)
+    ws_dados.cell(row=linha, column=3, value=cnpj_cpf)
+    ws_dados.cell(row=linha, column=4, value=nome)
+    ws_dados.cell(row=linha, column=5, value=referencia)
+    ws_dados.cell(row=linha, column=6, value='')  # NF
+    ws_dados.cell(row=linha, column=7, value=valor).number_format = '#,##0.00'
+    ws_dados.cell(row=linha, column=8, value=1)  # Dias
+    ws_dados.cell(row=linha, column=9, value=valor).number_format = '#,##0.00'
+    ws_dados.cell(row=linha, column=10, value=dt_vencto).number_format = 'DD/MM/YYYY'
+    ws_dados.cell(row=linha, column=11, value='ADM')  # Categoria
+    ws_dados.cell(row=linha, column=12, value=dados_bancarios)
+    ws_dados.cell(row=linha, column=13, value='LANÇAMENTO AUTOMÁTICO')  # Observação
+
+
+def _gravar_parcela_fixa(ws_contratos, linha, fixa, numero, data_str):
+    """Registra a taxa fixa lançada no bloco PARCELAS (Y–AF) de Contratos_ADM"""
+    c = COL_PARCELAS + 1
+    ws_contratos.cell(row=linha, column=c, value=fixa.numero_contrato)
+    ws_contratos.cell(row=linha, column=c + 1, value=numero)
+    ws_contratos.cell(row=linha, column=c + 2, value=fixa.cnpj_cpf)
+    ws_contratos.cell(row=linha, column=c + 3, value=fixa.nome)
+    # Data da quinzena em texto dd/mm/aaaa, como tem_parcela compara
+    ws_contratos.cell(row=linha, column=c + 4, value=data_str)
+    ws_contratos.cell(row=linha, column=c + 5, value=fixa.valor).number_format = '#,##0.00'
+    ws_contratos.cell(row=linha, column=c + 6, value=STATUS_LANCADO)
+
+
+def executar_linha_comando(argv=None):
+    """
+    Fechamento da quinzena sem interface
+
+    --dry-run grava/exibe o plano em JSON sem alterar as planilhas; --commit
+    calcula e aplica o plano (com --incluir-fixas, também as taxas fixas).
+    Retorna 0 em caso de sucesso e 1 se algum cliente falhou.
+    """
+    parser = argparse.ArgumentParser(
+        prog='python -m src.fechamento_quinzena',
+        description='Calcula (e opcionalmente lança) a Taxa ADM percentual da quinzena de todos os clientes.')
+    parser.add_argument('--data', required=True,
+                        type=lambda valor: datetime.strptime(valor, '%d/%m/%Y'),
+                        help='Data de referência (dd/mm/aaaa, dia 05 ou 20)')
+    modo = parser.add_mutually_exclusive_group(required=True)
+    modo.add_argument('--dry-run', action='store_true', help='Apenas exibe o plano em JSON')
+    modo.add_argument('--commit', action='store_true', help='Lança as taxas do plano nas planilhas')
+    parser.add_argument('--incluir-fixas', action='store_true',
+                        help='Com --commit, lança também as taxas fixas do plano (aba Dados e parcela LANÇADO '
+                             'em Contratos_ADM) no mesmo salvamento da planilha. Sem esta opção elas ficam '
+                             'no plano só para conferência e continuam a ser lançadas pela tela de entrada '
+                             'de dados; use um dos dois caminhos por quinzena, pois a tela não reconhece '
+                             'as parcelas que ela mesma registra e lançaria a taxa de novo.')
+    parser.add_argument('--pasta', default=None, help='Pasta das planilhas dos clientes (padrão: configuração)')
+    parser.add_argument('--clientes', nargs='+', default=None,
+                        help='Nomes dos clientes (padrão: todos de clientes.xlsx)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Processos simultâneos (padrão: número de núcleos)')
+    parser.add_argument('--saida', default=None, help='Arquivo JSON de saída (padrão: saída padrão)')
+    args = parser.parse_args(argv)
+
+    if args.data.day not in (5, 20):
+        parser.error("a data de referência deve ser dia 05 ou 20")
+    if args.incluir_fixas and not args.commit:
+        parser.error("--incluir-fixas exige --commit")
+
+    # A configuração escreve o ambiente na saída padrão, reservada ao JSON
+    with contextlib.redirect_stdout(sys.stderr):
+        pasta_clientes = args.pasta
+        clientes = args.clientes
+        arquivo_fornecedores = None
+        if pasta_clientes is None or clientes is None or args.commit:
+            from src.config.config import PASTA_CLIENTES, ARQUIVO_CLIENTES, ARQUIVO_FORNECEDORES
+            pasta_clientes = pasta_clientes or PASTA_CLIENTES
+            clientes = clientes or obter_registro_clientes(ARQUIVO_CLIENTES).nomes()
+            arquivo_fornecedores = ARQUIVO_FORNECEDORES
+
+        inicio = time.perf_counter()
+        plano = PlanejamentoParalelo(args.data, pasta_clientes, clientes, args.workers).iniciar().aguardar()
+        logger.info(f"Plano calculado em {time.perf_counter() - inicio:.1f}s: {len(plano.clientes)} cliente(s), "
+                    f"R$ {plano.valor_total:,.2f}")
+        falhas = sum(1 for _, motivo in plano.ignorados if motivo.startswith("Erro"))
+
+        saida = plano.para_dict()
+        if args.commit:
+            execucao = ExecucaoFechamento(plano, arquivo_fornecedores, args.workers, args.incluir_fixas)
+            execucao.iniciar(lambda cliente, gravados, erro: logger.info(
+                f"{cliente}: {'ERRO ' + str(erro) if erro else '%d lançamento(s), %d taxa(s) fixa(s)' % gravados}"))
+            saida['execucao'] = [{
+                'cliente': cliente,
+                'lancamentos': gravados[0] if gravados else 0,
+                'taxas_fixas': gravados[1] if gravados else 0,
+                'erro': str(erro) if erro else None,
+            } for cliente, gravados, erro in execucao.aguardar()]
+            falhas += sum(1 for item in saida['execucao'] if item['erro'])
+            saida['taxas_fixas_lancadas'] = args.incluir_fixas
+            if not args.incluir_fixas:
+                saida['taxas_fixas_observacao'] = (
+                    "Taxas fixas não lançadas (sem --incluir-fixas): ficam no plano para conferência "
+                    "e devem ser lançadas pela tela de entrada de dados.")
+        saida['falhas'] = falhas
+        saida['segundos'] = round(time.perf_counter() - inicio, 3)
+
+    texto = json.dumps(saida, ensure_ascii=False, indent=2)
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            f.write(texto)
+    else:
+        print(texto)
+    return 0 if falhas == 0 else 1
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    sys.exit(executar_linha_comando())
@@ -13,13 +13,23 @@ from tkinter import ttk, messagebox
 from tkcalendar import DateEntry
 from openpyxl import load_workbook, Workbook
 from datetime import datetime
-from dateutil.relativedelta import relativedelta
 import calendar
 import os
+import queue
 import openpyxl
 
 
 from src.Sistema_Entrada_Dados import GestaoTaxasFixas
+from src.indice_dados import obter_indice_dados
+from src.registro_clientes import obter_registro_clientes
+from src.contratos_adm import ContratosADM, carregar_contratos_adm
+from src.fechamento_quinzena import (
+    PlanejamentoParalelo,
+    executar_plano_cliente,
+    calcular_vencimento_taxa,
+    referencia_taxa,
+    TIPOS_BASE_TAXA
+)
 from src.config.utils import (
     validar_data,
     validar_data_quinzena,
@@ -32,6 +42,10 @@ from src.config.utils import (
 )
 
 
+def formatar_valor_br(valor):
+    """Formata valor em Real (1.234,56)"""
+    return f"{valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+
 
 class ControleLancamentosTaxaADM:
     def __init__(self):
@@ -130,6 +144,8 @@ class FinalizacaoQuinzena:
         # Inicializar atributos que serão usados na interface
         self.data_ref_entry = None
         self.tree_clientes = None
+        self.plano = None  # PlanoFechamento da última carga
+        self.planejamento = None  # PlanejamentoParalelo em andamento
         
         # Configurar a interface
         self.setup_gui()
@@ -176,6 +192,17 @@ class FinalizacaoQuinzena:
                   text="Carregar Clientes",
                   command=self.carregar_clientes).pack(side='left', padx=5)
 
+        # Progresso do carregamento (os clientes são analisados em paralelo)
+        self.btn_cancelar = ttk.Button(frame_data,
+                                      text="Cancelar",
+                                      command=self.cancelar_carregamento,
+                                      state='disabled')
+        self.btn_cancelar.pack(side='right', padx=5)
+        self.label_progresso = ttk.Label(frame_data, text="")
+        self.label_progresso.pack(side='right', padx=5)
+        self.progresso = ttk.Progressbar(frame_data, length=200, mode='determinate')
+        self.progresso.pack(side='right', padx=5)
+
         # Frame para lista de clientes
         frame_lista = ttk.LabelFrame(main_frame, text="Clientes")
         frame_lista.pack(fill='both', expand=True, pady=5)
@@ -212,151 +239,91 @@ class FinalizacaoQuinzena:
         return validar_data(data_str)
 
     def carregar_clientes(self):
-        """Carrega os clientes com suas informações e status"""
+        """
+        Calcula o plano de fechamento da data em paralelo (um processo por
+        cliente) e exibe cada cliente com taxa a lançar assim que termina
+        """
         data_ref = self.data_ref_entry.get()
         if not self.validar_data(data_ref):
             messagebox.showerror("Erro", "Data inválida!")
             return
 
         try:
+            self.cancelar_carregamento()
+
             # Limpar lista atual
             for item in self.tree_clientes.get_children():
                 self.tree_clientes.delete(item)
-
-            wb = load_workbook(ARQUIVO_CLIENTES)
-            ws = wb['Clientes']
+            self.plano = None
 
             print("\nIniciando carregamento de clientes...")
             data_ref_dt = datetime.strptime(data_ref, '%d/%m/%Y')
+            nomes = obter_registro_clientes(ARQUIVO_CLIENTES).nomes()
 
-            for row in ws.iter_rows(min_row=2, values_only=True):
-                if not row[0]:  # Pula linhas vazias
-                    continue
-
-                nome_cliente = row[0]
-                arquivo_cliente = PASTA_CLIENTES / f"{nome_cliente}.xlsx"
+            self.progresso.configure(maximum=max(len(nomes), 1), value=0)
+            self.label_progresso.configure(text=f"0/{len(nomes)} clientes")
+            self.btn_cancelar.configure(state='normal')
 
-                print(f"\nVerificando cliente: {nome_cliente}")
-
-                if not os.path.exists(arquivo_cliente):
-                    print(f"Arquivo não encontrado: {arquivo_cliente}")
-                    continue
-
-                try:
-                    wb_cliente = load_workbook(arquivo_cliente)
-
-                    if 'Contratos_ADM' not in wb_cliente.sheetnames:
-                        print(f"Aba Contratos_ADM não encontrada para: {nome_cliente}")
-                        wb_cliente.close()
-                        continue
-
-                    ws_contratos = wb_cliente['Contratos_ADM']
-                    ws_dados = wb_cliente['Dados']
-
-                    # Primeiro verificar se já existe lançamento na data
-                    tem_lancamento = False
-                    for row in ws_dados.iter_rows(min_row=2, values_only=True):
-                        if row[0] and isinstance(row[0], datetime):  # Data do lançamento
-                            if (row[0].day == data_ref_dt.day and 
-                                row[0].month == data_ref_dt.month and 
-                                row[0].year == data_ref_dt.year and 
-                                row[1] == 7):  # Tipo 7 = Taxa ADM percentual
-                                tem_lancamento = True
-                                print(f"Lançamento existente encontrado para {data_ref}")
-                                break
-
-                    # Se já tem lançamento, pular este cliente
-                    if tem_lancamento:
-                        print(f"Cliente {nome_cliente} já tem lançamento para esta data")
-                        wb_cliente.close()
-                        continue
-
-                    # Calcular base para o valor (soma dos tipos 1 a 6 na data)
-                    valor_total = 0
-                    tem_lancamentos_base = False
-                    for row in ws_dados.iter_rows(min_row=2, values_only=True):
-                        if (row[0] and isinstance(row[0], datetime) and  # Data
-                            row[0].day == data_ref_dt.day and
-                            row[0].month == data_ref_dt.month and
-                            row[0].year == data_ref_dt.year):
-
-                            tipo_lanc = row[1]
-                            if isinstance(tipo_lanc, (int, float)) and 1 <= tipo_lanc <= 6:
-                                try:
-                                    valor = float(str(row[8]).replace(',', '.'))  # Valor na coluna I
-                                    valor_total += valor
-                                    tem_lancamentos_base = True
-                                    print(f"Valor base encontrado: R$ {valor:.2f}")
-                                except (ValueError, TypeError) as e:
-                                    print(f"Erro ao processar valor: {e}")
-
-                    # Se não tem lançamentos base, pular este cliente
-                    if not tem_lancamentos_base:
-                        print(f"Cliente {nome_cliente} não tem lançamentos base para cálculo")
-                        wb_cliente.close()
-                        continue
-
-                    # Verificar contratos ativos com taxa percentual no período
-                    taxa_total = 0
-                    for row in ws_contratos.iter_rows(min_row=3, values_only=True):
-                        if row[0]:  # Contrato principal
-                            num_contrato = row[0]
-                            data_inicio = row[1]
-                            data_fim = row[2]
-                            status = row[3]
-
-                            # Verificar se o contrato está ativo e dentro do período
-                            if (status == 'ATIVO' and
-                                isinstance(data_inicio, datetime) and
-                                isinstance(data_fim, datetime) and
-                                data_inicio <= data_ref_dt <= data_fim):
-
-                                # Buscar taxas do contrato
-                                for admin_row in ws_contratos.iter_rows(min_row=3, values_only=True):
-                                    if (admin_row[6] == num_contrato and  # Mesmo contrato
-                                        admin_row[9] == 'Percentual'):  # Tipo percentual
-
-                                        try:
-                                            taxa = float(str(admin_row[10]).replace(',', '.'))
-                                            taxa_total += taxa
-                                            print(f"Taxa encontrada para contrato {num_contrato}: {taxa}%")
-                                        except (ValueError, TypeError) as e:
-                                            print(f"Erro ao processar taxa: {e}")
-
-                    if taxa_total > 0:
-                        valor_taxa = (valor_total * taxa_total) / 100
-
-                        # Função local para formatar valor em Real
-                        def formatar_valor_br(valor):
-                            return f"{valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
-
-                        print(f"Cliente {nome_cliente}:")
-                        print(f"Base de cálculo: R$ {valor_total:.2f}")
-                        print(f"Taxa total: {taxa_total}%")
-                        print(f"Valor da taxa: R$ {valor_taxa:.2f}")
-
-                        # Adicionar à tree
-                        self.tree_clientes.insert('', 'end', values=(
-                            nome_cliente,
-                            f"{taxa_total:.1f}",  # Taxa em porcentagem
-                            formatar_valor_br(valor_taxa),  # Valor formatado no padrão brasileiro
-                            "PENDENTE"
-                        ))
-                    else:
-                        print(f"Cliente {nome_cliente} não tem taxa percentual ativa no período")
-
-                    wb_cliente.close()
-
-                except Exception as e:
-                    print(f"Erro ao processar cliente {nome_cliente}: {str(e)}")
-                    if 'wb_cliente' in locals():
-                        wb_cliente.close()
-            wb.close()
+            fila = queue.Queue()
+            self.planejamento = PlanejamentoParalelo(data_ref_dt, PASTA_CLIENTES, nomes)
+            self.planejamento.iniciar(lambda nome, plano, motivo: fila.put((nome, plano, motivo)))
+            self.root.after(100, self._receber_planos, self.planejamento, fila)
 
         except Exception as e:
             messagebox.showerror("Erro", f"Erro ao carregar clientes: {str(e)}")
-            if 'wb' in locals():
-                wb.close()
+
+    def _receber_planos(self, planejamento, fila):
+        """Consome, na thread do Tk, os planos concluídos pelo pool"""
+        if planejamento is not self.planejamento:
+            return  # carregamento substituído ou cancelado
+
+        # Contagem lida antes de esvaziar a fila: o pool enfileira cada plano antes de
+        # contá-lo como concluído, então todos os planos contados já estão na fila
+        concluidos = planejamento.concluidos
+        while True:
+            try:
+                nome_cliente, plano, motivo = fila.get_nowait()
+            except queue.Empty:
+                break
+
+            if plano is None:
+                print(f"Cliente {nome_cliente} ignorado: {motivo}")
+            else:
+                print(f"Cliente {plano.cliente}:")
+                print(f"Base de cálculo: R$ {plano.valor_base:.2f} ({plano.quantidade_base} lançamentos)")
+                print(f"Taxa total: {plano.percentual_total}%")
+                print(f"Valor da taxa: R$ {plano.valor_taxa:.2f}")
+
+                self.tree_clientes.insert('', 'end', values=(
+                    plano.cliente,
+                    f"{plano.percentual_total:.1f}",  # Taxa em porcentagem
+                    formatar_valor_br(plano.valor_taxa),  # Valor formatado no padrão brasileiro
+                    plano.status
+                ))
+
+        self.progresso.configure(value=concluidos)
+        self.label_progresso.configure(text=f"{concluidos}/{planejamento.total} clientes")
+
+        if concluidos < planejamento.total:
+            self.root.after(100, self._receber_planos, planejamento, fila)
+        else:
+            self.plano = planejamento.plano()
+            self.planejamento = None
+            self.btn_cancelar.configure(state='disabled')
+            print(f"Carregamento concluído: {len(self.plano.clientes)} cliente(s) com taxa a lançar")
+
+    def cancelar_carregamento(self):
+        """Interrompe o carregamento em andamento, mantendo os clientes já exibidos"""
+        planejamento = self.planejamento
+        if planejamento is None:
+            return
+        planejamento.cancelar()
+        self.planejamento = None
+        self.plano = planejamento.plano()
+        self.btn_cancelar.configure(state='disabled')
+        self.label_progresso.configure(
+            text=f"Cancelado: {planejamento.concluidos}/{planejamento.total} clientes")
+        print("Carregamento de clientes cancelado")
 
     def verificar_lancamento_existente(self, ws_contratos, cliente, data_ref):
         """Verifica se já existe lançamento para o período"""
@@ -365,32 +332,12 @@ class FinalizacaoQuinzena:
             if isinstance(data_ref, str):
                 data_ref = datetime.strptime(data_ref, '%d/%m/%Y')
 
-            # Carregar arquivo do cliente
+            # Consultar o índice da aba Dados do cliente (Tipo 7 = Taxa ADM)
             arquivo_cliente = PASTA_CLIENTES / f"{cliente}.xlsx"
-            wb = load_workbook(arquivo_cliente)
-            ws_dados = wb['Dados']
-
-            # Procurar lançamentos
-            for row in ws_dados.iter_rows(min_row=2, values_only=True):
-                if row[0]:  # Data do lançamento
-                    data_lancamento = row[0]
-                    if isinstance(data_lancamento, datetime):
-                        if (data_lancamento.day == data_ref.day and 
-                            data_lancamento.month == data_ref.month and 
-                            data_lancamento.year == data_ref.year):
-
-                            tipo_desp = row[1]
-                            if tipo_desp == 7:  # Tipo 7 = Taxa ADM
-                                wb.close()
-                                return True
-
-            wb.close()
-            return False
+            return obter_indice_dados(arquivo_cliente).tem_lancamento(data_ref, 7)
 
         except Exception as e:
             print(f"Erro ao verificar lançamento existente: {str(e)}")
-            if 'wb' in locals():
-                wb.close()
             return False
 
     def calcular_taxa_adm(self, cliente, data_ref):
@@ -403,40 +350,32 @@ class FinalizacaoQuinzena:
             arquivo_cliente = PASTA_CLIENTES / f"{cliente}.xlsx"
             print(f"Carregando arquivo: {arquivo_cliente}")
 
-            wb = load_workbook(arquivo_cliente)
-            ws_dados = wb["Dados"]
-            ws_contratos = wb["Contratos_ADM"]
+            contratos = carregar_contratos_adm(arquivo_cliente)
+            if contratos is None:
+                raise Exception("Aba Contratos_ADM não encontrada")
 
             print("\nBuscando contratos ativos com taxa percentual...")
 
             # Primeiro, encontrar todos os números de contratos ativos
-            contratos_ativos = set()
-            for row in ws_contratos.iter_rows(min_row=3, values_only=True):
-                if row[0] and row[3] == 'ATIVO':  # Número do contrato e Status
-                    print(f"\nContrato ativo encontrado: {row[0]}")
-                    contratos_ativos.add(row[0])
-
+            contratos_ativos = contratos.numeros_contratos_ativos()
             print(f"\nContratos ativos encontrados: {contratos_ativos}")
 
-            # Agora, para cada contrato ativo, procurar administradores com taxa percentual
+            # Agora, para cada contrato ativo, somar os administradores com taxa percentual
             taxa_adm_total = 0
             for num_contrato in contratos_ativos:
-                for row in ws_contratos.iter_rows(min_row=3, values_only=True):
-                    if (row[6] == num_contrato and  # Número do contrato na coluna G
-                        row[9] == 'Percentual'):    # Tipo na coluna J
-                        try:
-                            percentual = float(str(row[10]).replace(',', '.'))
-                            print(f"Contrato {num_contrato}: Percentual encontrado = {percentual}%")
-                            taxa_adm_total += percentual
-                        except (ValueError, TypeError) as e:
-                            print(f"Erro ao processar percentual do contrato {num_contrato}: {e}")
-                            continue
+                for adm in contratos.administradores(num_contrato, tipo='Percentual'):
+                    try:
+                        percentual = adm.percentual
+                        print(f"Contrato {num_contrato}: Percentual encontrado = {percentual}%")
+                        taxa_adm_total += percentual
+                    except (ValueError, TypeError) as e:
+                        print(f"Erro ao processar percentual do contrato {num_contrato}: {e}")
+                        continue
 
             print(f"\nTaxa ADM total encontrada: {taxa_adm_total:.2f}%")
 
             if taxa_adm_total == 0:
                 print("Nenhuma taxa percentual ativa encontrada")
-                wb.close()
                 return 0
 
             taxa_decimal = taxa_adm_total / 100
@@ -446,39 +385,21 @@ class FinalizacaoQuinzena:
             data_ref = datetime.strptime(data_ref, '%d/%m/%Y') if isinstance(data_ref, str) else data_ref
             print(f"\nData de referência convertida: {data_ref.strftime('%d/%m/%Y')}")
 
-            # Calcular valor base
-            valor_base = 0
-            lancamentos_encontrados = 0
-
+            # Calcular valor base (tipos 1 a 6 da data, pelo índice da aba Dados)
             print("\nBuscando lançamentos do período...")
-            for row in ws_dados.iter_rows(min_row=2, values_only=True):
-                data_lancamento = row[0]
-                if isinstance(data_lancamento, datetime):
-                    if (data_lancamento.day == data_ref.day and 
-                        data_lancamento.month == data_ref.month and 
-                        data_lancamento.year == data_ref.year):
-
-                        tipo_desp = row[1]
-                        if isinstance(tipo_desp, (int, float)) and 1 <= tipo_desp <= 6:
-                            valor = row[8]  # Coluna I com o valor
-                            if valor:
-                                valor_numeric = float(str(valor).replace(',', '.'))
-                                valor_base += valor_numeric
-                                lancamentos_encontrados += 1
-                                print(f"Lançamento encontrado - Tipo: {tipo_desp}, Valor: R$ {valor_numeric:.2f}")
+            indice_dados = obter_indice_dados(arquivo_cliente)
+            valor_base = indice_dados.subtotal(data_ref, TIPOS_BASE_TAXA)
+            lancamentos_encontrados = indice_dados.quantidade(data_ref, TIPOS_BASE_TAXA)
 
             print(f"\nValor base total: R$ {valor_base:.2f}")
             print(f"Total de lançamentos encontrados: {lancamentos_encontrados}")
 
             valor_taxa = valor_base * taxa_decimal
             print(f"\nValor final da taxa: R$ {valor_taxa:.2f}")
-            wb.close()
             return valor_taxa
 
         except Exception as e:
             print(f"\nERRO: {str(e)}")
-            if 'wb' in locals():
-                wb.close()
             raise Exception(f"Erro ao calcular taxa: {str(e)}")
 
     def lancar_taxa_adm(self, cliente, data_ref, valor_total):
@@ -487,40 +408,30 @@ class FinalizacaoQuinzena:
             print(f"Lançando taxa ADM para {cliente}")
             arquivo_cliente = PASTA_CLIENTES / f"{cliente}.xlsx"
             wb = load_workbook(arquivo_cliente)
-            ws_contratos = wb['Contratos_ADM']
+            contratos = ContratosADM.ler(wb['Contratos_ADM'])
             ws_dados = wb["Dados"]
+            indice_dados = obter_indice_dados(arquivo_cliente)
 
             # Buscar todos os administradores com taxa percentual
             administradores = {}  # Usar dicionário para evitar duplicatas
-            contratos_ativos = set()
-            # Primeiro identificar contratos ativos
-            for row in ws_contratos.iter_rows(min_row=3, values_only=True):
-                if row[0] and row[3] == 'ATIVO':  # Número do contrato e Status
-                    contratos_ativos.add(row[0])
-                    print(f"Contrato ativo encontrado: {row[0]}")
-
             taxa_total = 0
             # Para cada contrato ativo, buscar administradores únicos com taxa percentual
-            for num_contrato in contratos_ativos:
-                for row in ws_contratos.iter_rows(min_row=3, values_only=True):
-                    if (row[6] == num_contrato and  # Número do contrato na coluna G
-                        row[9] == 'Percentual'):    # Tipo na coluna J
-
-                        cnpj_cpf = row[7]  # CNPJ/CPF na coluna H
-
-                        # Se este administrador já foi processado, pular
-                        if cnpj_cpf in administradores:
-                            continue
+            for num_contrato in contratos.numeros_contratos_ativos():
+                print(f"Contrato ativo encontrado: {num_contrato}")
+                for adm in contratos.administradores(num_contrato, tipo='Percentual'):
+                    # Se este administrador já foi processado, pular
+                    if adm.cnpj_cpf in administradores:
+                        continue
 
-                        percentual = float(str(row[10]).replace(',', '.'))
-                        taxa_total += percentual
+                    percentual = adm.percentual
+                    taxa_total += percentual
 
-                        administradores[cnpj_cpf] = {
-                            'cnpj_cpf': cnpj_cpf,
-                            'nome': row[8],      # Nome na coluna I
-                            'percentual': percentual
-                        }
-                        print(f"Administrador encontrado: {row[8]} - {percentual}%")
+                    administradores[adm.cnpj_cpf] = {
+                        'cnpj_cpf': adm.cnpj_cpf,
+                        'nome': adm.nome,
+                        'percentual': percentual
+                    }
+                    print(f"Administrador encontrado: {adm.nome} - {percentual}%")
 
             if not administradores:
                 raise Exception("Nenhum administrador com taxa percentual encontrado")
@@ -531,37 +442,14 @@ class FinalizacaoQuinzena:
             # Determinar data de vencimento conforme as regras
             data = datetime.strptime(data_ref, '%d/%m/%Y') if isinstance(data_ref, str) else data_ref
 
-            # Se dia 05, vencimento no próximo dia útil
-            if data.day == 5:
-                dt_vencto = data  # Mesmo dia 05
-
-                # Se cair em fim de semana, ajustar para próximo dia útil
-                while dt_vencto.weekday() >= 5:  # 5 = Sábado, 6 = Domingo
-                    dt_vencto += relativedelta(days=1)
-
-            # Se dia 20, vencimento no dia 20 mesmo
-            else:  # data.day == 20
-                dt_vencto = data  # Mantém dia 20 independente do dia da semana
-
+            dt_vencto = calcular_vencimento_taxa(data)
             print(f"Data de vencimento calculada: {dt_vencto.strftime('%d/%m/%Y')}")
 
-            # Determinar quinzena para referência
-            quinzena = "1ª" if data.day == 5 else "2ª"
-
-            # Lançar para cada administrador
+            # Lançar para cada administrador (o índice só recebe as linhas depois do salvamento)
+            lancados = []
             for cnpj_cpf, adm in administradores.items():
-                # Verificar se já existe lançamento
-                data_str = data.strftime('%d/%m/%Y')
-                lancamentos_existentes = []
-                for row in ws_dados.iter_rows(min_row=2, values_only=True):
-                    if (row[0] and isinstance(row[0], datetime) and
-                        row[0].strftime('%d/%m/%Y') == data_str and
-                        row[1] == 7 and  # Tipo 7 = Taxa ADM percentual
-                        row[2] == cnpj_cpf):  # CNPJ/CPF do administrador
-                        lancamentos_existentes.append(row[2])
-
-                # Pular se já existe lançamento para este administrador
-                if cnpj_cpf in lancamentos_existentes:
+                # Pular se já existe lançamento para este administrador (Tipo 7 = Taxa ADM percentual)
+                if indice_dados.tem_lancamento(data, 7, cnpj_cpf):
                     print(f"Já existe lançamento para {adm['nome']} nesta data")
                     continue
 
@@ -585,8 +473,7 @@ class FinalizacaoQuinzena:
                 ws_dados.cell(row=proxima_linha, column=4, value=adm['nome'])
 
                 # Referência
-                referencia = f"ADM. OBRA REF. {quinzena} QUINZ. {data.strftime('%m/%Y')}"
-                ws_dados.cell(row=proxima_linha, column=5, value=referencia)
+                ws_dados.cell(row=proxima_linha, column=5, value=referencia_taxa(data))
                 ws_dados.cell(row=proxima_linha, column=6, value='')  # NF
 
                 # Valor unitário e total
@@ -609,7 +496,10 @@ class FinalizacaoQuinzena:
                 
                 ws_dados.cell(row=proxima_linha, column=13, value='LANÇAMENTO AUTOMÁTICO')  # Observação
 
+                lancados.append((proxima_linha, data, 7, adm['cnpj_cpf'], valor_adm))
+
             wb.save(arquivo_cliente)
+            indice_dados.confirmar_gravacao(lancados)
             print("\nLançamentos concluídos com sucesso!")
 
         except Exception as e:
@@ -622,41 +512,28 @@ class FinalizacaoQuinzena:
         """Obtém CNPJ/CPF e nome do administrador do contrato"""
         try:
             arquivo_cliente = PASTA_CLIENTES / f"{cliente}.xlsx"
-            wb = load_workbook(arquivo_cliente)
-            ws_contratos = wb['Contratos_ADM']
+            contratos = carregar_contratos_adm(arquivo_cliente)
+            if contratos is None:
+                raise Exception("Aba Contratos_ADM não encontrada")
             print("\nBuscando dados do administrador...")
 
-            # Primeiro encontrar contratos ativos
-            contratos_ativos = []
-            for row in ws_contratos.iter_rows(min_row=3, values_only=True):
-                if row[0] and row[3] == 'ATIVO':  # Número do contrato e Status
-                    contratos_ativos.append(row[0])
-                    print(f"Contrato ativo encontrado: {row[0]}")
-
             # Para cada contrato ativo, buscar administrador com taxa percentual
-            for num_contrato in contratos_ativos:
-                for row in ws_contratos.iter_rows(min_row=3, values_only=True):
-                    if (row[6] == num_contrato and  # Número do contrato na coluna G
-                        row[9] == 'Percentual'):    # Tipo na coluna J
-                        cnpj_cpf = row[7]  # CNPJ/CPF na coluna H
-                        nome = row[8]      # Nome na coluna I
-                        print(f"Administrador encontrado:")
-                        print(f"CNPJ/CPF: {cnpj_cpf}")
-                        print(f"Nome: {nome}")
-                        wb.close()
-                        return cnpj_cpf, nome
-
-            wb.close()
+            for num_contrato in contratos.numeros_contratos_ativos():
+                print(f"Contrato ativo encontrado: {num_contrato}")
+                for adm in contratos.administradores(num_contrato, tipo='Percentual'):
+                    print(f"Administrador encontrado:")
+                    print(f"CNPJ/CPF: {adm.cnpj_cpf}")
+                    print(f"Nome: {adm.nome}")
+                    return adm.cnpj_cpf, adm.nome
+
             raise Exception("Nenhum administrador com taxa percentual encontrado")
 
         except Exception as e:
-            if 'wb' in locals():
-                wb.close()
             print(f"Erro ao obter dados do fornecedor: {str(e)}")
             raise Exception(f"Erro ao obter dados do fornecedor: {str(e)}")
 
     def processar_clientes(self):
-        """Processa os clientes selecionados"""
+        """Executa o plano de fechamento dos clientes selecionados"""
         selecionados = self.tree_clientes.selection()
         if not selecionados:
             messagebox.showwarning("Aviso", "Selecione pelo menos um cliente!")
@@ -664,8 +541,16 @@ class FinalizacaoQuinzena:
 
         data_ref = self.data_ref_entry.get()
         data_ref_dt = datetime.strptime(data_ref, '%d/%m/%Y')
+        if self.planejamento is not None:
+            messagebox.showwarning("Aviso", "Aguarde o carregamento dos clientes (ou cancele-o) antes de processar.")
+            return
+        if self.plano is None or self.plano.data_ref != data_ref_dt:
+            messagebox.showwarning("Aviso", "A data foi alterada. Carregue os clientes novamente antes de processar.")
+            return
+
         processados = []
         ignorados = []
+        concluidos = []
 
         for item in selecionados:
             valores = self.tree_clientes.item(item)['values']
@@ -678,35 +563,34 @@ class FinalizacaoQuinzena:
                 continue
 
             try:
-                arquivo_cliente = PASTA_CLIENTES / f"{cliente}.xlsx"
-                wb = load_workbook(arquivo_cliente)
-                ws_contratos = wb['Contratos_ADM']
-
                 if tipo == "FIXO":
                     # Processar pagamento fixo
                     lancamentos = self.gestao_taxas.processar_lancamentos_fixos(cliente, data_ref_dt)
                     if lancamentos:
                         processados.append(f"{cliente} - Taxa Fixa processada")
+                        concluidos.append(item)
                     else:
                         ignorados.append(f"{cliente} - Erro ao processar taxa fixa")
-                else:
-                    # Processar pagamento percentual
-                    valor = self.calcular_taxa_adm(cliente, data_ref)
-                    if valor > 0:
-                        self.lancar_taxa_adm(cliente, data_ref, valor)
-                        processados.append(f"{cliente} - Taxa Percentual processada (R$ {valor:,.2f})")
-                    else:
-                        ignorados.append(f"{cliente} - Valor zero calculado")
+                    continue
 
-                wb.close()
+                # Processar pagamento percentual com os valores já calculados no plano
+                plano = self.plano.cliente(cliente)
+                if plano is None:
+                    ignorados.append(f"{cliente} - Cliente fora do plano de fechamento")
+                    continue
+
+                if executar_plano_cliente(plano):
+                    processados.append(f"{cliente} - Taxa Percentual processada (R$ {plano.valor_taxa:,.2f})")
+                else:
+                    ignorados.append(f"{cliente} - Já possui lançamento para o período")
+                concluidos.append(item)
 
             except Exception as e:
                 ignorados.append(f"{cliente} - Erro: {str(e)}")
-                if 'wb' in locals():
-                    wb.close()
 
-        # Atualizar interface
-        self.carregar_clientes()
+        # Atualizar interface: os clientes processados saem da lista, sem recalcular os demais
+        for item in concluidos:
+            self.tree_clientes.delete(item)
         self.mostrar_resultado_processamento(processados, ignorados)
 
 
@@ -745,6 +629,7 @@ class FinalizacaoQuinzena:
 
     def voltar_menu(self):
         """Fecha a janela e retorna ao menu principal"""
+        self.cancelar_carregamento()
         self.root.destroy()
 
         if self.parent:
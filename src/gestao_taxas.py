@@ -29,6 +29,11 @@ try:
 except ImportError:
     from src.config.window_config import configurar_janela
 
+try:
+    from src.cache_dados import carregar_dados_cliente, lancamentos_da_data
+except ImportError:
+    from cache_dados import carregar_dados_cliente, lancamentos_da_data
+
 class GestaoTaxasAdministracao:
     def __init__(self, parent=None):
         self.parent = parent
@@ -271,30 +276,13 @@ class GestaoTaxasAdministracao:
             if isinstance(data_ref, str):
                 data_ref = datetime.strptime(data_ref, '%d/%m/%Y')
             
-            from openpyxl import load_workbook
-            
-            wb = load_workbook(arquivo_cliente)
-            ws_dados = wb['Dados']
-            
-            # Verificar lançamentos na mesma data
-            lancamentos = []
-            for row in ws_dados.iter_rows(min_row=2, values_only=True):
-                if row[0] and isinstance(row[0], datetime):
-                    if (row[0].day == data_ref.day and 
-                        row[0].month == data_ref.month and 
-                        row[0].year == data_ref.year):
-                        
-                        tipo = row[1]  # Tipo do lançamento
-                        valor = row[7]  # Valor
-                        descricao = row[4]  # Descrição
-                        
-                        lancamentos.append({
-                            'tipo': tipo,
-                            'valor': valor,
-                            'descricao': descricao
-                        })
-            
-            wb.close()
+            # Verificar lançamentos na mesma data (aba Dados via cache colunar)
+            df_data = lancamentos_da_data(carregar_dados_cliente(arquivo_cliente), data_ref)
+            # Mesmas colunas da leitura pela planilha: tipo = row[1], valor = row[7], descrição = row[4]
+            lancamentos = [
+                {'tipo': tipo, 'valor': valor, 'descricao': descricao}
+                for tipo, valor, descricao in zip(df_data.iloc[:, 1], df_data.iloc[:, 7], df_data.iloc[:, 4])
+            ]
             
             # Verificar conflitos
             tem_taxa_fixa = any(l['tipo'] == 2 for l in lancamentos)  # Tipo 2 = Taxa fixa
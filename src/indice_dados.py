@@ -0,0 +1,170 @@
+"""
+Índice da aba Dados por data de referência
+
+Para cada DATA_REL guarda as linhas da planilha, o subtotal e a quantidade de
+lançamentos por TP_DESP e os CNPJ/CPF lançados em cada tipo. Verificar se já
+existe Taxa ADM numa quinzena ou somar a base de cálculo passa a ser uma
+consulta direta, sem percorrer a aba. O índice é montado a partir do cache
+colunar (cache_dados), mantido por processo e atualizado quando a própria
+aplicação acrescenta lançamentos.
+"""
+import logging
+import os
+import threading
+from datetime import datetime, date
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    from src.cache_dados import carregar_dados_cliente, datas_referencia, valores_numericos
+    from src.registro_fornecedores import normalizar_documento
+except ImportError:
+    from cache_dados import carregar_dados_cliente, datas_referencia, valores_numericos
+    from registro_fornecedores import normalizar_documento
+
+logger = logging.getLogger(__name__)
+
+
+def _chave_data(data):
+    if isinstance(data, datetime):
+        return data.date()
+    if isinstance(data, date):
+        return data
+    return pd.Timestamp(data).date()
+
+
+class _Quinzena:
+    """Lançamentos de uma mesma DATA_REL"""
+
+    __slots__ = ('linhas', 'tipos', 'subtotais', 'quantidades', 'documentos')
+
+    def __init__(self):
+        self.linhas = []        # linhas da planilha (base 1)
+        self.tipos = set()      # TP_DESP presentes
+        self.subtotais = {}     # TP_DESP -> soma de VALOR
+        self.quantidades = {}   # TP_DESP -> lançamentos com VALOR preenchido
+        self.documentos = {}    # TP_DESP -> CNPJ/CPF (normalizados) lançados
+
+    def adicionar(self, linha, tipo, cnpj_cpf, valor):
+        self.linhas.append(linha)
+        if tipo is None:
+            return
+        self.tipos.add(tipo)
+        documento = normalizar_documento(cnpj_cpf)
+        if documento:
+            self.documentos.setdefault(tipo, set()).add(documento)
+        if valor is not None and not pd.isna(valor):
+            self.subtotais[tipo] = self.subtotais.get(tipo, 0.0) + float(valor)
+            self.quantidades[tipo] = self.quantidades.get(tipo, 0) + 1
+
+
+class IndiceDados:
+    """Índice DATA_REL -> linhas e subtotais por TP_DESP de um cliente"""
+
+    def __init__(self, arquivo_excel, df):
+        self.arquivo = Path(arquivo_excel)
+        self._quinzenas = {}
+        self._lock = threading.RLock()
+
+        datas = datas_referencia(df)
+        tipos = pd.to_numeric(df['TP_DESP'], errors='coerce')
+        valores = valores_numericos(df['VALOR'])
+        documentos = df['CNPJ_CPF']
+
+        # Linha da planilha = posição no DataFrame + 2 (cabeçalho na linha 1)
+        for posicao, (data, tipo, cnpj_cpf, valor) in enumerate(zip(datas, tipos, documentos, valores)):
+            if pd.isna(data):
+                continue
+            self._registrar(posicao + 2, data, tipo, cnpj_cpf, valor)
+
+    def _registrar(self, linha, data, tipo, cnpj_cpf, valor):
+        tipo = None if tipo is None or pd.isna(tipo) else int(tipo)
+        quinzena = self._quinzenas.setdefault(_chave_data(data), _Quinzena())
+        quinzena.adicionar(linha, tipo, cnpj_cpf, valor)
+
+    def _quinzena(self, data):
+        return self._quinzenas.get(_chave_data(data))
+
+    def datas(self):
+        """Datas de referência presentes na aba, em ordem"""
+        return sorted(self._quinzenas)
+
+    def linhas(self, data):
+        """Linhas da planilha com a DATA_REL informada"""
+        quinzena = self._quinzena(data)
+        return list(quinzena.linhas) if quinzena else []
+
+    def tem_lancamento(self, data, tipo, cnpj_cpf=None):
+        """Verifica se há lançamento do tipo na data (opcionalmente para o CNPJ/CPF)"""
+        quinzena = self._quinzena(data)
+        if quinzena is None:
+            return False
+        if cnpj_cpf is None:
+            return tipo in quinzena.tipos
+        return normalizar_documento(cnpj_cpf) in quinzena.documentos.get(tipo, ())
+
+    def subtotal(self, data, tipos):
+        """Soma de VALOR dos lançamentos da data com TP_DESP em tipos"""
+        quinzena = self._quinzena(data)
+        if quinzena is None:
+            return 0.0
+        return sum(quinzena.subtotais.get(tipo, 0.0) for tipo in tipos)
+
+    def quantidade(self, data, tipos):
+        """Quantidade de lançamentos (com VALOR) da data com TP_DESP em tipos"""
+        quinzena = self._quinzena(data)
+        if quinzena is None:
+            return 0
+        return sum(quinzena.quantidades.get(tipo, 0) for tipo in tipos)
+
+    def registrar_lancamento(self, linha, data, tipo, cnpj_cpf, valor):
+        """Inclui no índice um lançamento acrescentado à aba Dados"""
+        with self._lock:
+            self._registrar(linha, data, tipo, cnpj_cpf, valor)
+
+    def confirmar_gravacao(self, lancamentos=()):
+        """
+        Deve ser chamado somente depois de salvar a planilha: inclui no índice
+        os lançamentos gravados e o mantém válido para o novo arquivo. Se o
+        salvamento falhar, o índice compartilhado fica como estava.
+
+        Args:
+            lancamentos: Tuplas (linha, data, tipo, cnpj_cpf, valor) acrescentadas à aba Dados
+        """
+        for lancamento in lancamentos:
+            self.registrar_lancamento(*lancamento)
+        with _indices_lock:
+            _indices[_chave_arquivo(self.arquivo)] = (_assinatura(self.arquivo), self)
+
+
+_indices = {}
+_indices_lock = threading.Lock()
+
+
+def _chave_arquivo(arquivo_excel):
+    return os.path.abspath(arquivo_excel)
+
+
+def _assinatura(arquivo_excel):
+    stat = os.stat(arquivo_excel)
+    return (stat.st_size, stat.st_mtime_ns)
+
+
+def obter_indice_dados(arquivo_excel):
+    """
+    Retorna o índice da aba Dados do cliente, reaproveitando o que já estiver
+    em memória enquanto a planilha não for alterada
+    """
+    chave = _chave_arquivo(arquivo_excel)
+    assinatura = _assinatura(arquivo_excel)
+    with _indices_lock:
+        em_cache = _indices.get(chave)
+        if em_cache and em_cache[0] == assinatura:
+            return em_cache[1]
+
+    logger.debug(f"Montando índice de Dados: {arquivo_excel}")
+    indice = IndiceDados(arquivo_excel, carregar_dados_cliente(arquivo_excel))
+    with _indices_lock:
+        _indices[chave] = (assinatura, indice)
+    return indice
@@ -0,0 +1,328 @@
+"""
+Lançamentos pendentes (posteriores à data de referência) dos clientes
+
+A leitura de cada planilha usa apenas o cache colunar da aba Dados e a
+célula RESUMO!A3 (nome do cliente). O último resultado de cada arquivo fica
+em memória e é reaproveitado enquanto a planilha e a data não mudarem; as
+planilhas cujo cache está desatualizado são lidas em paralelo, em um pool de
+processos.
+
+O relatório HTML e as exportações CSV/JSON são gravados cliente a cliente,
+direto no arquivo, sem montar o documento inteiro em memória.
+"""
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from html import escape
+
+import pandas as pd
+
+try:
+    from src.cache_dados import carregar_dados_cliente, cache_atualizado, ler_celula
+    from src.execucao_paralela import ExecucaoParalela
+    from src.lote_relatorios import arquivos_da_pasta
+except ImportError:
+    from cache_dados import carregar_dados_cliente, cache_atualizado, ler_celula
+    from execucao_paralela import ExecucaoParalela
+    from lote_relatorios import arquivos_da_pasta
+
+logger = logging.getLogger(__name__)
+
+# caminho -> ((tamanho, mtime_ns, data de referência), resultado de ler_pendentes_cliente);
+# só o último resultado de cada planilha fica em memória
+_resultados = {}
+_resultados_lock = threading.Lock()
+
+
+def ler_pendentes_cliente(caminho_arquivo, data_referencia):
+    """
+    Lançamentos de um cliente com DATA_REL posterior à data de referência
+
+    Returns:
+        dict ou None: {'nome_cliente', 'ultima_data', 'lancamentos', 'arquivo'},
+        None se não houver lançamentos pendentes
+    """
+    df = carregar_dados_cliente(caminho_arquivo)
+    df = df.fillna("")
+
+    nome_cliente = ler_celula(caminho_arquivo, 'RESUMO', 'A3')
+    logger.debug(f"Cliente: {nome_cliente}")
+
+    # Converter DATA_REL para datetime
+    df['DATA_REL'] = pd.to_datetime(df['DATA_REL'])
+
+    # Filtrar lançamentos posteriores à data de referência
+    df_pendentes = df[df['DATA_REL'] > data_referencia].copy()
+
+    # Remover duplicatas baseado em todas as colunas relevantes
+    colunas_check = ['DATA_REL', 'TP_DESP', 'NOME', 'REFERÊNCIA', 'VALOR']
+    df_pendentes = df_pendentes.drop_duplicates(subset=colunas_check)
+    logger.debug(f"Lançamentos encontrados (após remover duplicatas): {len(df_pendentes)}")
+
+    if df_pendentes.empty:
+        return None
+
+    # Identificar parcelamentos
+    df_pendentes['is_parcelamento'] = df_pendentes['REFERÊNCIA'].str.contains(
+        'parcela|parcelamento',
+        case=False,
+        na=False
+    )
+
+    # Converter valores para float
+    df_pendentes['VALOR'] = pd.to_numeric(
+        df_pendentes['VALOR'].astype(str)
+        .str.replace('R$', '')
+        .str.replace(',', '.')
+        .str.strip(),
+        errors='coerce'
+    ).fillna(0.0)
+
+    # Converter tipo de despesa para inteiro
+    df_pendentes['TP_DESP'] = df_pendentes['TP_DESP'].astype(int)
+
+    # Formatar datas
+    if 'DT_VENCTO' in df_pendentes.columns:
+        df_pendentes['DT_VENCTO'] = pd.to_datetime(
+            df_pendentes['DT_VENCTO'],
+            format='%d/%m/%Y',
+            errors='coerce'
+        )
+
+    # Ordenar por data
+    df_pendentes = df_pendentes.sort_values(['DATA_REL', 'TP_DESP'])
+
+    return {
+        'nome_cliente': nome_cliente,
+        'ultima_data': data_referencia,
+        'lancamentos': df_pendentes,
+        'arquivo': caminho_arquivo
+    }
+
+
+def _assinatura_resultado(caminho_arquivo, data_referencia):
+    stat = os.stat(caminho_arquivo)
+    return (stat.st_size, stat.st_mtime_ns, data_referencia)
+
+
+def pendentes_da_pasta(pasta, data_referencia, max_workers=None):
+    """
+    Lançamentos pendentes de todas as planilhas da pasta
+
+    Planilhas já lidas (e inalteradas) nesta sessão vêm da memória; as que
+    têm o cache colunar atualizado são lidas aqui mesmo (poucos ms cada); as
+    demais vão para o pool de processos. Erros ficam restritos ao arquivo.
+
+    Returns:
+        list: Resultados de ler_pendentes_cliente (sem os None), na ordem dos arquivos
+    """
+    arquivos = arquivos_da_pasta(pasta)
+    logger.info(f"Encontrados {len(arquivos)} arquivos Excel em {pasta}")
+
+    resultados = {}
+    assinaturas = {}
+    desatualizados = {}
+    for arquivo in arquivos:
+        try:
+            chave = os.path.abspath(arquivo)
+            assinatura = assinaturas[arquivo] = _assinatura_resultado(arquivo, data_referencia)
+            with _resultados_lock:
+                em_memoria = _resultados.get(chave)
+                if em_memoria and em_memoria[0] == assinatura:
+                    resultados[arquivo] = em_memoria[1]
+                    continue
+            if cache_atualizado(arquivo):
+                resultados[arquivo] = ler_pendentes_cliente(arquivo, data_referencia)
+                with _resultados_lock:
+                    _resultados[chave] = (assinatura, resultados[arquivo])
+            else:
+                desatualizados[arquivo] = (arquivo, data_referencia)
+        except Exception as e:
+            logger.error(f"Erro ao processar arquivo {arquivo}: {str(e)}")
+
+    if desatualizados:
+        logger.info(f"Lendo {len(desatualizados)} planilha(s) alterada(s) em paralelo")
+        execucao = ExecucaoParalela(ler_pendentes_cliente, desatualizados, max_workers).iniciar()
+        for arquivo, resultado, erro in execucao.aguardar():
+            if erro is not None:
+                logger.error(f"Erro ao processar arquivo {arquivo}: {str(erro)}")
+                continue
+            resultados[arquivo] = resultado
+            with _resultados_lock:
+                _resultados[os.path.abspath(arquivo)] = (assinaturas[arquivo], resultado)
+
+    return [resultados[arquivo] for arquivo in arquivos if resultados.get(arquivo) is not None]
+
+
+# === RELATÓRIO HTML E EXPORTAÇÃO ===
+
+ESTILO_HTML = [
+    'body { font-family: Arial, sans-serif; margin: 20px; background-color: #f0f2f5; }',
+    'h1 { color: #2c3e50; text-align: center; margin-bottom: 30px; }',
+    '.cliente { background-color: white; margin: 20px 0; padding: 20px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }',
+    '.cliente-header { background-color: #f8f9fa; padding: 15px; margin: -20px -20px 20px -20px; border-radius: 8px 8px 0 0; border-bottom: 1px solid #dee2e6; }',
+    '.cliente-header h2 { margin: 0; color: #2c3e50; }',
+    'summary.cliente-header { cursor: pointer; list-style: none; }',
+    'summary.cliente-header h2 { display: inline; }',
+    'details:not([open]) > summary.cliente-header { margin-bottom: -20px; border-radius: 8px; border-bottom: none; }',
+    'table { width: 100%; border-collapse: collapse; margin-top: 15px; background-color: white; }',
+    'th, td { padding: 12px; text-align: left; border: 1px solid #dee2e6; font-size: 14px; }',
+    'th { background-color: #f8f9fa; font-weight: bold; color: #495057; }',
+    'tr:nth-child(even) { background-color: #f8f9fa; }',
+    '.parcelamento { background-color: #fff3e0; }',
+    '.valor { text-align: right; }',
+    '.resumo { margin-top: 20px; padding: 15px; background-color: #e8f5e9; border-radius: 5px; font-weight: bold; }',
+    '.data-geracao { text-align: center; color: #6c757d; margin-bottom: 30px; }',
+]
+
+# Modo sob demanda: as linhas de cada cliente ficam em um <template> (não
+# renderizado) e só entram na tabela quando a seção é aberta
+SCRIPT_SOB_DEMANDA = '''<script>
+document.querySelectorAll('details.cliente').forEach(function (secao) {
+  secao.addEventListener('toggle', function () {
+    var modelo = secao.querySelector('template');
+    if (secao.open && modelo) {
+      secao.querySelector('tbody').appendChild(modelo.content.cloneNode(true));
+      modelo.remove();
+    }
+  });
+});
+</script>'''
+
+CABECALHO_TABELA = ['Data', 'Tipo', 'Nome', 'Referência', 'Vencimento', 'Valor']
+
+COLUNAS_EXPORTACAO = ['DATA_REL', 'TP_DESP', 'NOME', 'REFERÊNCIA', 'DT_VENCTO', 'VALOR']
+
+
+def formatar_valor_br(valor):
+    """Formata valor para o padrão brasileiro"""
+    return f"{valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+
+
+def _datas_br(serie):
+    """Datas dd/mm/aaaa ('' para vazias), formatando cada data distinta uma única vez"""
+    formatadas = {data: data.strftime('%d/%m/%Y') for data in pd.DatetimeIndex(serie.dropna().unique())}
+    return serie.map(formatadas).fillna('')
+
+
+def _linhas_html(df):
+    """Gera as linhas <tr> da tabela de um cliente, uma por vez"""
+    vencimentos = _datas_br(df['DT_VENCTO']) if 'DT_VENCTO' in df.columns else [''] * len(df)
+    valores = pd.to_numeric(df['VALOR'], errors='coerce').fillna(0.0)
+    for data, tipo, nome, referencia, vencimento, valor, parcelamento in zip(
+            _datas_br(df['DATA_REL']), df['TP_DESP'], df['NOME'], df['REFERÊNCIA'],
+            vencimentos, valores, df['is_parcelamento']):
+        yield (f'<tr class="{"parcelamento" if parcelamento else ""}">'
+               f'<td>{data}</td><td>{int(tipo)}</td><td>{escape(str(nome))}</td>'
+               f'<td>{escape(str(referencia))}</td><td>{vencimento}</td>'
+               f'<td class="valor">{formatar_valor_br(float(valor))}</td></tr>\n')
+
+
+def _escrever_cliente_html(f, dados, sob_demanda):
+    df = dados['lancamentos'].sort_values(['DATA_REL', 'TP_DESP'])
+    total_cliente = df['VALOR'].sum()
+    nome = escape(str(dados['nome_cliente']))
+    ultima_data = dados['ultima_data'].strftime('%d/%m/%Y')
+    cabecalho = ''.join(f'<th>{coluna}</th>' for coluna in CABECALHO_TABELA)
+
+    if sob_demanda:
+        f.write('<details class="cliente">\n'
+                f'<summary class="cliente-header"><h2>{nome}</h2>'
+                f'<p>Última data de fechamento: {ultima_data} | {len(df)} lançamento(s) | '
+                f'R$ {formatar_valor_br(total_cliente)}</p></summary>\n'
+                f'<table>\n<thead><tr>{cabecalho}</tr></thead>\n<tbody></tbody>\n</table>\n<template>\n')
+        f.writelines(_linhas_html(df))
+        f.write('</template>\n')
+    else:
+        f.write('<div class="cliente">\n'
+                f'<div class="cliente-header">\n<h2>{nome}</h2>\n'
+                f'<p>Última data de fechamento: {ultima_data}</p>\n</div>\n'
+                f'<table>\n<tr>{cabecalho}</tr>\n')
+        f.writelines(_linhas_html(df))
+        f.write('</table>\n')
+
+    f.write('<div class="resumo">\n'
+            f'<p>Total de lançamentos: R$ {formatar_valor_br(total_cliente)}</p>\n'
+            f'</div>\n{"</details>" if sob_demanda else "</div>"}\n')
+
+
+def escrever_relatorio_html(dados_clientes, caminho_saida, sob_demanda=False):
+    """
+    Grava o relatório HTML de lançamentos pendentes diretamente no arquivo,
+    um cliente por vez (o documento não é montado em memória)
+
+    Args:
+        dados_clientes (iterable): Resultados de ler_pendentes_cliente
+        sob_demanda (bool): Cada cliente vira uma seção recolhida cujas linhas
+            só são montadas pelo navegador quando a seção é aberta
+
+    Returns:
+        int: Quantidade de clientes gravados
+    """
+    clientes = 0
+    with open(caminho_saida, 'w', encoding='utf-8') as f:
+        f.write('<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n'
+                '<title>Relatório de Lançamentos Pendentes</title>\n<style>\n')
+        f.write('\n'.join(ESTILO_HTML))
+        f.write('\n</style>\n</head>\n<body>\n<h1>Relatório de Lançamentos Pendentes</h1>\n'
+                f'<p class="data-geracao">Gerado em: {datetime.now().strftime("%d/%m/%Y %H:%M")}</p>\n')
+
+        for dados in dados_clientes:
+            if dados is None or dados['lancamentos'].empty:
+                continue
+            _escrever_cliente_html(f, dados, sob_demanda)
+            clientes += 1
+
+        if sob_demanda:
+            f.write(SCRIPT_SOB_DEMANDA + '\n')
+        f.write('</body>\n</html>\n')
+    return clientes
+
+
+def _tabela_exportacao(dados):
+    df = dados['lancamentos']
+    tabela = df[[coluna for coluna in COLUNAS_EXPORTACAO if coluna in df.columns]].copy()
+    tabela.insert(0, 'CLIENTE', dados['nome_cliente'])
+    tabela['PARCELAMENTO'] = df['is_parcelamento']
+    for coluna in ('DATA_REL', 'DT_VENCTO'):
+        if coluna in tabela.columns:
+            tabela[coluna] = _datas_br(tabela[coluna])
+    return tabela
+
+
+def exportar_csv(dados_clientes, caminho_saida):
+    """
+    Exporta os lançamentos pendentes em CSV (separador ';' e vírgula decimal,
+    para abrir direto no Excel), gravando um cliente por vez
+    """
+    cabecalho = True
+    with open(caminho_saida, 'w', encoding='utf-8-sig', newline='') as f:
+        for dados in dados_clientes:
+            if dados is None or dados['lancamentos'].empty:
+                continue
+            _tabela_exportacao(dados).to_csv(f, sep=';', decimal=',', index=False, header=cabecalho)
+            cabecalho = False
+
+
+def exportar_json(dados_clientes, caminho_saida):
+    """Exporta os lançamentos pendentes em JSON (datas dd/mm/aaaa), gravando um cliente por vez"""
+    with open(caminho_saida, 'w', encoding='utf-8') as f:
+        f.write('{"gerado_em": %s, "clientes": [' % json.dumps(datetime.now().isoformat(timespec='seconds')))
+        primeiro = True
+        for dados in dados_clientes:
+            if dados is None or dados['lancamentos'].empty:
+                continue
+            tabela = _tabela_exportacao(dados)
+            cliente = {
+                'cliente': dados['nome_cliente'],
+                'arquivo': str(dados['arquivo']),
+                'ultima_data': dados['ultima_data'].strftime('%d/%m/%Y'),
+                'total': round(float(dados['lancamentos']['VALOR'].sum()), 2),
+                'lancamentos': json.loads(tabela.drop(columns='CLIENTE').to_json(orient='records',
+                                                                                  force_ascii=False)),
+            }
+            f.write(('' if primeiro else ',') + '\n' + json.dumps(cliente, ensure_ascii=False))
+            primeiro = False
+        f.write('\n]}\n')
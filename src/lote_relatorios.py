@@ -0,0 +1,138 @@
+"""
+Geração de relatórios em lote
+
+Cada planilha selecionada é processada em um processo do pool (carga dos
+dados, processar_dados, calcular_acumulado_dados e gerar_relatorio_pdf via
+RelatorioHandler.gerar_relatorio_cliente). Erros ficam restritos ao arquivo
+que os causou e cada resultado traz o tempo gasto no arquivo. Com
+somente_alterados=True, os clientes cujo relatório não mudou desde a última
+geração (manifesto_relatorios) não têm o PDF gerado de novo.
+"""
+import logging
+import os
+import time
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+try:
+    from src.execucao_paralela import ExecucaoParalela
+except ImportError:
+    from execucao_paralela import ExecucaoParalela
+
+logger = logging.getLogger(__name__)
+
+# RelatorioHandler do processo (criado na primeira tarefa de cada processo do pool)
+_handler = None
+
+
+@dataclass(frozen=True)
+class ResultadoRelatorio:
+    """Resultado da geração do relatório de um arquivo"""
+    arquivo: str
+    nome_cliente: Optional[str]
+    caminho: Optional[str]
+    segundos: float
+    erro: Optional[str] = None
+    ignorado: bool = False  # relatório inalterado, PDF mantido
+
+    @property
+    def sucesso(self):
+        return self.erro is None
+
+    @property
+    def nome_arquivo(self):
+        return os.path.basename(self.arquivo)
+
+
+def _handler_processo():
+    global _handler
+    if _handler is None:
+        try:
+            from src.relatorio_despesas_aprimorado import RelatorioHandler
+        except ImportError:
+            from relatorio_despesas_aprimorado import RelatorioHandler
+        _handler = RelatorioHandler()
+    return _handler
+
+
+def gerar_relatorio_arquivo(arquivo_excel, data_rel, incluir_futuros=True, somente_alterados=False):
+    """
+    Gera o relatório de uma planilha, sem propagar exceções
+
+    Returns:
+        ResultadoRelatorio
+    """
+    inicio = time.perf_counter()
+    handler = _handler_processo()
+    try:
+        nome_cliente, caminho = handler.gerar_relatorio_cliente(arquivo_excel, data_rel, incluir_futuros,
+                                                                somente_alterados)
+    except Exception as e:
+        logger.error(f"Erro ao processar arquivo {os.path.basename(arquivo_excel)}: {str(e)}", exc_info=True)
+        return ResultadoRelatorio(str(arquivo_excel), None, None, time.perf_counter() - inicio, str(e))
+    return ResultadoRelatorio(str(arquivo_excel), nome_cliente, caminho, time.perf_counter() - inicio,
+                              ignorado=caminho in handler.relatorios_ignorados)
+
+
+def arquivos_da_pasta(pasta):
+    """Planilhas .xlsx da pasta (ignorando arquivos temporários do Excel), em ordem alfabética"""
+    return sorted(str(p) for p in Path(pasta).glob('*.xlsx') if not p.name.startswith('~$'))
+
+
+class LoteRelatorios(ExecucaoParalela):
+    """
+    Gera os relatórios de várias planilhas em um pool de processos
+
+    O callback ao_concluir(resultado) recebe um ResultadoRelatorio à medida
+    que cada arquivo termina, a partir de uma thread do executor.
+    """
+
+    def __init__(self, arquivos, data_rel, incluir_futuros=True, max_workers=None, somente_alterados=False):
+        self.data_rel = data_rel
+        self.inicio = None
+        super().__init__(gerar_relatorio_arquivo,
+                         {str(arquivo): (str(arquivo), data_rel, incluir_futuros, somente_alterados)
+                          for arquivo in arquivos},
+                         max_workers)
+
+    def iniciar(self, ao_concluir=None):
+        self.inicio = time.perf_counter()
+
+        def repassar(arquivo, resultado, erro):
+            if ao_concluir:
+                ao_concluir(_resultado_ou_erro(arquivo, resultado, erro))
+        return super().iniciar(repassar)
+
+    def aguardar(self):
+        super().aguardar()
+        return self.relatorios()
+
+    def resumo(self):
+        """Resumo da execução (serializável em JSON) com o tempo de cada arquivo"""
+        relatorios = self.relatorios()
+        falhas = sum(1 for r in relatorios if not r.sucesso) + (self.total - len(relatorios))
+        ignorados = sum(1 for r in relatorios if r.ignorado)
+        return {
+            'data_relatorio': self.data_rel.strftime('%d/%m/%Y'),
+            'gerado_em': datetime.now().isoformat(timespec='seconds'),
+            'processos': self.max_workers,
+            'segundos': round(time.perf_counter() - self.inicio, 3) if self.inicio else 0.0,
+            'total': self.total,
+            'gerados': len(relatorios) - sum(1 for r in relatorios if not r.sucesso) - ignorados,
+            'ignorados': ignorados,
+            'falhas': falhas,
+            'relatorios': [dict(asdict(r), segundos=round(r.segundos, 3)) for r in relatorios],
+        }
+
+    def relatorios(self):
+        """ResultadoRelatorio dos arquivos concluídos, na ordem de seleção"""
+        return [_resultado_ou_erro(arquivo, resultado, erro) for arquivo, resultado, erro in self.resultados()]
+
+
+def _resultado_ou_erro(arquivo, resultado, erro):
+    # erro só é preenchido quando o processo do pool falha (a tarefa captura as próprias exceções)
+    if erro is not None:
+        return ResultadoRelatorio(arquivo, None, None, 0.0, str(erro))
+    return resultado
@@ -0,0 +1,121 @@
+"""
+Manifesto dos relatórios gerados de um cliente
+
+Para cada relatório gerado, o arquivo <planilha>.relatorios.json (ao lado
+da planilha, como o cache de Dados) guarda um hash de tudo o que entra no
+PDF: linhas da aba Dados com a DATA_REL do relatório, lançamentos futuros,
+valor acumulado, parcelas de Contratos_ADM, cabeçalho e versão do modelo.
+Na geração em lote, o relatório cujo hash não mudou (e cujo PDF ainda
+existe) não é gerado de novo.
+"""
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+SUFIXO_MANIFESTO = '.relatorios.json'
+VERSAO_MANIFESTO = 1
+
+
+def caminho_manifesto(arquivo_excel):
+    """Retorna o caminho do manifesto de relatórios de uma planilha de cliente"""
+    arquivo_excel = Path(arquivo_excel)
+    return arquivo_excel.with_name(arquivo_excel.stem + SUFIXO_MANIFESTO)
+
+
+def hash_dataframe(df):
+    """Hash SHA-1 do conteúdo de um DataFrame (colunas e valores, sem o índice)"""
+    sha1 = hashlib.sha1()
+    if df is None:
+        return sha1.hexdigest()
+    sha1.update(json.dumps([str(c) for c in df.columns]).encode('utf-8'))
+    if len(df):
+        sha1.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return sha1.hexdigest()
+
+
+def assinatura_relatorio(linhas_data, df_futuro, acumulado, parcelas, cabecalho, versao_modelo):
+    """
+    Monta a assinatura de um relatório a partir dos dados que entram no PDF
+
+    Args:
+        linhas_data (pd.DataFrame): Linhas da aba Dados com a DATA_REL do relatório
+        df_futuro (pd.DataFrame): Lançamentos futuros (None se não incluídos)
+        acumulado (float): Valor acumulado até a data
+        parcelas (pd.DataFrame): Parcelas de Contratos_ADM exibidas no relatório
+        cabecalho (dict): Nome, endereço e número do relatório
+        versao_modelo (int): Versão do layout do PDF
+
+    Returns:
+        dict: Hashes de cada parte e o hash geral ('hash')
+    """
+    assinatura = {
+        'hash_dados': hash_dataframe(linhas_data),
+        'hash_futuros': hash_dataframe(df_futuro),
+        'acumulado': round(float(acumulado), 2),
+        'hash_parcelas': hash_dataframe(parcelas),
+        'cabecalho': {chave: str(valor) for chave, valor in cabecalho.items()},
+        'versao_modelo': versao_modelo,
+    }
+    conteudo = json.dumps(assinatura, sort_keys=True, ensure_ascii=False)
+    assinatura['hash'] = hashlib.sha1(conteudo.encode('utf-8')).hexdigest()
+    return assinatura
+
+
+class ManifestoRelatorios:
+    """Relatórios já gerados de uma planilha, indexados pela data do relatório"""
+
+    def __init__(self, arquivo_excel):
+        self.caminho = caminho_manifesto(arquivo_excel)
+        self.relatorios = self._ler()
+
+    def _ler(self):
+        if not self.caminho.exists():
+            return {}
+        try:
+            with open(self.caminho, encoding='utf-8') as f:
+                conteudo = json.load(f)
+            if conteudo.get('versao') != VERSAO_MANIFESTO:
+                return {}
+            return conteudo.get('relatorios', {})
+        except Exception as e:
+            logger.warning(f"Manifesto de relatórios inválido, será recriado ({self.caminho.name}): {str(e)}")
+            return {}
+
+    @staticmethod
+    def _chave(data_rel):
+        return pd.Timestamp(data_rel).strftime('%Y-%m-%d')
+
+    def inalterado(self, data_rel, assinatura, caminho_pdf):
+        """Indica se o relatório da data já foi gerado com a mesma assinatura e o PDF existe"""
+        registro = self.relatorios.get(self._chave(data_rel))
+        return (registro is not None and
+                registro.get('hash') == assinatura['hash'] and
+                registro.get('arquivo_pdf') == os.path.basename(caminho_pdf) and
+                os.path.exists(caminho_pdf))
+
+    def registrar(self, data_rel, assinatura, caminho_pdf):
+        self.relatorios[self._chave(data_rel)] = dict(
+            assinatura,
+            arquivo_pdf=os.path.basename(caminho_pdf),
+            gerado_em=datetime.now().isoformat(timespec='seconds'),
+        )
+
+    def salvar(self):
+        """Grava o manifesto de forma atômica (arquivo temporário + substituição)"""
+        temporario = self.caminho.with_name(f"{self.caminho.name}.{os.getpid()}.tmp")
+        try:
+            with open(temporario, 'w', encoding='utf-8') as f:
+                json.dump({'versao': VERSAO_MANIFESTO, 'relatorios': self.relatorios}, f,
+                          ensure_ascii=False, indent=2, sort_keys=True)
+            os.replace(temporario, self.caminho)
+        except Exception as e:
+            logger.warning(f"Não foi possível gravar o manifesto de relatórios ({self.caminho.name}): {str(e)}")
+            if temporario.exists():
+                temporario.unlink()
@@ -53,6 +53,11 @@ except ImportError as e:
         print(f"Erro ao importar configurações (caminho alternativo): {str(e2)}")
         raise
 
+try:
+    from src.registro_clientes import obter_registro_clientes
+except ImportError:
+    from registro_clientes import obter_registro_clientes
+
 class GestaoEventos:
     def __init__(self, parent=None):
         self.parent = parent
@@ -113,19 +118,7 @@ class GestaoEventos:
                 messagebox.showwarning("Aviso", "Arquivo de clientes não encontrado!")
                 return []
                 
-            workbook = load_workbook(ARQUIVO_CLIENTES)
-            sheet = workbook['Clientes']
-            print(f"Planilha aberta, abas disponíveis: {workbook.sheetnames}")
-            print(f"Número de linhas na planilha: {sheet.max_row}")
-            
-            clientes = []
-            
-            for row in sheet.iter_rows(min_row=2, values_only=True):
-                if row[0]:  # Nome do cliente
-                    print(f"Cliente encontrado: {row[0]}")
-                    clientes.append(row[0])
-                    
-            workbook.close()
+            clientes = obter_registro_clientes(ARQUIVO_CLIENTES).nomes()
             print(f"Total de clientes carregados: {len(clientes)}")
             return sorted(clientes)
             
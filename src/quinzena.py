@@ -0,0 +1,107 @@
+"""
+Calendário quinzenal (relatórios dos dias 05 e 20)
+
+Cada quinzena é identificada por um ordinal inteiro: ordinal 2k é o dia 05
+e 2k + 1 o dia 20 do mês k (contado a partir do ano 0). As conversões entre
+datas e ordinais são aritméticas (O(1)), sem avançar quinzena a quinzena, e
+as funções com sufixo _array fazem o mesmo sobre colunas inteiras (NumPy).
+
+Exemplo:
+    numero_relatorio(date(2025, 1, 5), date(2025, 2, 20))  # 4
+    deslocar(date(2025, 12, 20), 1)                        # 05/01/2026
+"""
+from datetime import date
+
+import numpy as np
+
+DIAS_QUINZENA = (5, 20)
+
+# Ordinal das células sem data nas funções _array
+ORDINAL_NULO = -1
+
+# Meses entre o ano 0 e a época do NumPy (1970-01)
+_MESES_EPOCA = 1970 * 12
+
+
+def eh_data_quinzena(data):
+    """Indica se a data cai em um dia de relatório (05 ou 20)"""
+    return data.day in DIAS_QUINZENA
+
+
+def ordinal(data):
+    """
+    Ordinal da quinzena que contém a data: a última data de relatório
+    (05 ou 20) igual ou anterior a ela
+    """
+    mes = data.year * 12 + data.month - 1
+    return 2 * mes + (data.day >= 5) + (data.day >= 20) - 1
+
+
+def ordinal_seguinte(data):
+    """Ordinal da primeira data de relatório (05 ou 20) igual ou posterior à data"""
+    mes = data.year * 12 + data.month - 1
+    return 2 * mes + (data.day > 5) + (data.day > 20)
+
+
+def data_do_ordinal(numero, modelo=None):
+    """
+    Data de relatório (05 ou 20) do ordinal
+
+    Args:
+        numero (int): Ordinal da quinzena
+        modelo (date/datetime, optional): Se informado, o resultado mantém o
+            tipo (e o horário) do modelo
+    """
+    mes, segunda = divmod(numero, 2)
+    ano, mes = divmod(mes, 12)
+    dia = DIAS_QUINZENA[segunda]
+    if modelo is not None:
+        return modelo.replace(year=ano, month=mes + 1, day=dia)
+    return date(ano, mes + 1, dia)
+
+
+def deslocar(data, quinzenas):
+    """Data de relatório a n quinzenas da quinzena que contém a data"""
+    return data_do_ordinal(ordinal(data) + quinzenas, modelo=data)
+
+
+def proxima(data):
+    """Próxima data de relatório após a quinzena que contém a data"""
+    return deslocar(data, 1)
+
+
+def ajustar(data):
+    """Primeira data de relatório igual ou posterior à data (mantém o tipo)"""
+    return data_do_ordinal(ordinal_seguinte(data), modelo=data)
+
+
+def numero_relatorio(data_inicial, data_ref):
+    """Número do relatório da quinzena de data_ref, contando a de data_inicial como 1"""
+    return ordinal(data_ref) - ordinal(data_inicial) + 1
+
+
+def datas_quinzenais(data_inicial, quantidade):
+    """As `quantidade` datas de relatório a partir da quinzena de data_inicial (mantém o tipo)"""
+    inicio = ordinal(data_inicial)
+    return [data_do_ordinal(inicio + i, modelo=data_inicial) for i in range(quantidade)]
+
+
+def ordinais_array(datas):
+    """
+    Ordinais das quinzenas de um array de datas (datetime64, Series ou
+    DatetimeIndex); ORDINAL_NULO onde não há data (NaT)
+    """
+    datas = np.asarray(datas, dtype='datetime64[D]')
+    meses = datas.astype('datetime64[M]')
+    dias = (datas - meses.astype('datetime64[D]')).astype(np.int64) + 1
+    numeros = 2 * (meses.astype(np.int64) + _MESES_EPOCA) + (dias >= 5) + (dias >= 20) - 1
+    return np.where(np.isnat(datas), ORDINAL_NULO, numeros)
+
+
+def datas_array(ordinais):
+    """Datas de relatório (datetime64[D]) de um array de ordinais; NaT em ORDINAL_NULO"""
+    ordinais = np.asarray(ordinais, dtype=np.int64)
+    meses, segunda = np.divmod(ordinais, 2)
+    datas = ((meses - _MESES_EPOCA).astype('datetime64[M]').astype('datetime64[D]')
+             + np.where(segunda == 1, 19, 4).astype('timedelta64[D]'))
+    return np.where(ordinais == ORDINAL_NULO, np.datetime64('NaT', 'D'), datas)
@@ -0,0 +1,148 @@
+"""
+Registro de clientes em memória
+
+Mantém a aba Clientes de clientes.xlsx (nome, endereço, data inicial,
+observações e Taxa ADM) carregada uma única vez por processo, compartilhada
+entre as telas. A base é relida apenas quando o arquivo é alterado (tamanho
+ou data de modificação).
+"""
+import logging
+import os
+import threading
+from pathlib import Path
+
+from openpyxl import load_workbook
+
+logger = logging.getLogger(__name__)
+
+# Colunas da aba Clientes (base 1)
+COLUNA_NOME = 1
+COLUNA_ENDERECO = 2
+COLUNA_DATA_INICIAL = 3
+COLUNA_OBSERVACOES = 4
+COLUNA_TAXA_ADM = 7
+TOTAL_COLUNAS = COLUNA_TAXA_ADM
+
+
+class RegistroClientes:
+    """Base de clientes indexada por nome"""
+
+    def __init__(self, arquivo_clientes):
+        self.arquivo = Path(arquivo_clientes)
+        self._assinatura = None
+        self._clientes = []
+        self._indice = {}
+        self._lock = threading.RLock()
+
+    def _assinatura_atual(self):
+        stat = os.stat(self.arquivo)
+        return (stat.st_size, stat.st_mtime_ns)
+
+    def _atualizar(self):
+        """Recarrega a base se o arquivo mudou desde a última leitura"""
+        assinatura = self._assinatura_atual()
+        if assinatura == self._assinatura:
+            return
+
+        logger.debug(f"Carregando base de clientes: {self.arquivo}")
+        wb = load_workbook(self.arquivo, read_only=True)
+        try:
+            ws = wb['Clientes']
+            clientes = []
+            for linha, row in enumerate(ws.iter_rows(min_row=2, max_col=TOTAL_COLUNAS, values_only=True), start=2):
+                row = tuple(row) + (None,) * (TOTAL_COLUNAS - len(row))
+                if not row[COLUNA_NOME - 1]:
+                    continue
+                clientes.append({
+                    'nome': row[COLUNA_NOME - 1],
+                    'endereco': row[COLUNA_ENDERECO - 1],
+                    'data_inicial': row[COLUNA_DATA_INICIAL - 1],
+                    'observacoes': row[COLUNA_OBSERVACOES - 1],
+                    'taxa_adm': row[COLUNA_TAXA_ADM - 1],
+                    'linha': linha,
+                })
+        finally:
+            wb.close()
+
+        indice = {}
+        for posicao, cliente in enumerate(clientes):
+            indice.setdefault(cliente['nome'], []).append(posicao)
+
+        self._clientes = clientes
+        self._indice = indice
+        self._assinatura = assinatura
+
+    def invalidar(self):
+        """Força a releitura da base na próxima consulta"""
+        with self._lock:
+            self._assinatura = None
+
+    def clientes(self):
+        """Retorna os clientes na ordem da planilha (cópias dos registros)"""
+        with self._lock:
+            self._atualizar()
+            return [dict(cliente) for cliente in self._clientes]
+
+    def nomes(self):
+        """Retorna os nomes dos clientes na ordem da planilha"""
+        with self._lock:
+            self._atualizar()
+            return [cliente['nome'] for cliente in self._clientes]
+
+    def buscar(self, nome):
+        """Retorna o primeiro cadastro com o nome informado ou None"""
+        with self._lock:
+            self._atualizar()
+            posicoes = self._indice.get(nome)
+            return dict(self._clientes[posicoes[0]]) if posicoes else None
+
+    def definir_taxa(self, nome, taxa):
+        """
+        Grava a Taxa ADM (coluna G) do cliente, alterando apenas as células das
+        linhas desse cliente. Use taxa=None para remover.
+
+        Returns:
+            bool: False se o cliente não estiver cadastrado
+        """
+        with self._lock:
+            self._atualizar()
+            posicoes = self._indice.get(nome)
+            if not posicoes:
+                return False
+
+            wb = load_workbook(self.arquivo)
+            try:
+                ws = wb['Clientes']
+                for posicao in posicoes:
+                    ws.cell(row=self._clientes[posicao]['linha'], column=COLUNA_TAXA_ADM, value=taxa)
+                wb.save(self.arquivo)
+            finally:
+                wb.close()
+
+            for posicao in posicoes:
+                self._clientes[posicao]['taxa_adm'] = taxa
+            self._assinatura = self._assinatura_atual()
+            return True
+
+
+_registros = {}
+_registros_lock = threading.Lock()
+
+
+def obter_registro_clientes(arquivo_clientes=None):
+    """
+    Retorna o registro compartilhado (por processo) da base de clientes
+
+    Args:
+        arquivo_clientes (str, optional): Caminho da base. Se não informado,
+            usa o ARQUIVO_CLIENTES da configuração
+    """
+    if not arquivo_clientes:
+        from src.config.config import ARQUIVO_CLIENTES
+        arquivo_clientes = ARQUIVO_CLIENTES
+
+    chave = os.path.abspath(arquivo_clientes)
+    with _registros_lock:
+        if chave not in _registros:
+            _registros[chave] = RegistroClientes(chave)
+        return _registros[chave]
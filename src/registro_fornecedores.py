@@ -0,0 +1,342 @@
+"""
+Registro de fornecedores em memória
+
+Carrega a aba Fornecedores de base_fornecedores.xlsx uma única vez por
+processo e mantém um índice por CNPJ/CPF normalizado e um índice de trigramas
+para a busca por nome, razão social, CNPJ/CPF e especificação. A base é
+recarregada automaticamente quando o arquivo é alterado (tamanho ou data de
+modificação).
+"""
+import logging
+import os
+import re
+import threading
+import unicodedata
+from pathlib import Path
+
+from openpyxl import load_workbook
+
+logger = logging.getLogger(__name__)
+
+# Quantidade de colunas da aba Fornecedores (A até O)
+TOTAL_COLUNAS = 15
+
+CAMPOS_FORNECEDOR = [
+    'cnpj_cpf', 'tipo_pessoa', 'razao_social', 'nome', 'telefone', 'email',
+    'banco', 'op', 'agencia', 'conta', 'chave_pix', 'categoria',
+    'especificacao', 'vinculo',
+]
+
+
+def normalizar_documento(documento):
+    """
+    Normaliza um CNPJ/CPF para a chave do índice: apenas dígitos, com zeros à
+    esquerda até 11 (CPF) ou 14 (CNPJ) posições. Retorna None se vazio.
+    """
+    if documento is None:
+        return None
+    if isinstance(documento, float) and documento.is_integer():
+        documento = int(documento)
+    digitos = re.sub(r'\D', '', str(documento))
+    if not digitos:
+        return None
+    if len(digitos) <= 11:
+        return digitos.zfill(11)
+    return digitos.zfill(14)
+
+
+def normalizar_texto(texto):
+    """Texto em minúsculas e sem acentos, usado na busca"""
+    if texto is None:
+        return ''
+    texto = unicodedata.normalize('NFKD', str(texto))
+    return ''.join(c for c in texto if not unicodedata.combining(c)).lower().strip()
+
+
+def _trigramas(texto):
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+
+class IndiceBuscaFornecedores:
+    """
+    Índice de trigramas sobre nome, razão social, CNPJ/CPF e especificação.
+    Os termos com três ou mais caracteres são resolvidos pela interseção das
+    listas de trigramas; termos menores percorrem os textos já normalizados.
+    """
+
+    # Campos pesquisados, na ordem de relevância (coluna da aba Fornecedores)
+    CAMPOS = (3, 2, 0, 12)
+
+    def __init__(self):
+        self._textos = {}      # posição -> textos normalizados de cada campo
+        self._trigramas = {}   # trigrama -> posições
+
+    def adicionar(self, posicao, row):
+        """Inclui (ou substitui) a linha de um fornecedor no índice"""
+        self.remover(posicao)
+        textos = tuple(normalizar_texto(row[campo]) for campo in self.CAMPOS)
+        if not any(textos):
+            return
+        # O texto completo (campos separados por '|') fica no final da tupla
+        textos += ('|'.join(textos),)
+        self._textos[posicao] = textos
+        for trigrama in _trigramas(textos[-1]):
+            self._trigramas.setdefault(trigrama, set()).add(posicao)
+
+    def remover(self, posicao):
+        textos = self._textos.pop(posicao, None)
+        if textos is None:
+            return
+        for trigrama in _trigramas(textos[-1]):
+            posicoes = self._trigramas.get(trigrama)
+            if posicoes is not None:
+                posicoes.discard(posicao)
+                if not posicoes:
+                    del self._trigramas[trigrama]
+
+    def pesquisar(self, termo):
+        """Retorna as posições que contêm todas as palavras do termo, ordenadas por relevância"""
+        palavras = normalizar_texto(termo).split()
+        if not palavras:
+            # Sem termo: todos os fornecedores em ordem de nome e CNPJ/CPF
+            return sorted(self._textos, key=lambda posicao: (self._textos[posicao][0], self._textos[posicao][2]))
+
+        # Interseção das listas de trigramas, começando pela menor
+        listas = sorted(
+            (self._trigramas.get(trigrama, ()) for palavra in palavras for trigrama in _trigramas(palavra)),
+            key=len
+        )
+        if listas:
+            candidatos = set(listas[0])
+            for posicoes in listas[1:]:
+                if not candidatos:
+                    break
+                candidatos.intersection_update(posicoes)
+        else:
+            candidatos = self._textos.keys()
+
+        termo = ' '.join(palavras)
+        textos = self._textos
+        resultados = []
+        for posicao in candidatos:
+            campos = textos[posicao]
+            completo = campos[-1]
+            if all(palavra in completo for palavra in palavras):
+                resultados.append((self._relevancia(campos, termo, palavras[0]), campos[0], posicao))
+        resultados.sort()
+        return [posicao for _, _, posicao in resultados]
+
+    @staticmethod
+    def _relevancia(campos, termo, primeira_palavra):
+        """Menor é melhor: nome iniciando pelo termo, palavra do nome, trecho do nome, demais campos"""
+        nome = campos[0]
+        if nome.startswith(termo):
+            return 0
+        if (' ' + primeira_palavra) in nome:
+            return 1
+        if termo in nome:
+            return 2
+        for nivel, texto in enumerate(campos[1:-1], start=3):
+            if termo in texto:
+                return nivel
+        return len(campos) + 1
+
+
+class RegistroFornecedores:
+    """Base de fornecedores indexada por CNPJ/CPF"""
+
+    def __init__(self, arquivo_fornecedores):
+        self.arquivo = Path(arquivo_fornecedores)
+        self._assinatura = None
+        self._linhas = []
+        self._indice = {}
+        self._busca = None
+        self._lock = threading.RLock()
+
+    def _assinatura_atual(self):
+        stat = os.stat(self.arquivo)
+        return (stat.st_size, stat.st_mtime_ns)
+
+    def _atualizar(self):
+        """Recarrega a base se o arquivo mudou desde a última leitura"""
+        assinatura = self._assinatura_atual()
+        if assinatura == self._assinatura:
+            return
+
+        logger.debug(f"Carregando base de fornecedores: {self.arquivo}")
+        wb = load_workbook(self.arquivo, read_only=True, data_only=True)
+        try:
+            ws = wb['Fornecedores']
+            linhas = []
+            for row in ws.iter_rows(min_row=2, max_col=TOTAL_COLUNAS, values_only=True):
+                row = tuple(row) + (None,) * (TOTAL_COLUNAS - len(row))
+                linhas.append(row)
+        finally:
+            wb.close()
+
+        indice = {}
+        for posicao, row in enumerate(linhas):
+            chave = normalizar_documento(row[0])
+            # Em caso de duplicidade vale a primeira linha, como na busca sequencial
+            if chave and chave not in indice:
+                indice[chave] = posicao
+
+        self._linhas = linhas
+        self._indice = indice
+        self._busca = None
+        self._assinatura = assinatura
+
+    def _indice_busca(self):
+        if self._busca is None:
+            busca = IndiceBuscaFornecedores()
+            for posicao, row in enumerate(self._linhas):
+                busca.adicionar(posicao, row)
+            self._busca = busca
+        return self._busca
+
+    def invalidar(self):
+        """Força a releitura da base na próxima consulta"""
+        with self._lock:
+            self._assinatura = None
+
+    def linhas(self):
+        """Retorna todas as linhas da aba Fornecedores (tuplas com 15 colunas)"""
+        with self._lock:
+            self._atualizar()
+            return list(self._linhas)
+
+    def _posicao(self, chave):
+        posicao = self._indice.get(chave)
+        # CPF informado com 14 dígitos (ex.: campo preenchido com zfill(14))
+        if posicao is None and chave and len(chave) == 14 and chave.startswith('000'):
+            posicao = self._indice.get(chave[3:])
+        return posicao
+
+    def buscar(self, cnpj_cpf):
+        """Retorna a linha do fornecedor com o CNPJ/CPF informado ou None"""
+        chave = normalizar_documento(cnpj_cpf)
+        if not chave:
+            return None
+        with self._lock:
+            self._atualizar()
+            posicao = self._posicao(chave)
+            return None if posicao is None else self._linhas[posicao]
+
+    def pesquisar(self, termo, limite=None):
+        """
+        Busca fornecedores por nome, razão social, CNPJ/CPF ou especificação,
+        sem diferenciar acentos e maiúsculas
+
+        Returns:
+            list: Linhas encontradas, das mais relevantes para as menos relevantes
+        """
+        with self._lock:
+            self._atualizar()
+            posicoes = self._indice_busca().pesquisar(termo)
+            if limite:
+                posicoes = posicoes[:limite]
+            return [self._linhas[posicao] for posicao in posicoes]
+
+    def salvar(self, row):
+        """
+        Grava um fornecedor na planilha: atualiza a linha do mesmo CNPJ/CPF ou
+        acrescenta uma nova ao final. A linha é localizada pelo índice, sem
+        percorrer nem reescrever a aba; a ordenação por nome fica a cargo da
+        busca (pesquisar).
+
+        Args:
+            row: Valores das colunas A..O do fornecedor
+
+        Returns:
+            int: Número da linha gravada na planilha
+        """
+        row = tuple(row) + (None,) * (TOTAL_COLUNAS - len(row))
+        chave = normalizar_documento(row[0])
+        with self._lock:
+            self._atualizar()
+            posicao = self._posicao(chave)
+
+            wb = load_workbook(self.arquivo)
+            try:
+                ws = wb['Fornecedores']
+                if posicao is None:
+                    linha = max(ws.max_row, len(self._linhas) + 1) + 1
+                else:
+                    linha = posicao + 2
+                    if normalizar_documento(ws.cell(row=linha, column=1).value) != self._chave_linha(posicao):
+                        raise ValueError(f"Base de fornecedores alterada durante a gravação (linha {linha})")
+                for coluna, valor in enumerate(row, start=1):
+                    ws.cell(row=linha, column=coluna, value=valor)
+                wb.save(self.arquivo)
+            finally:
+                wb.close()
+
+            self._registrar(linha - 2, row)
+            return linha
+
+    def _chave_linha(self, posicao):
+        return normalizar_documento(self._linhas[posicao][0])
+
+    def _registrar(self, posicao, row):
+        """Atualiza as linhas, o índice de CNPJ/CPF e o índice de busca em memória"""
+        while len(self._linhas) <= posicao:
+            self._linhas.append((None,) * TOTAL_COLUNAS)
+        chave = normalizar_documento(row[0])
+        if self._indice.get(self._chave_linha(posicao)) == posicao:
+            del self._indice[self._chave_linha(posicao)]
+        self._linhas[posicao] = row
+        if chave and chave not in self._indice:
+            self._indice[chave] = posicao
+        if self._busca is not None:
+            self._busca.adicionar(posicao, row)
+        self._assinatura = self._assinatura_atual()
+
+    def dados_bancarios(self, cnpj_cpf, forma_pagamento="PIX"):
+        """
+        Dados bancários do fornecedor conforme a forma de pagamento: a chave
+        PIX ou banco/OP/agência/conta seguidos do CNPJ/CPF (TED)
+        """
+        row = self.buscar(cnpj_cpf)
+        if row is None:
+            return 'DADOS BANCÁRIOS NÃO CADASTRADOS'
+
+        if forma_pagamento == "PIX" and row[10]:  # Chave PIX está na coluna K
+            dados_bancarios = f"PIX: {row[10]}"
+        else:
+            # Banco, OP, agência e conta (colunas G a J) e SEMPRE o CNPJ/CPF para TED
+            partes_dados = [str(valor) for valor in (row[6], row[7], row[8], row[9], row[0]) if valor]
+            dados_bancarios = ' - '.join(partes_dados)
+
+        if not dados_bancarios or dados_bancarios.strip() == '-':
+            dados_bancarios = 'DADOS BANCÁRIOS NÃO CADASTRADOS'
+        return dados_bancarios
+
+    def fornecedor_completo(self, cnpj_cpf):
+        """Retorna os dados do fornecedor como dicionário ou None"""
+        row = self.buscar(cnpj_cpf)
+        if row is None:
+            return None
+        return dict(zip(CAMPOS_FORNECEDOR, row))
+
+
+_registros = {}
+_registros_lock = threading.Lock()
+
+
+def obter_registro_fornecedores(arquivo_fornecedores=None):
+    """
+    Retorna o registro compartilhado (por processo) da base de fornecedores
+
+    Args:
+        arquivo_fornecedores (str, optional): Caminho da base. Se não informado,
+            usa o ARQUIVO_FORNECEDORES da configuração
+    """
+    if not arquivo_fornecedores:
+        from src.config.config import ARQUIVO_FORNECEDORES
+        arquivo_fornecedores = ARQUIVO_FORNECEDORES
+
+    chave = os.path.abspath(arquivo_fornecedores)
+    with _registros_lock:
+        if chave not in _registros:
+            _registros[chave] = RegistroFornecedores(chave)
+        return _registros[chave]
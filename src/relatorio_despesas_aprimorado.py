@@ -1,32 +1,76 @@
 import sys
 import os
 import pandas as pd
-import xlwings as xw
 import openpyxl
 import warnings
 import platform
 import subprocess
-import tkinter as tk
 import numpy as np
-from tkinter import Tk
-from openpyxl import load_workbook
-from tkinter import ttk, messagebox, filedialog, StringVar, Toplevel, BooleanVar
-from tkcalendar import Calendar
 from openpyxl.styles import Alignment, Font
 from openpyxl.utils import get_column_letter
 from datetime import datetime, date
 from reportlab.lib.pagesizes import landscape, A4
 from reportlab.pdfgen import canvas
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.platypus import (
-    SimpleDocTemplate, Table, TableStyle, Paragraph, 
-    PageTemplate, Frame, Spacer, PageBreak, Image
+    SimpleDocTemplate, Table, Paragraph, 
+    PageTemplate, Frame, Spacer, PageBreak, LongTable, Flowable
 )
-from reportlab.lib.enums import TA_LEFT
-from reportlab.lib.enums import TA_CENTER
-from reportlab.lib import colors
+from reportlab.pdfbase.pdfmetrics import stringWidth
 from reportlab.platypus import KeepTogether
 import logging
+import argparse
+import json
+import queue
+import time
+
+try:
+    from src import quinzena
+    from src.sessao_planilha import SessaoPlanilha
+    from src.cache_dados import carregar_dados_cliente, normalizar_dados, acumulado_ate
+    from src.contratos_adm import ler_bloco_parcelas, carregar_bloco_parcelas
+    from src.lote_relatorios import LoteRelatorios, arquivos_da_pasta
+    from src.manifesto_relatorios import ManifestoRelatorios, assinatura_relatorio
+    from src.estilos_relatorio import (ESTILOS, ESTILO_SUBTOTAIS, ESTILO_TOTAIS, ESTILO_CABECALHO_EMPRESA,
+                                       ESTILO_INFO_CLIENTE, ESTILO_PARCELAS, COLUNAS_NUMERICAS,
+                                       estilo_tabela_despesas, leitor_logo,
+                                       LogoRelatorio)
+    from src.lancamentos_pendentes import (ler_pendentes_cliente, pendentes_da_pasta, escrever_relatorio_html,
+                                           exportar_csv, exportar_json)
+except ImportError:
+    import quinzena
+    from sessao_planilha import SessaoPlanilha
+    from cache_dados import carregar_dados_cliente, normalizar_dados, acumulado_ate
+    from contratos_adm import ler_bloco_parcelas, carregar_bloco_parcelas
+    from lote_relatorios import LoteRelatorios, arquivos_da_pasta
+    from manifesto_relatorios import ManifestoRelatorios, assinatura_relatorio
+    from estilos_relatorio import (ESTILOS, ESTILO_SUBTOTAIS, ESTILO_TOTAIS, ESTILO_CABECALHO_EMPRESA,
+                                   ESTILO_INFO_CLIENTE, ESTILO_PARCELAS, COLUNAS_NUMERICAS,
+                                   estilo_tabela_despesas, leitor_logo,
+                                   LogoRelatorio)
+    from lancamentos_pendentes import (ler_pendentes_cliente, pendentes_da_pasta, escrever_relatorio_html,
+                                       exportar_csv, exportar_json)
+
+
+def _importar_interface():
+    """
+    Carrega o tkinter apenas quando a interface é usada: a geração pela linha
+    de comando (e os processos do lote) rodam sem display e sem Tk
+    """
+    global tk, Tk, ttk, messagebox, filedialog, StringVar, Toplevel, BooleanVar, IntVar, Calendar
+    import tkinter as tk
+    from tkinter import Tk, ttk, messagebox, filedialog, StringVar, Toplevel, BooleanVar, IntVar
+    from tkcalendar import Calendar
+
+
+# Versão do layout do PDF: aumentar ao alterar o conteúdo ou a formatação do
+# relatório, para que a geração em lote não reaproveite PDFs do modelo anterior
+VERSAO_MODELO_RELATORIO = 2
+
+# Tabelas de despesas com mais linhas que isso são montadas em blocos de
+# LongTable, página a página (RelatorioHandler.criar_tabela_longa)
+LIMITE_TABELA_LONGA = 1000
+# Linhas formatadas por tentativa de preencher uma página (dobradas enquanto couberem)
+LINHAS_POR_BLOCO = 50
 
 # Criar diretório para logs se não existir
 log_dir = 'logs'
@@ -65,6 +109,7 @@ handler = None
 
 class RelatorioUI:
     def __init__(self, parent):
+        _importar_interface()
         logger.info("Iniciando RelatorioUI")
         if parent is None:
             self.root = tk.Tk()
@@ -78,6 +123,8 @@ class RelatorioUI:
         logger.debug(f"Data inicial configurada: {self.data_selecionada.get()}")
         
         self.incluir_futuros = BooleanVar(value=True)
+        self.processos_lote = IntVar(self.root, value=os.cpu_count() or 1)
+        self.apenas_alterados = BooleanVar(value=True)
         self.status_label = None
         self.handler = RelatorioHandler()
         self.arquivos_lote = []
@@ -123,6 +170,13 @@ class RelatorioUI:
         frame_lote.pack(pady=10, padx=20, fill='x')
         ttk.Button(frame_lote, text="Selecionar Arquivos para Lote", 
                   command=self.selecionar_arquivos_lote).pack(pady=5, fill='x')
+        frame_processos = ttk.Frame(frame_lote)
+        frame_processos.pack(pady=5, fill='x')
+        ttk.Label(frame_processos, text="Processos simultâneos:").pack(side='left', padx=(0, 10))
+        ttk.Spinbox(frame_processos, from_=1, to=max(os.cpu_count() or 1, 1) * 2, width=5,
+                    textvariable=self.processos_lote).pack(side='left')
+        ttk.Checkbutton(frame_lote, text="Gerar apenas relatórios alterados",
+                        variable=self.apenas_alterados).pack(pady=5, anchor='w')
 
         # Checkbox para lançamentos futuros
         ttk.Checkbutton(main_frame, text="Incluir lançamentos futuros",
@@ -197,54 +251,11 @@ class RelatorioUI:
 
             logger.info(f"Iniciando geração de relatório para arquivo: {self.arquivo_path}")
             data_rel = datetime.strptime(self.data_selecionada.get(), '%d/%m/%Y')
-                
-            # Carregar e processar dados
-            df = self.handler.carregar_dados_excel(self.arquivo_path)  # Usar self.handler
-            df_filtrado, df_diaria, df_tp_desp_1, df_tp_desp_2 = self.handler.processar_dados(df, data_rel)
-                
-            # Processar lançamentos futuros
-            df_futuro = None
-            if self.incluir_futuros.get():
-                df_futuro = self.handler.processar_lancamentos_futuros(df, data_rel)
-                    
-            # Processar workbook
-            workbook = load_workbook(self.arquivo_path, data_only=True)
-            ws_resumo = workbook['RESUMO']
-            nome_cliente = ws_resumo['A3'].value
-                
-            # Obter número do relatório e valor acumulado
-            numero_relatorio = self.handler.obter_numero_relatorio(ws_resumo, data_rel)
-            valor_acumulado = self.handler.calcular_acumulado_dados(df, data_rel)
-            
-            logger.info(f"Número do relatório: {numero_relatorio}")
-            logger.info(f"Valor acumulado calculado: {valor_acumulado:,.2f}")
-                
-            dados_completos = {
-                'df_filtrado': df_filtrado,
-                'df_diaria': df_diaria,
-                'df_tp_desp_1': df_tp_desp_1,
-                'df_tp_desp_2': df_tp_desp_2,
-                'df_futuro': df_futuro,
-                'df_original': df,
-                'incluir_futuros': self.incluir_futuros.get(),
-                'data_relatorio': data_rel,
-                'nome_cliente': nome_cliente,
-                'endereco_cliente': ws_resumo['A4'].value,
-                'numero_relatorio': numero_relatorio,
-                'acumulado': valor_acumulado  # Valor direto, sem conversão
-            }
-            
-            logger.debug("Verificando dados antes de gerar PDF:")
-            logger.debug(f"dados_completos['acumulado']: {dados_completos['acumulado']}")
-            logger.debug(f"Tipo do acumulado: {type(dados_completos['acumulado'])}")
-            
-            # Gerar nome do arquivo
+
+            nome_cliente, _ = self.handler.gerar_relatorio_cliente(
+                self.arquivo_path, data_rel, self.incluir_futuros.get()
+            )
             data_formatada = data_rel.strftime('%d-%m-%Y')
-            nome_arquivo = f"REL - {nome_cliente} - {data_formatada}.pdf"
-            caminho_output = os.path.join(os.path.dirname(self.arquivo_path), nome_arquivo)
-            
-            # Gerar o PDF com os dados completos
-            self.handler.gerar_relatorio_pdf(dados_completos, caminho_output, self.arquivo_path)
             
             self.status_label.config(text=f"Relatório gerado com sucesso para {nome_cliente}")
             self.criar_dialog_relatorio_gerado(nome_cliente, data_formatada)
@@ -255,7 +266,7 @@ class RelatorioUI:
 
 
     def processar_lote(self, arquivos):
-        """Processa arquivos em lote"""
+        """Processa arquivos em lote (um processo por arquivo, até o limite configurado)"""
         try:
             logger.info(f"Iniciando processamento em lote de {len(arquivos)} arquivos")
 
@@ -279,83 +290,62 @@ class RelatorioUI:
             # Configurar barra de progresso
             total_arquivos = len(arquivos)
             progress_bar['maximum'] = total_arquivos
-            
-            # Processar cada arquivo
-            for i, arquivo in enumerate(arquivos, 1):
-                try:
-                    arquivo_nome = os.path.basename(arquivo)
-                    progress_label.config(text=f"Processando: {arquivo_nome}")
-                    progress_bar['value'] = i
-                    
-                    wb = load_workbook(arquivo, data_only=True)
-                    try:
-                        ws_resumo = wb['RESUMO']
-                        nome_cliente = ws_resumo['A3'].value
-                        logger.debug(f"Cliente: {nome_cliente}")
-                        
-                        data_rel = datetime.strptime(self.data_selecionada.get(), '%d/%m/%Y')
-                        
-                        # Carregar dados usando handler
-                        df = self.handler.carregar_dados_excel(arquivo)
-                        df_filtrado, df_diaria, df_tp_desp_1, df_tp_desp_2 = self.handler.processar_dados(df, data_rel)
-                        
-                        # Processar lançamentos futuros
-                        df_futuro = None
-                        if self.incluir_futuros.get():
-                            df_futuro = self.handler.processar_lancamentos_futuros(df, data_rel)
-                        
-                        # Obter número do relatório e valor acumulado
-                        numero_relatorio = self.handler.obter_numero_relatorio(ws_resumo, data_rel)
-                        valor_acumulado = self.handler.calcular_acumulado_dados(df, data_rel)
-                        
-                        logger.info(f"Arquivo: {arquivo_nome}")
-                        logger.info(f"Número do relatório: {numero_relatorio}")
-                        logger.info(f"Valor acumulado calculado: {valor_acumulado:,.2f}")
-                        
-                        dados_completos = {
-                            'df_filtrado': df_filtrado,
-                            'df_diaria': df_diaria,
-                            'df_tp_desp_1': df_tp_desp_1,
-                            'df_tp_desp_2': df_tp_desp_2,
-                            'df_futuro': df_futuro,
-                            'df_original': df,
-                            'incluir_futuros': self.incluir_futuros.get(),
-                            'data_relatorio': data_rel,
-                            'nome_cliente': nome_cliente,
-                            'endereco_cliente': ws_resumo['A4'].value,
-                            'numero_relatorio': numero_relatorio,
-                            'acumulado': valor_acumulado
-                        }
-                        
-                        # Gerar nome do arquivo
-                        data_formatada = data_rel.strftime('%d-%m-%Y')
-                        nome_arquivo = f"REL - {nome_cliente} - {data_formatada}.pdf"
-                        caminho_output = os.path.join(os.path.dirname(arquivo), nome_arquivo)
-                        
-                        # Gerar relatório
-                        self.handler.gerar_relatorio_pdf(dados_completos, caminho_output, arquivo)
-                        
-                        lista_processados.insert(tk.END, f"✓ {arquivo_nome} - Concluído")
-                        lista_processados.see(tk.END)
-                        
-                    finally:
-                        wb.close()
-
-                except Exception as e:
-                    logger.error(f"Erro ao processar arquivo {arquivo_nome}: {str(e)}", exc_info=True)
-                    lista_processados.insert(tk.END, f"✗ {arquivo_nome} - Erro: {str(e)}")
 
-                # Atualizar interface
-                progress_window.update()
+            data_rel = datetime.strptime(self.data_selecionada.get(), '%d/%m/%Y')
+            try:
+                processos = self.processos_lote.get()
+            except tk.TclError:  # campo vazio ou não numérico: um processo por núcleo
+                processos = None
+            lote = LoteRelatorios(arquivos, data_rel, self.incluir_futuros.get(),
+                                  max_workers=processos if processos and processos > 0 else None,
+                                  somente_alterados=self.apenas_alterados.get())
+            progress_label.config(text=f"Processando {total_arquivos} arquivos em {lote.max_workers} processos...")
+
+            # Os resultados chegam pelas threads do pool e são exibidos na thread do Tk
+            fila = queue.Queue()
+            lote.iniciar(fila.put)
+
+            def atualizar_progresso():
+                if not progress_window.winfo_exists():
+                    lote.cancelar()
+                    return
+
+                # Contagem lida antes de esvaziar a fila (o callback enfileira antes de contar)
+                concluidos = lote.concluidos
+                while True:
+                    try:
+                        resultado = fila.get_nowait()
+                    except queue.Empty:
+                        break
+                    if resultado.ignorado:
+                        lista_processados.insert(tk.END, f"= {resultado.nome_arquivo} - Sem alterações")
+                    elif resultado.sucesso:
+                        lista_processados.insert(
+                            tk.END, f"✓ {resultado.nome_arquivo} - Concluído ({resultado.segundos:.1f}s)")
+                    else:
+                        lista_processados.insert(tk.END, f"✗ {resultado.nome_arquivo} - Erro: {resultado.erro}")
+                    lista_processados.see(tk.END)
+
+                progress_bar['value'] = concluidos
+                if concluidos < total_arquivos:
+                    progress_window.after(100, atualizar_progresso)
+                    return
+
+                # Finalização
+                tempo_total = time.perf_counter() - lote.inicio
+                ignorados = sum(1 for r in lote.relatorios() if r.ignorado)
+                logger.info(f"Lote concluído: {total_arquivos} arquivos em {tempo_total:.1f}s "
+                            f"({lote.max_workers} processos, {ignorados} sem alterações)")
+                progress_label.config(
+                    text=f"Processamento concluído em {tempo_total:.1f}s! ({ignorados} sem alterações)")
+                ttk.Button(
+                    progress_window,
+                    text="Fechar",
+                    command=lambda: self.criar_dialog_relatorio_gerado(None, None) or progress_window.destroy()
+                ).pack(pady=10)
+
+            progress_window.after(100, atualizar_progresso)
 
-            # Finalização
-            progress_label.config(text="Processamento concluído!")
-            ttk.Button(
-                progress_window, 
-                text="Fechar", 
-                command=lambda: self.criar_dialog_relatorio_gerado(None, None) or progress_window.destroy()
-            ).pack(pady=10)
-            
         except Exception as e:
             logger.error(f"Erro no processamento em lote: {str(e)}", exc_info=True)
             raise
@@ -418,6 +408,9 @@ class RelatorioUI:
         """
         frame_pendentes = ttk.LabelFrame(self.root, text="Relatório de Lançamentos Pendentes")
         frame_pendentes.pack(pady=10, padx=20, fill='x')
+
+        pendentes_sob_demanda = BooleanVar(self.root, value=False)
+        pendentes_exportar = BooleanVar(self.root, value=False)
         
         def selecionar_pasta():
             try:
@@ -438,7 +431,9 @@ class RelatorioUI:
                     relatorio = RelatorioLancamentosPendentes()
                     
                     # Gerar relatório passando a data de referência
-                    if relatorio.gerar_relatorio_pendentes(pasta, arquivo_saida, data_ref):
+                    if relatorio.gerar_relatorio_pendentes(pasta, arquivo_saida, data_ref,
+                                                           sob_demanda=pendentes_sob_demanda.get(),
+                                                           exportar=pendentes_exportar.get()):
                         messagebox.showinfo(
                             "Sucesso",
                             f"Relatório gerado com sucesso!\nSalvo em: {arquivo_saida}"
@@ -462,52 +457,40 @@ class RelatorioUI:
             text="Gerar Relatório de Lançamentos Pendentes",
             command=selecionar_pasta
         ).pack(pady=5, fill='x')  
+        ttk.Checkbutton(frame_pendentes, text="Abrir clientes sob demanda (relatórios grandes)",
+                        variable=pendentes_sob_demanda).pack(anchor='w')
+        ttk.Checkbutton(frame_pendentes, text="Exportar também CSV e JSON",
+                        variable=pendentes_exportar).pack(anchor='w')
 
         
 
 class RelatorioConfig:
-    """Classe para gerenciar configurações e estilos do relatório"""
+    """
+    Classe para gerenciar configurações e estilos do relatório
+
+    Os estilos vêm do cache do módulo estilos_relatorio (criados uma vez por
+    processo e compartilhados entre handlers e relatórios).
+    """
     def __init__(self):
-        self.styles = getSampleStyleSheet()
+        self.styles = ESTILOS.styles
         self.setup_custom_styles()
         
     def setup_custom_styles(self):
-        """Configura os estilos personalizados para o relatório"""
-        self.style_heading = ParagraphStyle(
-            'HeadingStyle',
-            parent=self.styles['Heading1'],
-            fontSize=12,
-            leading=14,
-            alignment=TA_LEFT,
-            leftIndent=0,
-            textColor=colors.black,
-            spaceBefore=20,
-            spaceAfter=12
-        )
-        
-        self.style_normal = ParagraphStyle(
-            'NormalStyle',
-            parent=self.styles['Normal'],
-            fontSize=10,
-            leading=12,
-            textColor=colors.black,
-            spaceBefore=12,
-            spaceAfter=6
-        )
-        
-        self.style_despesa = ParagraphStyle(
-            name='TipoDespesa',
-            parent=self.styles['Normal'],
-            fontSize=12,
-            leading=14,
-            alignment=TA_LEFT,
-            leftIndent=0,
-            firstLineIndent=0,
-            rightIndent=0,
-            spaceBefore=12,
-            spaceAfter=6,
-            keepWithNext=True
-        )
+        """Associa os estilos personalizados compartilhados"""
+        self.style_heading = ESTILOS.heading
+        self.style_normal = ESTILOS.normal
+        self.style_despesa = ESTILOS.despesa
+        self.style_periodo = ESTILOS.periodo
+        self.style_subtotal_periodo = ESTILOS.subtotal_periodo
+        self.style_cabecalho_tabela = ESTILOS.cabecalho_tabela
+        self.style_celula_tabela = ESTILOS.celula_tabela
+        self.style_cabecalho_empresa = ESTILOS.cabecalho_empresa
+        self.style_subtitulo_taxas = ESTILOS.subtitulo_taxas
+        self.style_administrador = ESTILOS.administrador
+        self.style_cpf_cnpj = ESTILOS.cpf_cnpj
+        self.style_contrato = ESTILOS.contrato
+        self.style_subtotal_administrador = ESTILOS.subtotal_administrador
+        self.style_total_taxas = ESTILOS.total_taxas
 
 
 
@@ -599,6 +582,69 @@ class IndentedFlowable:
         return getattr(self.flowable, name)
 
 
+class TabelaEmBlocos(Flowable):
+    """
+    Tabela longa montada página a página
+
+    Em vez de uma única Table com todas as linhas (cujas células existiriam
+    todas em memória e seriam medidas de novo a cada quebra de página), cada
+    página recebe uma LongTable, com o cabeçalho, montada só com as linhas que
+    cabem nela; as demais seguem em outra TabelaEmBlocos.
+    """
+    def __init__(self, montar_tabela, total_linhas, largura, inicio=0):
+        Flowable.__init__(self)
+        self.montar_tabela = montar_tabela  # montar_tabela(inicio, fim) -> LongTable das linhas [inicio, fim)
+        self.total_linhas = total_linhas
+        self.largura = largura
+        self.inicio = inicio
+
+    def wrap(self, availWidth, availHeight):
+        """
+        Altura real das primeiras linhas: o bloco cresce até passar do espaço
+        disponível (limitado à altura da página, já que o keepWithNext do título
+        anterior mede a tabela sem limite) ou até incluir todas as linhas
+        restantes. No primeiro caso a altura excede o espaço e força a divisão
+        (split), onde os blocos são montados; no segundo a tabela é desenhada.
+        """
+        limite = min(availHeight, self.canv._pagesize[1])
+        linhas = LINHAS_POR_BLOCO
+        while True:
+            fim = min(self.inicio + linhas, self.total_linhas)
+            self._tabela = self.montar_tabela(self.inicio, fim)
+            largura, altura = self._tabela.wrapOn(self.canv, availWidth, availHeight)
+            if altura > limite or fim == self.total_linhas:
+                break
+            linhas *= 2
+        if fim < self.total_linhas:
+            self._tabela = None
+            return (self.largura, altura)
+        self.hAlign = self._tabela.hAlign  # desenhada como a própria tabela
+        return (largura, altura)
+
+    def split(self, availWidth, availHeight):
+        """Monta a LongTable com as linhas que cabem no espaço disponível e a continuação"""
+        linhas = LINHAS_POR_BLOCO
+        while True:
+            fim = min(self.inicio + linhas, self.total_linhas)
+            tabela = self.montar_tabela(self.inicio, fim)
+            partes = tabela.splitOn(self.canv, availWidth, availHeight)
+            if len(partes) != 1 or fim == self.total_linhas:
+                break
+            linhas *= 2  # o bloco inteiro coube: tentar com mais linhas
+
+        if not partes:
+            return []  # nenhuma linha cabe aqui: continua na próxima página
+        if len(partes) == 1:
+            return [tabela]
+        # Linhas de dados da primeira parte (sem o cabeçalho)
+        return [partes[0], TabelaEmBlocos(self.montar_tabela, self.total_linhas, self.largura,
+                                          self.inicio + partes[0]._nrows - 1)]
+
+    def draw(self):
+        # Só chamado quando wrap montou todas as linhas restantes
+        self._tabela.drawOn(self.canv, 0, 0)
+
+
 
 
 class RelatorioHandler:
@@ -621,19 +667,22 @@ class RelatorioHandler:
             self.logo_path = None
             print("Aviso: Logomarca não encontrada na pasta do script.")
         
-        self.tipos_despesas_futuras = {
-            "Próximos 30 dias": lambda x: x <= self.data_ref + pd.Timedelta(days=30),
-            "31 a 60 dias": lambda x: (x > self.data_ref + pd.Timedelta(days=30)) & 
-                                     (x <= self.data_ref + pd.Timedelta(days=60)),
-            "Após 60 dias": lambda x: x > self.data_ref + pd.Timedelta(days=60)
+        # Períodos dos lançamentos futuros: limite (em dias após a data do relatório, inclusive)
+        self.periodos_futuros = {
+            "Próximos 30 dias": 30,
+            "31 a 60 dias": 60,
+            "Após 60 dias": np.inf
         }
         self.data_ref = None
+        self.relatorios_ignorados = []  # PDFs inalterados na última geração (somente_alterados)
+        self.limite_tabela_longa = LIMITE_TABELA_LONGA
 
 
        
         
     def selecionar_arquivo(self):
         """Interface para seleção do arquivo Excel"""
+        _importar_interface()
         root = Tk()
         root.withdraw()
         arquivo = filedialog.askopenfilename(
@@ -642,6 +691,156 @@ class RelatorioHandler:
         )
         return arquivo
 
+    def gerar_relatorio_cliente(self, arquivo_excel, data_rel, incluir_futuros=True, somente_alterados=False):
+        """
+        Gera o relatório PDF de um cliente abrindo a planilha uma única vez.
+
+        Parameters:
+        -----------
+        arquivo_excel : str
+            Caminho do arquivo Excel do cliente
+        data_rel : datetime
+            Data do relatório
+        incluir_futuros : bool
+            Se os lançamentos futuros devem ser incluídos
+        somente_alterados : bool
+            Não gerar o PDF se os dados do relatório não mudaram (ver
+            gerar_relatorios_cliente)
+
+        Returns:
+        --------
+        tuple
+            (nome_cliente, caminho_output)
+        """
+        return self.gerar_relatorios_cliente(arquivo_excel, [data_rel], incluir_futuros, somente_alterados)[0]
+
+    def gerar_relatorios_cliente(self, arquivo_excel, datas_rel, incluir_futuros=True, somente_alterados=False):
+        """
+        Gera os relatórios PDF de um cliente para várias datas (ex.: reemissão
+        de quinzenas anteriores) com uma única carga da planilha.
+
+        A aba Dados é lida e normalizada uma vez; as linhas de cada data saem
+        de um índice por DATA_REL montado antes do laço. A série acumulada e
+        as taxas de administração também são lidas uma única vez.
+
+        Cada relatório gerado é registrado no manifesto do cliente
+        (manifesto_relatorios). Com somente_alterados=True, o relatório cuja
+        assinatura não mudou desde a última geração não é gerado de novo; os
+        caminhos desses PDFs ficam em self.relatorios_ignorados.
+
+        Parameters:
+        -----------
+        arquivo_excel : str
+            Caminho do arquivo Excel do cliente
+        datas_rel : list of datetime
+            Datas dos relatórios
+        incluir_futuros : bool
+            Se os lançamentos futuros devem ser incluídos
+        somente_alterados : bool
+            Pular os relatórios com a assinatura registrada no manifesto
+
+        Returns:
+        --------
+        list of tuple
+            (nome_cliente, caminho_output) de cada data, na ordem de datas_rel
+        """
+        inicio = time.perf_counter()
+        resultados = []
+        self.relatorios_ignorados = []
+        manifesto = ManifestoRelatorios(arquivo_excel)
+
+        with SessaoPlanilha(arquivo_excel) as sessao:
+            # Carregar dados, série acumulada e taxas uma única vez
+            df = self.carregar_dados_excel(arquivo_excel, sessao=sessao)
+            ordem, datas_ordenadas = self.indexar_datas(df)
+            serie = sessao.serie_acumulada()
+            df_taxas = self.carregar_taxas_administracao(arquivo_excel, sessao=sessao)
+
+            ws_resumo = sessao.ws_resumo
+            nome_cliente = sessao.nome_cliente
+            endereco_cliente = sessao.endereco_cliente
+
+            for data_rel in datas_rel:
+                # Linhas da data (em ordem original) e linhas posteriores a ela
+                data_busca = pd.Timestamp(data_rel).to_datetime64()
+                primeira = np.searchsorted(datas_ordenadas, data_busca, side='left')
+                ultima = np.searchsorted(datas_ordenadas, data_busca, side='right')
+
+                linhas_data = df.iloc[ordem[primeira:ultima]]
+                df_filtrado, df_diaria, df_tp_desp_1, df_tp_desp_2 = self.processar_dados(linhas_data, data_rel)
+
+                # Processar lançamentos futuros
+                df_futuro = None
+                if incluir_futuros:
+                    df_futuro = self.processar_lancamentos_futuros(
+                        df.iloc[np.sort(ordem[ultima:])], data_rel)
+
+                # Obter número do relatório e valor acumulado
+                numero_relatorio = self.obter_numero_relatorio(ws_resumo, data_rel)
+                valor_acumulado = self.calcular_acumulado_dados(df, data_rel, serie=serie)
+
+                logger.info(f"Arquivo: {os.path.basename(arquivo_excel)}")
+                logger.info(f"Número do relatório: {numero_relatorio}")
+                logger.info(f"Valor acumulado calculado: {valor_acumulado:,.2f}")
+
+                dados_completos = {
+                    'df_filtrado': df_filtrado,
+                    'df_diaria': df_diaria,
+                    'df_tp_desp_1': df_tp_desp_1,
+                    'df_tp_desp_2': df_tp_desp_2,
+                    'df_futuro': df_futuro,
+                    'df_original': df,
+                    'incluir_futuros': incluir_futuros,
+                    'data_relatorio': data_rel,
+                    'nome_cliente': nome_cliente,
+                    'endereco_cliente': endereco_cliente,
+                    'numero_relatorio': numero_relatorio,
+                    'acumulado': valor_acumulado  # Valor direto, sem conversão
+                }
+
+                # Gerar nome do arquivo
+                data_formatada = data_rel.strftime('%d-%m-%Y')
+                nome_arquivo = f"REL - {nome_cliente} - {data_formatada}.pdf"
+                caminho_output = os.path.join(os.path.dirname(arquivo_excel), nome_arquivo)
+
+                # Comparar com a última geração registrada no manifesto
+                taxas_pendentes = self.processar_taxas_pendentes(df_taxas, data_rel)
+                assinatura = assinatura_relatorio(
+                    linhas_data, df_futuro, valor_acumulado, taxas_pendentes,
+                    {'nome_cliente': nome_cliente, 'endereco_cliente': endereco_cliente,
+                     'numero_relatorio': numero_relatorio},
+                    VERSAO_MODELO_RELATORIO)
+                resultados.append((nome_cliente, caminho_output))
+                if somente_alterados and manifesto.inalterado(data_rel, assinatura, caminho_output):
+                    logger.info(f"Relatório inalterado, não gerado novamente: {nome_arquivo}")
+                    self.relatorios_ignorados.append(caminho_output)
+                    continue
+
+                # Gerar o PDF com os dados completos
+                self.gerar_relatorio_pdf(dados_completos, caminho_output, arquivo_excel,
+                                         sessao=sessao, df_taxas=df_taxas, taxas_pendentes=taxas_pendentes)
+                manifesto.registrar(data_rel, assinatura, caminho_output)
+                manifesto.salvar()
+
+        logger.info(f"{len(resultados) - len(self.relatorios_ignorados)} relatório(s) de {nome_cliente} "
+                    f"gerado(s) e {len(self.relatorios_ignorados)} inalterado(s) "
+                    f"em {time.perf_counter() - inicio:.2f}s")
+        return resultados
+
+    def indexar_datas(self, df):
+        """
+        Índice das linhas por DATA_REL para recortar várias datas de um mesmo df
+
+        Returns:
+            tuple (ordem, datas): posições das linhas com DATA_REL preenchida,
+            ordenadas por data (estável: mantém a ordem da aba entre linhas da
+            mesma data), e as datas correspondentes, para busca binária
+        """
+        datas = df['DATA_REL'].to_numpy()
+        validas = np.flatnonzero(~np.isnat(datas))
+        ordem = validas[np.argsort(datas[validas], kind='stable')]
+        return ordem, datas[ordem]
+
     def obter_numero_relatorio(self, ws_resumo, data_relatorio):
         """
         Método para obter o número do relatório baseado na data.
@@ -653,12 +852,12 @@ class RelatorioHandler:
             data_ref = pd.to_datetime(data_relatorio).date()
             logger.debug(f"Data de referência processada: {data_ref}")
             
-            # Encontrar primeira data na planilha
+            # Encontrar primeira data na planilha (coluna A, linhas 9 a 149)
             primeira_data = None
             primeira_linha = None
             
-            for row in range(9, 150):  # Buscar nas primeiras 150 linhas
-                cell_value = ws_resumo.cell(row=row, column=1).value
+            linhas = ws_resumo.iter_rows(min_row=9, max_row=149, max_col=1, values_only=True)
+            for row, (cell_value,) in enumerate(linhas, start=9):
                 if isinstance(cell_value, (datetime, date)):
                     primeira_data = cell_value.date() if isinstance(cell_value, datetime) else cell_value
                     primeira_linha = row
@@ -670,48 +869,37 @@ class RelatorioHandler:
                 
             logger.debug(f"Primeira data encontrada: {primeira_data} na linha {primeira_linha}")
             
-            # Usar a primeira data encontrada como data inicial
-            data_inicial = primeira_data
-            logger.debug(f"Data inicial: {data_inicial}")
+            if data_ref < primeira_data:
+                logger.warning(f"Data {data_ref} anterior à primeira data da planilha ({primeira_data})")
+                return 1
             
-            # Calcular número do relatório
-            numero = 1
-            data_atual = data_inicial
+            # Distância em quinzenas desde a primeira data (a primeira é o relatório 1)
+            numero = quinzena.numero_relatorio(primeira_data, data_ref)
             
-            while data_atual <= data_ref:
-                logger.debug(f"Verificando data: {data_atual}")
-                
-                if data_atual == data_ref:
-                    logger.info(f"Número do relatório calculado: {numero}")
-                    return numero
-                    
-                # Avançar para próxima data (5 ou 20 do mês)
-                if data_atual.day == 5:
-                    data_atual = data_atual.replace(day=20)
-                else:  # day == 20
-                    if data_atual.month == 12:
-                        data_atual = data_atual.replace(year=data_atual.year + 1, month=1, day=5)
-                    else:
-                        data_atual = data_atual.replace(month=data_atual.month + 1, day=5)
+            if not quinzena.eh_data_quinzena(data_ref):
+                # Fora da sequência: número da próxima data de relatório
                 numero += 1
-                
-            logger.warning(f"Data {data_ref} não encontrada na sequência. Último número calculado: {numero}")
+                logger.warning(f"Data {data_ref} não encontrada na sequência. Último número calculado: {numero}")
+                return numero
+            
+            logger.info(f"Número do relatório calculado: {numero}")
             return numero
             
         except Exception as e:
             logger.error(f"Erro ao obter número do relatório: {str(e)}", exc_info=True)
             return 1
 
-    def calcular_acumulado_dados(self, df, data_relatorio):
+    def calcular_acumulado_dados(self, df, data_relatorio, serie=None):
         """
         Calcula o valor acumulado somando todos os valores da aba 'Dados' 
         com DATA_REL anterior à data do relatório.
+        
+        Se a série acumulada da planilha (SessaoPlanilha.serie_acumulada) for
+        informada, o valor é obtido por busca binária, sem percorrer o df.
         """
         try:
             logger.info(f"Calculando acumulado para data {data_relatorio}")
             
-            # Criar cópia do DataFrame e garantir que estamos usando a coluna correta
-            df = df.copy()
             if 'VALOR' not in df.columns:
                 logger.error("Coluna 'VALOR' não encontrada no DataFrame")
                 return 0.0
@@ -724,35 +912,24 @@ class RelatorioHandler:
                 
             logger.debug(f"Data de referência processada: {data_relatorio}")
             
-            # Converter DATA_REL para datetime
-            df['DATA_REL'] = pd.to_datetime(df['DATA_REL'], errors='coerce')
-            df = df.dropna(subset=['DATA_REL'])
+            if serie is not None:
+                valor_acumulado = acumulado_ate(serie, data_relatorio)
+                logger.info(f"Valor acumulado calculado: {valor_acumulado:,.2f}")
+                return valor_acumulado
             
-            # Filtrar registros anteriores à data do relatório
-            df_anterior = df[df['DATA_REL'] < data_relatorio].copy()
+            # DATA_REL (datetime64, NaT fora das datas) e VALOR (float, NaN nos
+            # valores inválidos) já vêm tipados de carregar_dados_excel
+            anteriores = df['DATA_REL'] < data_relatorio
             
-            if df_anterior.empty:
+            if not anteriores.any():
                 logger.warning("Nenhum registro anterior encontrado")
                 return 0.0
                 
-            # Converter valores para numérico
-            logger.debug("Processando valores...")
-            df_anterior['VALOR_NUMERICO'] = df_anterior['VALOR'].replace({',': '.', 'R$': '', ' ': ''}, regex=True)
-            df_anterior['VALOR_NUMERICO'] = pd.to_numeric(df_anterior['VALOR_NUMERICO'], errors='coerce').fillna(0)
-            
-            # Log para debug
-            logger.debug("\nPrimeiros 5 valores processados:")
-            for idx, row in df_anterior.head().iterrows():
-                logger.debug(f"Linha {idx}:")
-                logger.debug(f"  Data: {row['DATA_REL']}")
-                logger.debug(f"  Valor original: {row['VALOR']}")
-                logger.debug(f"  Valor convertido: {row['VALOR_NUMERICO']}")
-                
-            # Calcular soma
-            valor_acumulado = float(df_anterior['VALOR_NUMERICO'].sum())
+            # Calcular soma (valores inválidos contam como zero)
+            valor_acumulado = float(df.loc[anteriores, 'VALOR'].sum())
             
             logger.info(f"Valor acumulado calculado: {valor_acumulado:,.2f}")
-            logger.debug(f"Total de registros considerados: {len(df_anterior)}")
+            logger.debug(f"Total de registros considerados: {int(anteriores.sum())}")
             
             return valor_acumulado
                 
@@ -851,25 +1028,25 @@ class RelatorioHandler:
 ##            print("=== FIM OBTER ACUMULADO ===\n")
  
     
-    def carregar_dados_excel(self, arquivo_excel):
+    def carregar_dados_excel(self, arquivo_excel, sessao=None):
         try:
-            df = pd.read_excel(arquivo_excel, sheet_name='Dados')
-            df = df.fillna("")
+            if sessao is not None:
+                df = sessao.dados()
+            else:
+                df = carregar_dados_cliente(arquivo_excel)
             
             # Verificar colunas necessárias
             colunas_necessarias = {'DATA_REL', 'TP_DESP', 'REFERÊNCIA', 'DT_VENCTO', 'VALOR', 'NF'}
             if not colunas_necessarias.issubset(df.columns):
                 raise ValueError(f"Colunas necessárias ausentes: {colunas_necessarias - set(df.columns)}")
             
-            # Converter NF para string antes de processar
-            df['NF'] = df['NF'].astype(str)
+            # Datas, valores, categorias e textos tipados uma única vez (ESQUEMA_DADOS)
+            df = normalizar_dados(df)
             
             # Concatenar NF com REFERÊNCIA apenas para TP_DESP != 1
-            mascara = (df['TP_DESP'] != 1) & (df['NF'].notna()) & (df['NF'].str.strip() != '') & (df['NF'] != 'nan')
-            df.loc[mascara, 'REFERÊNCIA'] = df[mascara].apply(
-                lambda row: f"{row['REFERÊNCIA']} (NF: {row['NF'].strip()})", 
-                axis=1
-            )
+            nf = df['NF'].str.strip()
+            mascara = (df['TP_DESP'] != 1) & ~nf.isin(['', 'nan'])
+            df.loc[mascara, 'REFERÊNCIA'] = df.loc[mascara, 'REFERÊNCIA'].str.cat(nf[mascara], sep=' (NF: ') + ')'
             
             
             return df
@@ -889,46 +1066,21 @@ class RelatorioHandler:
             # Se falhar, tenta converter assumindo formato brasileiro
             data_rel = pd.to_datetime(data_relatorio, format='%d/%m/%Y')
         
-        # Criar cópia do DataFrame para não modificar o original
-        df = df.copy()
-        
-        # Converter corretamente a coluna DT_VENCTO para datetime para ordenação
-        if 'DT_VENCTO' in df.columns:
-            # Criar coluna para ordenação com tratamento de formato misto
-            try:
-                # Converter de forma segura para datetime usando format='mixed'
-                df['DT_VENCTO_SORT'] = pd.to_datetime(df['DT_VENCTO'], 
-                                                    format='mixed', 
-                                                    errors='coerce', 
-                                                    dayfirst=True)
-                
-                # Garantir formato uniforme para exibição usando formato datetime
-                df['DT_VENCTO_DISPLAY'] = df['DT_VENCTO_SORT'].dt.strftime('%d/%m/%Y')
-                
-                # Manter valores originais para não causar problemas em outros lugares
-                # mas usar as colunas auxiliares para ordenação e exibição
-            except Exception as e:
-                print(f"Erro ao converter DT_VENCTO: {str(e)}")
-                # Em caso de falha, manter a coluna original
-                df['DT_VENCTO_SORT'] = pd.to_datetime('2000-01-01')  # Valor padrão para ordenação
-                df['DT_VENCTO_DISPLAY'] = df['DT_VENCTO']  # Usar o original para exibição
-        
-        # Aplicar a restrição de dados bancários para tp_desp 3 e 5
-        # Criar uma cópia da coluna original para preservar os dados originais
-        if 'DADOS_BANCARIOS' in df.columns:
-            df['DADOS_BANCARIOS_ORIGINAL'] = df['DADOS_BANCARIOS']
-            # Limpar dados bancários para tp_desp 3 e 5
-            df.loc[df['TP_DESP'].isin([3, 5]), 'DADOS_BANCARIOS'] = ''
-
-        # Filtrar dados
+        # df vem de carregar_dados_excel (DATA_REL/DT_VENCTO datetime64, TP_DESP
+        # categórico, VALOR float): as datas são formatadas apenas na tabela do PDF
         df_filtrado = df[
             (df['DATA_REL'] == data_rel) & 
             (df['TP_DESP'] != 1)
         ].sort_values(
-            by=['TP_DESP', 'DT_VENCTO_SORT', 'VALOR'], 
+            by=['TP_DESP', 'DT_VENCTO', 'VALOR'], 
             ascending=[True, True, False]  # True para ordenar vencimento do mais antigo
         )
         
+        # Aplicar a restrição de dados bancários para tp_desp 3 e 5
+        if 'DADOS_BANCARIOS' in df_filtrado.columns:
+            df_filtrado = df_filtrado.assign(DADOS_BANCARIOS=df_filtrado['DADOS_BANCARIOS'].mask(
+                df_filtrado['TP_DESP'].isin([3, 5]), ''))
+        
         df_diaria = df[
             (df['DATA_REL'] == data_rel) & 
             (df['TP_DESP'] == 1) & 
@@ -950,14 +1102,6 @@ class RelatorioHandler:
             (df['REFERÊNCIA'].isin(['FÉRIAS', 'RESCISÃO', '13º SALÁRIO']))
         ]
         
-        # Substituir DT_VENCTO pela versão formatada uniformemente antes de retornar
-        if 'DT_VENCTO_DISPLAY' in df_filtrado.columns:
-            df_filtrado['DT_VENCTO'] = df_filtrado['DT_VENCTO_DISPLAY']
-            
-        # Remover as colunas temporárias
-        if 'DT_VENCTO_SORT' in df_filtrado.columns:
-            df_filtrado = df_filtrado.drop(columns=['DT_VENCTO_SORT', 'DT_VENCTO_DISPLAY'])
-        
         return df_filtrado, df_diaria, df_tp_desp_1, df_tp_desp_2
 
     def processar_lancamentos_futuros(self, df, data_relatorio):
@@ -969,28 +1113,19 @@ class RelatorioHandler:
             # Se falhar, tenta converter assumindo formato brasileiro
             self.data_ref = pd.to_datetime(data_relatorio, format='%d/%m/%Y')
 
-        # Converter a coluna DATA_REL para datetime
-        df = df.copy()
-        df['DATA_REL'] = pd.to_datetime(df['DATA_REL'])
-        df['DT_VENCTO'] = pd.to_datetime(df['DT_VENCTO'], format='%d/%m/%Y', errors='coerce')
-        
-        # Formatar a data de vencimento para DD/MM/AAAA
-        df['DT_VENCTO'] = df['DT_VENCTO'].dt.strftime('%d/%m/%Y')
-
-        # Filtrar apenas lançamentos futuros baseado em DATA_REL
-        df_futuro = df[(df['DATA_REL'] > self.data_ref) & (df['TP_DESP'] != 1)].copy()
+        # Filtrar apenas lançamentos futuros baseado em DATA_REL (já em datetime64)
+        df_futuro = df[(df['DATA_REL'] > self.data_ref) & (df['TP_DESP'] != 1)]
 
         # Ordenar por data de vencimento
         df_futuro = df_futuro.sort_values('DT_VENCTO')
 
-        # Agrupar por período baseado na DATA_REL
-        df_futuro['periodo'] = df_futuro['DATA_REL'].apply(
-            lambda x: next(
-                (nome for nome, func in self.tipos_despesas_futuras.items() 
-                 if func(x)),
-                "Após 60 dias"
-            )
-        )
+        # Agrupar por período baseado na DATA_REL (dias após a data do relatório)
+        dias = (df_futuro['DATA_REL'] - self.data_ref) / pd.Timedelta(days=1)
+        df_futuro = df_futuro.assign(periodo=pd.cut(
+            dias,
+            bins=[-np.inf, *self.periodos_futuros.values()],
+            labels=list(self.periodos_futuros)
+        ))
 
         return df_futuro
     
@@ -1003,22 +1138,14 @@ class RelatorioHandler:
             total_geral_futuro = 0
             
             # Agrupar por período e tipo de despesa
-            for periodo in ["Próximos 30 dias", "31 a 60 dias", "Após 60 dias"]:
+            for periodo in self.periodos_futuros:
                 df_periodo = dados['df_futuro'][dados['df_futuro']['periodo'] == periodo]
                 
                 if not df_periodo.empty:
                     # Adicionar título do período com estilo destacado
                     elementos.append(Paragraph(
                         f"\n{periodo}",
-                        ParagraphStyle(
-                            'PeriodoStyle',
-                            parent=self.config.style_heading,
-                            fontSize=14,
-                            leading=16,
-                            spaceBefore=12,
-                            spaceAfter=6,
-                            textColor=colors.HexColor('#2F4F4F')  # Cor mais escura para destaque
-                        )
+                        self.config.style_periodo
                     ))
                     
                     total_periodo = 0
@@ -1051,15 +1178,7 @@ class RelatorioHandler:
                     # Adicionar subtotal do período
                     elementos.append(Paragraph(
                         f"Subtotal {periodo}: {self.formatar_numero(total_periodo)}",
-                        ParagraphStyle(
-                            'SubtotalStyle',
-                            parent=self.config.style_normal,
-                            fontSize=10,
-                            leading=12,
-                            spaceBefore=6,
-                            spaceAfter=12,
-                            textColor=colors.HexColor('#4A4A4A')
-                        )
+                        self.config.style_subtotal_periodo
                     ))
                     
                     total_geral_futuro += total_periodo
@@ -1105,58 +1224,24 @@ class RelatorioHandler:
     def consolidar_despesas_colaboradores(self, df):
         """Consolida as despesas dos colaboradores"""
         try:
-            # Criar cópia e tratar valores nulos
-            df = df.copy()
-            df = df.fillna("")
-            df = df.infer_objects(copy=False)
-                
-            agregacoes = {
-                'SALÁRIO': ['SALÁRIO'],
-                'TRANSPORTE': ['TRANSPORTE'],
-                'CAFÉ': ['CAFÉ']
-            }
-                
-            if 'DADOS_BANCARIOS' in df.columns:
-                df = df.rename(columns={'DADOS_BANCARIOS': 'DADOS BANCÁRIOS'})
-                
-            resultados = []
-            total_colunas = {
-                'SALÁRIO': 0.0,
-                'TRANSPORTE': 0.0,
-                'CAFÉ': 0.0
-            }
-                
-            for nome, grupo in df.groupby('NOME'):
-                linha = {'NOME': nome}
-                    
-                for coluna, referencias in agregacoes.items():
-                    valores_grupo = grupo[grupo['REFERÊNCIA'].isin(referencias)]['VALOR']
-                    valor = pd.to_numeric(valores_grupo, errors='coerce').sum()
-                    linha[coluna] = valor if not pd.isna(valor) else 0.0
-                    total_colunas[coluna] += linha[coluna]
-                        
-                # Pegar DIAS do lançamento de TRANSPORTE ou CAFÉ (o que for maior)
-                dias_transporte = grupo[grupo['REFERÊNCIA'] == 'TRANSPORTE']['DIAS'].iloc[0] if not grupo[grupo['REFERÊNCIA'] == 'TRANSPORTE'].empty else 0
-                dias_cafe = grupo[grupo['REFERÊNCIA'] == 'CAFÉ']['DIAS'].iloc[0] if not grupo[grupo['REFERÊNCIA'] == 'CAFÉ'].empty else 0
-                    
-                # Converter para inteiro e pegar o maior valor
-                dias_transporte = int(dias_transporte) if pd.notnull(dias_transporte) else 0
-                dias_cafe = int(dias_cafe) if pd.notnull(dias_cafe) else 0
-                linha['DIAS'] = max(dias_transporte, dias_cafe)
-                    
-                linha['DADOS BANCÁRIOS'] = grupo['DADOS BANCÁRIOS'].iloc[0] if not grupo['DADOS BANCÁRIOS'].empty else ''
-                linha['TOTAL'] = sum(linha.get(col, 0) for col in total_colunas.keys())
-                    
-                resultados.append(linha)
-                
-            # Criar DataFrame com os resultados
-            df_result = pd.DataFrame(resultados)
-                
-            # Definir ordem das colunas
             colunas_ordem = ['NOME', 'SALÁRIO', 'DIAS', 
                             'TRANSPORTE', 'CAFÉ', 'TOTAL', 'DADOS BANCÁRIOS']
-                
-            return df_result.reindex(columns=colunas_ordem)
+            if df.empty:
+                return pd.DataFrame(columns=colunas_ordem)
+
+            df_result = self._somar_por_colaborador(df, ['SALÁRIO', 'TRANSPORTE', 'CAFÉ'])
+
+            # DIAS do primeiro lançamento de TRANSPORTE e de CAFÉ de cada colaborador (o que for maior)
+            df_dias = df[df['REFERÊNCIA'].isin(['TRANSPORTE', 'CAFÉ'])].drop_duplicates(['NOME', 'REFERÊNCIA'])
+            df_result['DIAS'] = (
+                df_dias.pivot(index='NOME', columns='REFERÊNCIA', values='DIAS')
+                .reindex(index=df_result.index, columns=['TRANSPORTE', 'CAFÉ'])
+                .fillna(0)
+                .astype(int)
+                .max(axis=1)
+            )
+
+            return df_result.reset_index().reindex(columns=colunas_ordem)
                 
         except Exception as e:
             print(f"Erro ao consolidar despesas: {str(e)}")
@@ -1165,81 +1250,95 @@ class RelatorioHandler:
     def consolidar_despesas_colaboradores1(self, df):
         """Consolida as despesas  13º, férias e rescisão dos colaboradores"""
         try:
-            # Criar cópia e tratar valores nulos
-            df = df.copy()
-            df = df.fillna("")
-            df = df.infer_objects(copy=False)
-                
-            agregacoes1 = {
-                '13º SALÁRIO': ['13º SALÁRIO'],
-                'FÉRIAS': ['FÉRIAS'],
-                'RESCISÃO': ['RESCISÃO']
-            }
-                
-            if 'DADOS_BANCARIOS' in df.columns:
-                df = df.rename(columns={'DADOS_BANCARIOS': 'DADOS BANCÁRIOS'})
-                
-            resultados1 = []
-            total_colunas = {
-                '13º SALÁRIO': 0.0,
-                'FÉRIAS': 0.0,
-                'RESCISÃO': 0.0
-            }
-                
-            for nome, grupo in df.groupby('NOME'):
-                linha = {'NOME': nome}
-                    
-                for coluna, referencias in agregacoes1.items():
-                    valores_grupo = grupo[grupo['REFERÊNCIA'].isin(referencias)]['VALOR']
-                    valor = pd.to_numeric(valores_grupo, errors='coerce').sum()
-                    linha[coluna] = valor if not pd.isna(valor) else 0.0
-                    total_colunas[coluna] += linha[coluna]
-                        
-                    
-                linha['DADOS BANCÁRIOS'] = grupo['DADOS BANCÁRIOS'].iloc[0] if not grupo['DADOS BANCÁRIOS'].empty else ''
-                linha['TOTAL'] = sum(linha.get(col, 0) for col in total_colunas.keys())
-                    
-                resultados1.append(linha)
-                
-            # Criar DataFrame com os resultados
-            df_result1 = pd.DataFrame(resultados1)
-                
-            # Definir ordem das colunas
             colunas_ordem = ['NOME', '13º SALÁRIO', 'FÉRIAS', 
                             'RESCISÃO', 'TOTAL', 'DADOS BANCÁRIOS']
-                
-            return df_result1.reindex(columns=colunas_ordem)
+            if df.empty:
+                return pd.DataFrame(columns=colunas_ordem)
+
+            df_result1 = self._somar_por_colaborador(df, ['13º SALÁRIO', 'FÉRIAS', 'RESCISÃO'])
+            return df_result1.reset_index().reindex(columns=colunas_ordem)
                 
         except Exception as e:
             print(f"Erro ao consolidar despesas: {str(e)}")
             raise
 
-    def criar_tabela_despesas(self, dados, colunas, larguras, incluir_total=True):
-        """Cria uma tabela formatada para o relatório"""
-        dados_formatados = dados.copy()
-        dados_formatados = dados_formatados.fillna("")
-        dados_formatados = dados_formatados.infer_objects()
-
-        # Estilo para o cabeçalho com quebra de linha
-        estilo_cabecalho = ParagraphStyle(
-            'CabecalhoTabela',
-            parent=self.config.style_normal,
-            fontSize=8,
-            leading=10,
-            alignment=1,
-            textColor=colors.whitesmoke
+    def _somar_por_colaborador(self, df, referencias):
+        """
+        Uma linha por NOME (em ordem alfabética) com a soma de VALOR de cada
+        referência, o TOTAL e os DADOS BANCÁRIOS do primeiro lançamento do
+        colaborador
+        """
+        primeiros = df.drop_duplicates('NOME').set_index('NOME')
+        df_result = (
+            df.pivot_table(index='NOME', columns='REFERÊNCIA', values='VALOR', aggfunc='sum')
+            .reindex(index=primeiros.index.sort_values(), columns=referencias)
+            .fillna(0.0)
         )
+        df_result.columns.name = None
+        df_result['TOTAL'] = df_result[referencias].sum(axis=1)
+        df_result['DADOS BANCÁRIOS'] = primeiros['DADOS_BANCARIOS']
+        return df_result
 
-        # Estilo para células com quebra de texto
-        estilo_celula = ParagraphStyle(
-            'CelulaTabela',
-            parent=self.config.style_normal,
-            fontSize=8,
-            leading=10,
-            alignment=0  # Alinhamento à esquerda
-        )
+    def criar_tabela_despesas(self, dados, colunas, larguras, incluir_total=True):
+        """
+        Cria uma tabela formatada para o relatório
 
-        # Converter cabeçalhos simples em Paragraphs com quebras de linha
+        Acima de limite_tabela_longa linhas (clientes com milhares de lançamentos
+        futuros), a tabela é montada em blocos de LongTable (criar_tabela_longa).
+        """
+        if len(dados) > self.limite_tabela_longa:
+            return self.criar_tabela_longa(dados, colunas, larguras, incluir_total)
+
+        # Apenas as colunas exibidas (células vazias tratadas na formatação)
+        dados_formatados = dados[colunas]
+
+        # Adicionar quebra de texto para a coluna Referência
+        estilo_celula = self.config.style_celula_tabela
+        dados_tabela = [self._cabecalhos_tabela(colunas)]
+        dados_tabela.extend(self._linhas_tabela(dados_formatados, colunas,
+                                                lambda texto: Paragraph(texto, estilo_celula)))
+
+        # Adicionar linha de total se necessário
+        linha_total = self._linha_total(dados, colunas) if incluir_total else None
+        if linha_total is not None:
+            dados_tabela.append(linha_total)
+
+        # Criar tabela com os dados formatados
+        tabela = Table(dados_tabela, colWidths=larguras, repeatRows=1)
+        
+        # Estilo da tabela (modelo compartilhado por conjunto de colunas)
+        tabela.setStyle(estilo_tabela_despesas(tuple(colunas), incluir_total))
+        return tabela
+
+    def criar_tabela_longa(self, dados, colunas, larguras, incluir_total=True):
+        """
+        Cria a tabela de despesas de um cliente com muitos lançamentos
+
+        As células são formatadas apenas para as linhas de cada página, em uma
+        LongTable com o cabeçalho (TabelaEmBlocos). Referências que cabem na
+        coluna ficam em texto simples; Paragraph só para as que precisam quebrar.
+        """
+        dados_formatados = dados[colunas]
+        linha_total = self._linha_total(dados, colunas) if incluir_total else None
+        celula_referencia = None
+        if 'REFERÊNCIA' in colunas:
+            celula_referencia = self._celula_referencia_simples(larguras[colunas.index('REFERÊNCIA')])
+
+        def montar_tabela(inicio, fim):
+            ultimo_bloco = fim == len(dados_formatados)
+            dados_tabela = [self._cabecalhos_tabela(colunas)]
+            dados_tabela.extend(self._linhas_tabela(dados_formatados.iloc[inicio:fim], colunas, celula_referencia))
+            if ultimo_bloco and linha_total is not None:
+                dados_tabela.append(linha_total)
+            tabela = LongTable(dados_tabela, colWidths=larguras, repeatRows=1)
+            tabela.setStyle(estilo_tabela_despesas(tuple(colunas), incluir_total and ultimo_bloco))
+            return tabela
+
+        return TabelaEmBlocos(montar_tabela, len(dados_formatados), sum(larguras))
+
+    def _cabecalhos_tabela(self, colunas):
+        """Converte os cabeçalhos simples em Paragraphs com quebras de linha"""
+        estilo_cabecalho = self.config.style_cabecalho_tabela
         cabecalhos_formatados = []
         for coluna in colunas:
             if '/' in coluna:
@@ -1249,117 +1348,86 @@ class RelatorioHandler:
             else:
                 texto_formatado = Paragraph(coluna, estilo_cabecalho)
             cabecalhos_formatados.append(texto_formatado)
+        return cabecalhos_formatados
 
-        colunas_numericas = ['VALOR', 'TOTAL', 'SALÁRIO', 'RESCISÃO', '13º SALÁRIO', 
-                            'TRANSPORTE', 'CAFÉ', 'FÉRIAS', 'DIÁRIA', 'DIAS']
+    def _celula_referencia_simples(self, largura_coluna):
+        """Célula de REFERÊNCIA em texto simples quando cabe na coluna, Paragraph (com quebra) quando não"""
+        estilo_celula = self.config.style_celula_tabela
+        largura_texto = largura_coluna - 12  # padding padrão das células (6 de cada lado)
 
-        # Colunas para centralizar
-        colunas_centralizadas = ['DT_VENCTO', 'VENCIMENTO']
+        def celula(texto):
+            if ('<' in texto or '&' in texto or '\n' in texto or
+                    stringWidth(texto, estilo_celula.fontName, estilo_celula.fontSize) > largura_texto):
+                return Paragraph(texto, estilo_celula)
+            return texto
+        return celula
 
-        # Processar dados linha por linha
-        dados_tabela = [cabecalhos_formatados]
-        for _, linha in dados_formatados.iterrows():
-            linha_formatada = []
-            for i, coluna in enumerate(colunas):
-                valor = linha[coluna]
-                
-                # Formatar números
-                if coluna in colunas_numericas:
-                    valor = pd.to_numeric(valor, errors='coerce')
-                    valor = 0 if pd.isna(valor) else valor
-                    if coluna == 'DIAS':
-                        valor = str(int(valor))  # Converter para inteiro e depois string
-                    else:
-                        valor = self.formatar_numero(valor)
-                    linha_formatada.append(valor)
-                
-                # Formatar datas
-                elif coluna in ['DT_VENCTO', 'VENCIMENTO']:
-                    try:
-                        valor = pd.to_datetime(valor, dayfirst=True).strftime('%d/%m/%Y')
-                    except:
-                        valor = str(valor)
-                    linha_formatada.append(valor)
-                
-                # Adicionar quebra de texto para a coluna Referência
-                elif coluna == 'REFERÊNCIA':
-                    valor = str(valor)
-                    linha_formatada.append(Paragraph(valor, estilo_celula))
-                
-                # Tratar coluna NF
-                elif coluna == 'NF':
-                    valor = str(valor) if valor else ""
-                    linha_formatada.append(valor)
-                
+    def _linhas_tabela(self, dados, colunas, celula_referencia):
+        """
+        Formata as linhas da tabela, coluna a coluna
 
-                # Outras colunas
-                else:
-                    linha_formatada.append(str(valor))
-                    
-            dados_tabela.append(linha_formatada)
+        Args:
+            dados (pd.DataFrame): Linhas exibidas
+            colunas (list): Colunas da tabela, na ordem
+            celula_referencia (callable): Monta a célula de REFERÊNCIA a partir do texto
+        """
+        colunas_formatadas = []
+        for coluna in colunas:
+            valores = dados[coluna]
 
-        # Adicionar linha de total se necessário
-        if incluir_total:
-            coluna_valor = next((i for i, col in enumerate(colunas) 
-                            if col in ['VALOR', 'TOTAL']), -1)
-            if coluna_valor >= 0:
-                # Se for a tabela de colaboradores (verificar pelas colunas características)
-                if 'SALÁRIO' in colunas and 'TRANSPORTE' in colunas or '13º SALÁRIO' in colunas and 'FÉRIAS' in colunas:
-                    linha_total = [''] * len(colunas)
-                    linha_total[0] = 'Subtotal'
-                    
-                    # Calcular total para cada coluna numérica
-                    for i, col in enumerate(colunas):
-                        if col in ['SALÁRIO', 'FÉRIAS', 'RESCISÃO', '13º SALÁRIO', 'TRANSPORTE', 'CAFÉ', 'TOTAL']:
-                            total = dados[col].sum()
-                            linha_total[i] = self.formatar_numero(total)
-                        elif col == 'DIAS':
-                            linha_total[i] = ''  # Deixar DIAS vazio
-                            
-                    dados_tabela.append(linha_total)
-                
+            # Formatar números
+            if coluna in COLUNAS_NUMERICAS:
+                numeros = pd.to_numeric(valores, errors='coerce').fillna(0)
+                if coluna == 'DIAS':
+                    formatados = [str(int(valor)) for valor in numeros]  # Converter para inteiro e depois string
                 else:
-                    # Para outras tabelas, manter o comportamento original
-                    total = dados[colunas[coluna_valor]].sum()
-                    linha_total = [''] * len(colunas)
-                    linha_total[coluna_valor-1] = 'Subtotal'
-                    linha_total[coluna_valor] = self.formatar_numero(total)
-                    dados_tabela.append(linha_total)
+                    formatados = [self.formatar_numero(valor) for valor in numeros]
 
-        # Criar tabela com os dados formatados
-        tabela = Table(dados_tabela, colWidths=larguras, repeatRows=1)
-        
-        # Definir estilos da tabela
-        estilo_tabela = [
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 8),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('TOPPADDING', (0, 0), (-1, 0), 12),
-            ('GRID', (0, 0), (-1, -1), 1, colors.grey),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ]
+            # Formatar datas
+            elif coluna in ['DT_VENCTO', 'VENCIMENTO']:
+                formatados = [self.formatar_data(valor) for valor in valores]
 
-        # Alinhar colunas numéricas à direita
-        for i, col in enumerate(colunas):
-            if col in colunas_numericas:
-                estilo_tabela.append(('ALIGN', (i, 1), (i, -1), 'RIGHT'))
+            elif coluna == 'REFERÊNCIA':
+                formatados = [celula_referencia('' if pd.isna(valor) else str(valor)) for valor in valores]
 
-        # Alinhar colunas de data e outras centralizadas ao centro
-        for i, col in enumerate(colunas):
-            if col in colunas_centralizadas:
-                estilo_tabela.append(('ALIGN', (i, 0), (i, -1), 'CENTER'))
+            # Tratar coluna NF
+            elif coluna == 'NF':
+                formatados = [str(valor) if valor and not pd.isna(valor) else "" for valor in valores]
 
-        if incluir_total:
-            estilo_tabela.extend([
-                ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-                ('BACKGROUND', (0, -1), (-1, -1), colors.lightgrey),
-            ])
+            # Outras colunas
+            else:
+                formatados = ['' if pd.isna(valor) else str(valor) for valor in valores]
 
-        tabela.setStyle(TableStyle(estilo_tabela))
-        return tabela
+            colunas_formatadas.append(formatados)
+        return [list(linha) for linha in zip(*colunas_formatadas)]
+
+    def _linha_total(self, dados, colunas):
+        """Linha de subtotal da tabela (None se a tabela não tem coluna de valor)"""
+        coluna_valor = next((i for i, col in enumerate(colunas) 
+                        if col in ['VALOR', 'TOTAL']), -1)
+        if coluna_valor < 0:
+            return None
+
+        # Se for a tabela de colaboradores (verificar pelas colunas características)
+        if 'SALÁRIO' in colunas and 'TRANSPORTE' in colunas or '13º SALÁRIO' in colunas and 'FÉRIAS' in colunas:
+            linha_total = [''] * len(colunas)
+            linha_total[0] = 'Subtotal'
+            
+            # Calcular total para cada coluna numérica
+            for i, col in enumerate(colunas):
+                if col in ['SALÁRIO', 'FÉRIAS', 'RESCISÃO', '13º SALÁRIO', 'TRANSPORTE', 'CAFÉ', 'TOTAL']:
+                    total = dados[col].sum()
+                    linha_total[i] = self.formatar_numero(total)
+                elif col == 'DIAS':
+                    linha_total[i] = ''  # Deixar DIAS vazio
+            return linha_total
+
+        # Para outras tabelas, manter o comportamento original
+        total = dados[colunas[coluna_valor]].sum()
+        linha_total = [''] * len(colunas)
+        linha_total[coluna_valor-1] = 'Subtotal'
+        linha_total[coluna_valor] = self.formatar_numero(total)
+        return linha_total
 
     def criar_resumo_despesas(self, dados):
         """Cria o resumo das despesas para o relatório"""
@@ -1432,23 +1500,16 @@ class RelatorioHandler:
                 print("ERRO: elementos não é uma lista!")
                 elementos = []
                 
-            # Criar estilo customizado com espaçamento de 0
-            style_cabecalho = ParagraphStyle(
-                'CabecalhoStyle',
-                parent=self.config.style_normal,
-                alignment=2,
-                spaceBefore=0,
-                spaceAfter=0,
-                leading=12
-            )
+            # Estilo com espaçamento de 0 (compartilhado)
+            style_cabecalho = self.config.style_cabecalho_empresa
 
             try:
 ##                print(f"Antes de verificar logo - self.logo_path: {self.logo_path}")
 ##                print(f"Caminho da logo existe? {os.path.exists(self.logo_path)}")
                 
-                if self.logo_path and os.path.exists(self.logo_path):
+                if self.logo_path and leitor_logo(self.logo_path):
 ##                    print("Tentando criar Image")
-                    logo = Image(self.logo_path, width=200, height=100)
+                    logo = LogoRelatorio(self.logo_path, width=200, height=100)
 ##                    print("Image criada com sucesso")
                     
                     info_empresa = [
@@ -1464,12 +1525,7 @@ class RelatorioHandler:
                         rowHeights=[60]
                     )
                     
-                    cabecalho_table.setStyle(TableStyle([
-                        ('ALIGN', (0, 0), (0, 0), 'LEFT'),
-                        ('ALIGN', (1, 0), (1, 0), 'RIGHT'),
-                        ('VALIGN', (0, 0), (1, 0), 'TOP'),
-                        ('RIGHTPADDING', (1, 0), (1, 0), 0),
-                    ]))
+                    cabecalho_table.setStyle(ESTILO_CABECALHO_EMPRESA)
                     
 ##                    print("Adicionando tabela aos elementos")
                     elementos.append(cabecalho_table)
@@ -1506,11 +1562,7 @@ class RelatorioHandler:
             colWidths=[680, 100],  # Ajuste as larguras conforme necessário
             rowHeights=[20, 20]   
         )
-        cliente_table.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (0, -1), 'LEFT'),    # Alinhar informações do cliente à esquerda
-            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),   # Alinhar número e data à direita
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ]))
+        cliente_table.setStyle(ESTILO_INFO_CLIENTE)
         elementos.append(cliente_table)
 
     
@@ -1597,7 +1649,7 @@ class RelatorioHandler:
         logger.info("Detalhes adicionados com sucesso")
 
 
-    def carregar_taxas_administracao(self, arquivo_excel):
+    def carregar_taxas_administracao(self, arquivo_excel, sessao=None):
         """
         Carrega e processa os dados de taxas de administração da aba Contratos_ADM,
         considerando a estrutura específica da planilha:
@@ -1606,124 +1658,93 @@ class RelatorioHandler:
         - Linha 3: Dados do contrato
         - Linha 4: Dados dos administradores
         - Linha 5: Início dos dados das parcelas
+
+        Se uma SessaoPlanilha for informada, reutiliza o workbook já aberto.
         """
         logger.info(f"Iniciando carregamento de taxas de administração: {arquivo_excel}")
 
         try:
-            workbook = load_workbook(arquivo_excel, data_only=True)
-            if 'Contratos_ADM' not in workbook.sheetnames:
+            # Bloco PARCELAS (colunas Y–AF) lido de uma vez, a partir da linha 5
+            if sessao is not None:
+                ws_contratos = sessao.ws_contratos
+                bloco = ler_bloco_parcelas(ws_contratos, 5) if ws_contratos is not None else None
+            else:
+                bloco = carregar_bloco_parcelas(arquivo_excel, 5)
+
+            if bloco is None:
                 logger.warning("Aba 'Contratos_ADM' não encontrada no arquivo")
                 return pd.DataFrame()
 
-            ws_contratos = workbook['Contratos_ADM']
-            logger.debug(f"Total de linhas na planilha: {ws_contratos.max_row}")
-            
-            # Colunas para dados das parcelas com mapeamento correto
-            colunas_parcelas = {
-                'Y': 'referencia',      # Número do contrato
-                'Z': 'numero_parcela',  # Número da parcela
-                'AA': 'cpf_cnpj',       # CNPJ/CPF do Administrador
-                'AB': 'administrador',   # Nome do Administrador
-                'AC': 'data_vencimento', # Data Vencimento
-                'AD': 'valor_parcela',   # Valor da parcela
-                'AE': 'status',         # Status (PENDENTE/PAGO)
-                'AF': 'data_pagamento'  # Data Pagamento
-            }
-            
-            dados = []
-            linha_atual = 5  # Começar da linha 5
-            
-            while linha_atual <= ws_contratos.max_row:
-                valor_coluna_y = ws_contratos[f'Y{linha_atual}'].value
-                logger.debug(f"Processando linha {linha_atual} - Valor Y: {valor_coluna_y}")
-                
-                if valor_coluna_y:
-                    try:
-                        linha = {}
-                        
-                        # Processar cada coluna
-                        for col, nome in colunas_parcelas.items():
-                            valor = ws_contratos[f'{col}{linha_atual}'].value
-                            print(f"Coluna {col} ({nome}): {valor}")
-                            
-                            # Tratamento específico para cada tipo de campo
-                            if nome == 'valor_parcela':
-                                try:
-                                    if isinstance(valor, str):
-                                        valor = float(valor.replace('R$', '').replace('.', '').replace(',', '.').strip())
-                                    elif isinstance(valor, (int, float)):
-                                        valor = float(valor)
-                                    else:
-                                        valor = 0.0
-                                    print(f"Valor parcela convertido: {valor}")
-                                except (ValueError, TypeError) as e:
-                                    print(f"Erro ao converter valor_parcela: {e}")
-                                    valor = 0.0
-                                    
-                            elif nome == 'data_vencimento' or nome == 'data_pagamento':
-                                if isinstance(valor, datetime):
-                                    valor = valor.date()
-                                elif valor:
-                                    try:
-                                        valor = pd.to_datetime(valor).date()
-                                    except:
-                                        valor = None
-                                print(f"Data convertida: {valor}")
-                                        
-                            elif nome == 'status':
-                                valor = str(valor).upper() if valor else ''
-                                print(f"Status convertido: {valor}")
-                                
-                            else:
-                                # Outros campos mantêm o valor original
-                                valor = str(valor) if valor is not None else ''
-                                
-                            linha[nome] = valor
-                        
-                        # Verificar apenas as validações necessárias
-                        print("\nValidando dados:")
-                        print(f"Tem referência: {bool(linha['referencia'])}")
-                        print(f"Tem número da parcela: {bool(linha['numero_parcela'])}")
-                        print(f"Valor parcela > 0: {linha['valor_parcela'] > 0}")
-                        print(f"Data vencimento existe: {linha['data_vencimento'] is not None}")
-                        print(f"Status é PENDENTE: {linha['status'] == 'PENDENTE'}")
-                        
-                        # Verificações simplificadas
-                        if (linha['referencia'] and 
-                            linha['numero_parcela'] and 
-                            linha['valor_parcela'] > 0 and 
-                            linha['data_vencimento'] is not None and
-                            linha['status'] == 'PENDENTE'):
-                            dados.append(linha)
-                            print("Linha adicionada aos dados!")
-                        else:
-                            print("Linha não atendeu aos critérios de validação")
-                            
-                        linha_atual += 1
-                            
-                    except Exception as e:
-                        print(f"Erro ao processar linha {linha_atual}: {str(e)}")
-                        linha_atual += 1
-                        
-                else:
-                    linha_atual += 1
-            
-            # Criar DataFrame apenas com dados válidos
-            df = pd.DataFrame(dados) if dados else pd.DataFrame()
-            
-            logger.info(f"Total de parcelas encontradas: {len(dados)}")
+            logger.debug(f"Total de linhas lidas no bloco de parcelas: {len(bloco)}")
+
+            # Apenas linhas com referência (coluna Y) preenchida
+            bloco = bloco[bloco['referencia'].map(bool).astype(bool)]
+            if bloco.empty:
+                logger.info("Total de parcelas encontradas: 0")
+                return pd.DataFrame()
+
+            df = pd.DataFrame({
+                'referencia': self._texto_parcela(bloco['referencia']),
+                'numero_parcela': self._texto_parcela(bloco['numero_parcela']),
+                'cpf_cnpj': self._texto_parcela(bloco['cpf_cnpj']),
+                'administrador': self._texto_parcela(bloco['administrador']),
+                'data_vencimento': self._data_parcela(bloco['data_vencimento']),
+                'valor_parcela': self._valor_parcela(bloco['valor_parcela']),
+                'status': bloco['status'].map(lambda v: str(v).upper() if v else ''),
+                'data_pagamento': self._data_parcela(bloco['data_pagamento']),
+            })
+
+            # Verificações simplificadas
+            validas = (
+                (df['referencia'] != '') &
+                (df['numero_parcela'] != '') &
+                (df['valor_parcela'] > 0) &
+                df['data_vencimento'].notna() &
+                (df['status'] == 'PENDENTE')
+            )
+            logger.debug(f"Linhas descartadas na validação: {int((~validas).sum())}")
+            df = df[validas].reset_index(drop=True) if validas.any() else pd.DataFrame()
+
+            logger.info(f"Total de parcelas encontradas: {len(df)}")
+            if not df.empty:
+                logger.debug(f"Primeira parcela: {df.iloc[0].to_dict()}")
 
-            if dados:
-                print("\nPrimeira parcela:")
-                for k, v in dados[0].items():
-                    print(f"{k}: {v}")
-            
             return df
             
         except Exception as e:
             logger.error(f"Erro ao carregar taxas de administração: {str(e)}", exc_info=True)
             return pd.DataFrame()
 
+    @staticmethod
+    def _texto_parcela(coluna):
+        """Campos de texto do bloco PARCELAS ('' nas células vazias)"""
+        return coluna.map(lambda v: str(v) if v is not None else '')
+
+    @staticmethod
+    def _valor_parcela(coluna):
+        """Valor da parcela como float (números ou textos 'R$ 1.234,56'); 0.0 se inválido"""
+        eh_numero = coluna.map(lambda v: isinstance(v, (int, float)))
+        eh_texto = coluna.map(lambda v: isinstance(v, str))
+        valores = pd.Series(0.0, index=coluna.index)
+        valores[eh_numero] = coluna[eh_numero].astype(float)
+        if eh_texto.any():
+            texto = (coluna[eh_texto].astype(str)
+                     .str.replace('R$', '', regex=False)
+                     .str.replace('.', '', regex=False)
+                     .str.replace(',', '.', regex=False)
+                     .str.strip())
+            valores[eh_texto] = pd.to_numeric(texto, errors='coerce').fillna(0.0)
+        return valores
+
+    @staticmethod
+    def _data_parcela(coluna):
+        """Datas do bloco PARCELAS como date (None se inválida; células vazias mantidas)"""
+        preenchidas = coluna.map(bool)
+        datas = pd.to_datetime(coluna[preenchidas], format='mixed', errors='coerce')
+        convertidas = pd.Series([d.date() if not pd.isna(d) else None for d in datas],
+                                index=datas.index, dtype=object)
+        return coluna.astype(object).where(~preenchidas, convertidas)
+
     def processar_taxas_pendentes(self, df_contratos, data_relatorio):
         """
         Processa as taxas pendentes, agrupando por administrador e selecionando as próximas parcelas
@@ -1749,13 +1770,7 @@ class RelatorioHandler:
             # Ordenar resultado final
             df_final = df_final.sort_values(['administrador', 'data_vencimento'])
             
-            print("\nParcelas processadas:")
-            for _, row in df_final.iterrows():
-                print(f"Administrador: {row['administrador']}")
-                print(f"Contrato: {row['referencia']}")
-                print(f"Parcela: {row['numero_parcela']}")
-                print(f"Vencimento: {row['data_vencimento']}")
-                print(f"Valor: {row['valor_parcela']}\n")
+            logger.debug(f"Parcelas processadas: {len(df_final)}")
             
             return df_final
             
@@ -1783,15 +1798,7 @@ class RelatorioHandler:
             ))
             elementos.append(Paragraph(
                 "(Próximas 3 parcelas a vencer por contrato)",
-                ParagraphStyle(
-                    'SubtitleStyle',
-                    parent=config.style_normal,
-                    fontSize=9,
-                    leading=12,
-                    textColor=colors.HexColor('#4A4A4A'),
-                    spaceBefore=2,
-                    spaceAfter=12
-                )
+                config.style_subtitulo_taxas
             ))
             
             total_geral = 0.0
@@ -1802,28 +1809,11 @@ class RelatorioHandler:
                 cpf_cnpj = grupo['cpf_cnpj'].iloc[0]
                 elementos.append(Paragraph(
                     f"{administrador}",
-                    ParagraphStyle(
-                        'AdminStyle',
-                        parent=config.style_despesa,
-                        fontSize=11,
-                        leading=13,
-                        textColor=colors.HexColor('#2F4F4F'),
-                        spaceBefore=12,
-                        spaceAfter=2
-                    )
+                    config.style_administrador
                 ))
                 elementos.append(Paragraph(
                     f"CNPJ/CPF: {cpf_cnpj}",
-                    ParagraphStyle(
-                        'CpfCnpjStyle',
-                        parent=config.style_normal,
-                        fontSize=8,
-                        leading=10,
-                        leftIndent=10,
-                        textColor=colors.HexColor('#666666'),
-                        spaceBefore=0,
-                        spaceAfter=6
-                    )
+                    config.style_cpf_cnpj
                 ))
                 
                 subtotal_admin = 0.0
@@ -1849,46 +1839,14 @@ class RelatorioHandler:
                     # Criar e adicionar título do contrato
                     elementos.append(Paragraph(
                         f"Contrato {contrato}:",
-                        ParagraphStyle(
-                            'ContratoStyle',
-                            parent=config.style_normal,
-                            fontSize=9,
-                            leading=11,
-                            leftIndent=20,
-                            textColor=colors.HexColor('#2F4F4F'),
-                            spaceBefore=6,
-                            spaceAfter=3
-                        )
+                        config.style_contrato
                     ))
                     
                     # Criar tabela com estilo melhorado
                     tabela = Table(
                         dados_tabela,
                         colWidths=[100, 100, 100],
-                        style=TableStyle([
-                            # Estilo do cabeçalho
-                            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#E6E6E6')),
-                            ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#2F4F4F')),
-                            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                            ('FONTSIZE', (0, 0), (-1, 0), 8),
-                            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-                            ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
-                            ('TOPPADDING', (0, 0), (-1, 0), 6),
-                            
-                            # Estilo das células de dados
-                            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                            ('FONTSIZE', (0, 1), (-1, -1), 8),
-                            ('ALIGN', (0, 1), (1, -1), 'LEFT'),
-                            ('ALIGN', (-1, 1), (-1, -1), 'RIGHT'),
-                            ('BOTTOMPADDING', (0, 1), (-1, -1), 4),
-                            ('TOPPADDING', (0, 1), (-1, -1), 4),
-                            ('LEFTPADDING', (0, 0), (-1, -1), 10),
-                            ('RIGHTPADDING', (0, 0), (-1, -1), 10),
-                            
-                            # Grades e bordas
-                            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#CCCCCC')),
-                            ('BOX', (0, 0), (-1, -1), 1, colors.HexColor('#999999')),
-                        ])
+                        style=ESTILO_PARCELAS
                     )
                     
                     # Adicionar indentação na tabela
@@ -1898,31 +1856,13 @@ class RelatorioHandler:
                 # Adicionar subtotal do administrador
                 elementos.append(Paragraph(
                     f"Subtotal {administrador}: R$ {self.formatar_numero(subtotal_admin)}",
-                    ParagraphStyle(
-                        'SubtotalStyle',
-                        parent=config.style_normal,
-                        fontSize=9,
-                        leading=11,
-                        leftIndent=30,
-                        textColor=colors.HexColor('#2F4F4F'),
-                        spaceBefore=3,
-                        spaceAfter=12,
-                        alignment=TA_CENTER  # Centraliza o texto
-                    )
+                    config.style_subtotal_administrador
                 ))
             
             # Adicionar total geral
             elementos.append(Paragraph(
                 f"Total de Taxas Vincendas: R$ {self.formatar_numero(total_geral)}",
-                ParagraphStyle(
-                    'TotalStyle',
-                    parent=config.style_heading,
-                    fontSize=10,
-                    leading=12,
-                    textColor=colors.HexColor('#2F4F4F'),
-                    spaceBefore=12,
-                    spaceAfter=6
-                )
+                config.style_total_taxas
             ))
             
         except Exception as e:
@@ -1930,8 +1870,16 @@ class RelatorioHandler:
             raise # Para ajudar no debug
     
 
-    def gerar_relatorio_pdf(self, dados, caminho_output, arquivo_excel):
-        """Gera o relatório PDF final"""
+    def gerar_relatorio_pdf(self, dados, caminho_output, arquivo_excel, sessao=None, df_taxas=None,
+                            taxas_pendentes=None):
+        """
+        Gera o relatório PDF final
+
+        df_taxas: parcelas já lidas por carregar_taxas_administracao (reutilizadas
+        entre datas); se None, são lidas da planilha
+        taxas_pendentes: resultado de processar_taxas_pendentes para a data do
+        relatório; se None, é calculado a partir de df_taxas
+        """
         try:
             logger.debug("\nIniciando geração do PDF")
             logger.debug(f"Dados recebidos - acumulado: {dados.get('acumulado')}")
@@ -1967,23 +1915,9 @@ class RelatorioHandler:
             for linha in tabela_totais:
                 logger.debug(f"Linha: {linha}")
             
-            # Criar tabelas com estilos específicos
-            estilo_subtotais = TableStyle([
-                ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-                ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-                ('FONTSIZE', (0, 0), (-1, -1), 9),
-            ])
-
-            estilo_totais = TableStyle([
-                ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-                ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-                ('FONTSIZE', (0, 0), (-1, -1), 9),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-                ('BOX', (0, 0), (-1, 0), 1, colors.grey),
-                ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-                ('TEXTCOLOR', (0, -1), (-1, -1), colors.black),
-            ])
+            # Criar tabelas com estilos específicos (modelos compartilhados)
+            estilo_subtotais = ESTILO_SUBTOTAIS
+            estilo_totais = ESTILO_TOTAIS
 
             tabela_esquerda = Table(tabela_subtotais, colWidths=[300, 70])
             tabela_esquerda.setStyle(estilo_subtotais)
@@ -2009,11 +1943,13 @@ class RelatorioHandler:
                 self.adicionar_lancamentos_futuros(elementos, dados)
 
             # Carregar e processar taxas de administração
-            df_taxas = self.carregar_taxas_administracao(arquivo_excel)
-            if not df_taxas.empty:
+            df_taxas_processadas = taxas_pendentes
+            if df_taxas_processadas is None:
+                if df_taxas is None:
+                    df_taxas = self.carregar_taxas_administracao(arquivo_excel, sessao=sessao)
                 df_taxas_processadas = self.processar_taxas_pendentes(df_taxas, dados['data_relatorio'])
-                if not df_taxas_processadas.empty:
-                    self.adicionar_taxas_administracao(elementos, df_taxas_processadas, self.config)
+            if not df_taxas_processadas.empty:
+                self.adicionar_taxas_administracao(elementos, df_taxas_processadas, self.config)
 
             # Gerar PDF
             doc.build(elementos)
@@ -2176,69 +2112,16 @@ class RelatorioLancamentosPendentes:
         try:
             print(f"\nProcessando arquivo: {caminho_arquivo}")
             print(f"Data de referência: {data_referencia}")
-            
-            # Carregar dados do arquivo
-            df = pd.read_excel(caminho_arquivo, sheet_name='Dados')
-            df = df.fillna("")
-            
-            wb = load_workbook(caminho_arquivo, data_only=True)
-            ws_resumo = wb['RESUMO']
-            
-            # Obter informações do cliente
-            nome_cliente = ws_resumo['A3'].value
-            print(f"Cliente: {nome_cliente}")
-            
-            # Converter DATA_REL para datetime
-            df['DATA_REL'] = pd.to_datetime(df['DATA_REL'])
-            
-            # Filtrar lançamentos posteriores à data de referência
-            df_pendentes = df[df['DATA_REL'] > data_referencia].copy()
-            
-            # Remover duplicatas baseado em todas as colunas relevantes
-            colunas_check = ['DATA_REL', 'TP_DESP', 'NOME', 'REFERÊNCIA', 'VALOR']
-            df_pendentes = df_pendentes.drop_duplicates(subset=colunas_check)
-            print(f"Lançamentos encontrados (após remover duplicatas): {len(df_pendentes)}")
-            
-            if df_pendentes.empty:
+
+            # Aba Dados via cache colunar e nome do cliente (RESUMO!A3) via metadados do cache
+            dados = ler_pendentes_cliente(caminho_arquivo, data_referencia)
+            if dados is None:
                 print("Nenhum lançamento pendente encontrado")
                 return None
-            
-            # Identificar parcelamentos
-            df_pendentes['is_parcelamento'] = df_pendentes['REFERÊNCIA'].str.contains(
-                'parcela|parcelamento', 
-                case=False, 
-                na=False
-            )
-            
-            # Converter valores para float
-            df_pendentes['VALOR'] = pd.to_numeric(
-                df_pendentes['VALOR'].astype(str)
-                .str.replace('R$', '')
-                .str.replace(',', '.')
-                .str.strip(), 
-                errors='coerce'
-            ).fillna(0.0)
-            
-            # Converter tipo de despesa para inteiro
-            df_pendentes['TP_DESP'] = df_pendentes['TP_DESP'].astype(int)
-            
-            # Formatar datas
-            if 'DT_VENCTO' in df_pendentes.columns:
-                df_pendentes['DT_VENCTO'] = pd.to_datetime(
-                    df_pendentes['DT_VENCTO'], 
-                    format='%d/%m/%Y', 
-                    errors='coerce'
-                )
-            
-            # Ordenar por data
-            df_pendentes = df_pendentes.sort_values(['DATA_REL', 'TP_DESP'])
-            
-            return {
-                'nome_cliente': nome_cliente,
-                'ultima_data': data_referencia,
-                'lancamentos': df_pendentes,
-                'arquivo': caminho_arquivo
-            }
+
+            print(f"Cliente: {dados['nome_cliente']}")
+            print(f"Lançamentos encontrados (após remover duplicatas): {len(dados['lancamentos'])}")
+            return dados
             
         except Exception as e:
             print(f"Erro ao processar arquivo {caminho_arquivo}: {str(e)}")
@@ -2246,113 +2129,15 @@ class RelatorioLancamentosPendentes:
             traceback.print_exc()
             return None
 
-    def gerar_relatorio_html(self, dados_clientes, caminho_saida):
+    def gerar_relatorio_html(self, dados_clientes, caminho_saida, sob_demanda=False):
         """
-        Gera um relatório HTML com os lançamentos pendentes
+        Gera um relatório HTML com os lançamentos pendentes, gravando cada
+        cliente direto no arquivo. Com sob_demanda=True cada cliente é uma
+        seção recolhida, montada pelo navegador apenas quando aberta.
         """
-        def formatar_valor(valor):
-            """Formata valor para o padrão brasileiro"""
-            return f"{valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
-            
         try:
-            # Lista para armazenar as partes do HTML
-            html_parts = []
-            
-            # Cabeçalho do documento
-            html_parts.extend([
-                '<!DOCTYPE html>',
-                '<html>',
-                '<head>',
-                '<meta charset="utf-8">',
-                '<title>Relatório de Lançamentos Pendentes</title>',
-                '<style>',
-                'body { font-family: Arial, sans-serif; margin: 20px; background-color: #f0f2f5; }',
-                'h1 { color: #2c3e50; text-align: center; margin-bottom: 30px; }',
-                '.cliente { background-color: white; margin: 20px 0; padding: 20px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }',
-                '.cliente-header { background-color: #f8f9fa; padding: 15px; margin: -20px -20px 20px -20px; border-radius: 8px 8px 0 0; border-bottom: 1px solid #dee2e6; }',
-                '.cliente-header h2 { margin: 0; color: #2c3e50; }',
-                'table { width: 100%; border-collapse: collapse; margin-top: 15px; background-color: white; }',
-                'th, td { padding: 12px; text-align: left; border: 1px solid #dee2e6; font-size: 14px; }',
-                'th { background-color: #f8f9fa; font-weight: bold; color: #495057; }',
-                'tr:nth-child(even) { background-color: #f8f9fa; }',
-                '.parcelamento { background-color: #fff3e0; }',
-                '.valor { text-align: right; }',
-                '.resumo { margin-top: 20px; padding: 15px; background-color: #e8f5e9; border-radius: 5px; font-weight: bold; }',
-                '.data-geracao { text-align: center; color: #6c757d; margin-bottom: 30px; }',
-                '</style>',
-                '</head>',
-                '<body>',
-                '<h1>Relatório de Lançamentos Pendentes</h1>',
-                f'<p class="data-geracao">Gerado em: {datetime.now().strftime("%d/%m/%Y %H:%M")}</p>'
-            ])
-
-            # Processar dados de cada cliente
-            for dados in dados_clientes:
-                if dados is None or dados['lancamentos'].empty:
-                    continue
-
-                df = dados['lancamentos']
-                total_cliente = df['VALOR'].sum()
-
-                # Cabeçalho do cliente
-                html_parts.extend([
-                    '<div class="cliente">',
-                    '<div class="cliente-header">',
-                    f'<h2>{dados["nome_cliente"]}</h2>',
-                    f'<p>Última data de fechamento: {dados["ultima_data"].strftime("%d/%m/%Y")}</p>',
-                    '</div>',
-                    '<table>',
-                    '<tr>',
-                    '<th>Data</th>',
-                    '<th>Tipo</th>',
-                    '<th>Nome</th>',
-                    '<th>Referência</th>',
-                    '<th>Vencimento</th>',
-                    '<th>Valor</th>',
-                    '</tr>'
-                ])
-
-                # Ordenar por data e tipo
-                df = df.sort_values(['DATA_REL', 'TP_DESP'])
-                
-                # Adicionar linhas de dados
-                for _, row in df.iterrows():
-                    classe = 'parcelamento' if row['is_parcelamento'] else ''
-                    valor = float(row['VALOR']) if pd.notnull(row['VALOR']) else 0.0
-                    
-                    html_parts.extend([
-                        f'<tr class="{classe}">',
-                        f'<td>{row["DATA_REL"].strftime("%d/%m/%Y")}</td>',
-                        f'<td>{int(row["TP_DESP"])}</td>',
-                        f'<td>{row["NOME"]}</td>',
-                        f'<td>{row["REFERÊNCIA"]}</td>',
-                        f'<td>{row["DT_VENCTO"].strftime("%d/%m/%Y") if pd.notnull(row["DT_VENCTO"]) else ""}</td>',
-                        f'<td class="valor">{formatar_valor(valor)}</td>',
-                        '</tr>'
-                    ])
-
-                # Fechar tabela e adicionar resumo
-                html_parts.extend([
-                    '</table>',
-                    '<div class="resumo">',
-                    f'<p>Total de lançamentos: R$ {formatar_valor(total_cliente)}</p>',
-                    '</div>',
-                    '</div>'
-                ])
-
-            # Fechar documento HTML
-            html_parts.extend([
-                '</body>',
-                '</html>'
-            ])
-
-            # Juntar todas as partes e salvar
-            html_content = '\n'.join(html_parts)
-            
-            with open(caminho_saida, 'w', encoding='utf-8') as f:
-                f.write(html_content)
-                
-            print(f"Relatório HTML gerado com sucesso em: {caminho_saida}")
+            clientes = escrever_relatorio_html(dados_clientes, caminho_saida, sob_demanda)
+            print(f"Relatório HTML gerado com sucesso em: {caminho_saida} ({clientes} clientes)")
             
         except Exception as e:
             print(f"Erro ao gerar relatório HTML: {str(e)}")
@@ -2360,6 +2145,13 @@ class RelatorioLancamentosPendentes:
             traceback.print_exc()
             raise
 
+    def exportar_dados(self, dados_clientes, caminho_saida):
+        """Grava ao lado do HTML os arquivos .csv e .json com os mesmos lançamentos"""
+        base = os.path.splitext(caminho_saida)[0]
+        exportar_csv(dados_clientes, base + '.csv')
+        exportar_json(dados_clientes, base + '.json')
+        print(f"Dados exportados em: {base}.csv / {base}.json")
+
     def processar_pasta(self, pasta, data_referencia=None):
         """
         Processa todos os arquivos Excel da pasta
@@ -2384,16 +2176,9 @@ class RelatorioLancamentosPendentes:
             if data_referencia is None:
                 data_referencia = datetime.now()
                 
-            arquivos = [f for f in os.listdir(pasta) if f.endswith('.xlsx')]
-            print(f"Encontrados {len(arquivos)} arquivos Excel")
-            
-            dados_clientes = []
-            for arquivo in arquivos:
-                caminho_completo = os.path.join(pasta, arquivo)
-                dados = self.processar_arquivo_cliente(caminho_completo, data_referencia)
-                if dados is not None:
-                    dados_clientes.append(dados)
-                    
+            # Planilhas inalteradas vêm do cache; as alteradas são lidas em paralelo
+            dados_clientes = pendentes_da_pasta(pasta, data_referencia)
+
             print(f"Total de clientes processados: {len(dados_clientes)}")
             return dados_clientes
             
@@ -2403,7 +2188,8 @@ class RelatorioLancamentosPendentes:
             traceback.print_exc()
             return []
 
-    def gerar_relatorio_pendentes(self, pasta_entrada, arquivo_saida, data_referencia):
+    def gerar_relatorio_pendentes(self, pasta_entrada, arquivo_saida, data_referencia,
+                                  sob_demanda=False, exportar=False):
         """
         Método principal para gerar o relatório de lançamentos pendentes
         
@@ -2417,6 +2203,10 @@ class RelatorioLancamentosPendentes:
             Caminho onde o relatório HTML será salvo
         data_referencia : datetime
             Data de referência para filtrar lançamentos
+        sob_demanda : bool
+            Seções por cliente carregadas ao expandir (relatórios grandes)
+        exportar : bool
+            Gravar também os arquivos .csv e .json com os lançamentos
         """
         try:
             print("\nGerando relatório de lançamentos pendentes...")
@@ -2432,7 +2222,9 @@ class RelatorioLancamentosPendentes:
                 return False
                 
             # Gerar relatório HTML
-            self.gerar_relatorio_html(dados_clientes, arquivo_saida)
+            self.gerar_relatorio_html(dados_clientes, arquivo_saida, sob_demanda)
+            if exportar:
+                self.exportar_dados(dados_clientes, arquivo_saida)
             
             # Abrir o relatório no navegador padrão
             if platform.system() == 'Darwin':       # macOS
@@ -2453,12 +2245,66 @@ class RelatorioLancamentosPendentes:
 
         
 
-def main():
+def executar_linha_comando(argv):
+    """
+    Gera os relatórios de todas as planilhas de uma pasta, sem interface
+
+    Grava os PDFs ao lado de cada planilha e um resumo JSON da execução.
+    Retorna o código de saída: 0 se todos os relatórios foram gerados, 1 se
+    algum falhou.
+    """
+    parser = argparse.ArgumentParser(
+        prog='python -m src.relatorio_despesas_aprimorado',
+        description='Gera os relatórios de despesas de todas as planilhas de clientes de uma pasta.')
+    parser.add_argument('--data', required=True,
+                        type=lambda valor: datetime.strptime(valor, '%d/%m/%Y'),
+                        help='Data do relatório (dd/mm/aaaa)')
+    parser.add_argument('--pasta', required=True, help='Pasta com as planilhas dos clientes')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Processos simultâneos (padrão: número de núcleos)')
+    parser.add_argument('--sem-futuros', action='store_true', help='Não incluir lançamentos futuros')
+    parser.add_argument('--todos', action='store_true',
+                        help='Gerar todos os relatórios, mesmo os que não mudaram desde a última geração')
+    parser.add_argument('--resumo', default=None,
+                        help='Arquivo JSON do resumo (padrão: <pasta>/resumo_relatorios_<data>.json)')
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.pasta):
+        parser.error(f"pasta não encontrada: {args.pasta}")
+
+    arquivos = arquivos_da_pasta(args.pasta)
+    logger.info(f"Gerando {len(arquivos)} relatórios de {args.pasta} para {args.data.strftime('%d/%m/%Y')}")
+
+    lote = LoteRelatorios(arquivos, args.data, not args.sem_futuros, max_workers=args.workers,
+                          somente_alterados=not args.todos)
+    lote.iniciar(lambda r: logger.info(
+        f"{'IGUAL' if r.ignorado else 'OK' if r.sucesso else 'ERRO'} {r.nome_arquivo} "
+        f"({r.segundos:.1f}s){'' if r.sucesso else ': ' + r.erro}"))
+    lote.aguardar()
+    resumo = lote.resumo()
+
+    caminho_resumo = args.resumo or os.path.join(
+        args.pasta, f"resumo_relatorios_{args.data.strftime('%d-%m-%Y')}.json")
+    with open(caminho_resumo, 'w', encoding='utf-8') as f:
+        json.dump(resumo, f, ensure_ascii=False, indent=2)
+
+    logger.info(f"{resumo['gerados']}/{resumo['total']} relatórios gerados ({resumo['ignorados']} sem alterações) "
+                f"em {resumo['segundos']:.1f}s "
+                f"- resumo: {caminho_resumo}")
+    return 0 if resumo['falhas'] == 0 else 1
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv:
+        return executar_linha_comando(argv)
+
     try:
         app = RelatorioUI(None)
         app.root.mainloop()
     except Exception as e:
         print(f"Erro durante a execução: {str(e)}")
+    return 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
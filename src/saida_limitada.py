@@ -0,0 +1,100 @@
+"""
+Captura limitada da saída (stdout/stderr) em produção
+
+SaidaLimitada substitui o StringIO usado pelo OutputManager: guarda apenas as
+últimas max_linhas linhas escritas (buffer circular), de modo que a memória
+não cresce com os prints dos laços de processamento ao longo do dia. Opcionalmente,
+todas as linhas também são gravadas em um arquivo com rotação por tamanho.
+"""
+import io
+import logging
+import threading
+from collections import deque
+from logging.handlers import RotatingFileHandler
+
+MAX_LINHAS_PADRAO = 2000
+# Linhas mais longas são truncadas no buffer (o arquivo recebe a linha inteira)
+MAX_CARACTERES_LINHA = 2000
+MAX_BYTES_ARQUIVO = 5 * 1024 * 1024
+ARQUIVOS_BACKUP = 3
+
+
+class _ArquivoRotativo(RotatingFileHandler):
+    def handleError(self, record):
+        # O erro seria escrito em sys.stderr, que pode ser a própria SaidaLimitada
+        pass
+
+
+class SaidaLimitada(io.TextIOBase):
+    """Stream de texto que mantém só as últimas linhas escritas"""
+
+    def __init__(self, max_linhas=MAX_LINHAS_PADRAO, arquivo=None,
+                 max_bytes=MAX_BYTES_ARQUIVO, backups=ARQUIVOS_BACKUP):
+        """
+        Args:
+            max_linhas (int): Linhas mantidas em memória
+            arquivo (str): Arquivo para gravar todas as linhas (None para não gravar)
+            max_bytes (int): Tamanho do arquivo antes da rotação
+            backups (int): Arquivos antigos mantidos na rotação (.1, .2, ...)
+        """
+        super().__init__()
+        self.linhas = deque(maxlen=max_linhas)
+        self.linha_atual = []  # partes da linha ainda sem quebra
+        self.tamanho_linha_atual = 0
+        self.total_linhas = 0
+        self._trava = threading.Lock()
+        self.arquivo = None
+        if arquivo:
+            self.arquivo = _ArquivoRotativo(arquivo, maxBytes=max_bytes, backupCount=backups,
+                                            encoding='utf-8', delay=True)
+            self.arquivo.setFormatter(logging.Formatter('%(message)s'))
+
+    def writable(self):
+        return True
+
+    def write(self, texto):
+        with self._trava:
+            partes = texto.split('\n')
+            for parte in partes[:-1]:
+                self.linha_atual.append(parte)
+                self._fechar_linha()
+            if partes[-1]:
+                self.linha_atual.append(partes[-1])
+                self.tamanho_linha_atual += len(partes[-1])
+                # Texto sem quebra de linha (ex.: barra de progresso) não cresce indefinidamente
+                if self.tamanho_linha_atual > MAX_CARACTERES_LINHA:
+                    self._fechar_linha()
+        return len(texto)
+
+    def _fechar_linha(self):
+        linha = ''.join(self.linha_atual)
+        self.linha_atual = []
+        self.tamanho_linha_atual = 0
+        self.total_linhas += 1
+        self.linhas.append(linha[:MAX_CARACTERES_LINHA])
+        if self.arquivo is not None:
+            self.arquivo.handle(logging.makeLogRecord({'msg': linha}))
+
+    def flush(self):
+        with self._trava:
+            if self.arquivo is not None:
+                self.arquivo.flush()
+
+    def close(self):
+        with self._trava:
+            if self.arquivo is not None:
+                self.arquivo.close()
+                self.arquivo = None
+        super().close()
+
+    def ultimas_linhas(self, n=None):
+        """Últimas n linhas capturadas (todas as mantidas em memória se n for None)"""
+        with self._trava:
+            linhas = list(self.linhas)
+            if self.linha_atual:
+                linhas.append(''.join(self.linha_atual))
+        return linhas if n is None else linhas[-n:]
+
+    def getvalue(self):
+        """Conteúdo mantido em memória, como StringIO.getvalue"""
+        return '\n'.join(self.ultimas_linhas())
@@ -0,0 +1,98 @@
+"""
+Sessão de leitura da planilha de um cliente
+
+Abre o arquivo .xlsx do cliente uma única vez e fornece as abas Dados,
+RESUMO e Contratos_ADM para todos os métodos que geram o relatório. O
+workbook é aberto em modo somente leitura: as abas são lidas linha a linha
+(iter_rows) sem carregar todas as células na memória.
+"""
+import logging
+import warnings
+
+from openpyxl import load_workbook
+
+try:
+    from src.cache_dados import carregar_dados_cliente, ler_serie_acumulada, serie_acumulada
+except ImportError:
+    from cache_dados import carregar_dados_cliente, ler_serie_acumulada, serie_acumulada
+
+logger = logging.getLogger(__name__)
+
+warnings.filterwarnings("ignore", category=UserWarning, module="openpyxl")
+
+
+class SessaoPlanilha:
+    """Mantém o workbook de um cliente aberto durante a geração de um relatório"""
+
+    def __init__(self, arquivo_excel):
+        self.arquivo = arquivo_excel
+        self._workbook = None
+        self._dados = None
+        self._serie = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.fechar()
+        return False
+
+    @property
+    def workbook(self):
+        """Workbook somente leitura com valores calculados (data_only=True)"""
+        if self._workbook is None:
+            logger.debug(f"Abrindo workbook: {self.arquivo}")
+            self._workbook = load_workbook(self.arquivo, read_only=True, data_only=True)
+        return self._workbook
+
+    @property
+    def ws_resumo(self):
+        """Aba RESUMO do cliente"""
+        return self.workbook['RESUMO']
+
+    @property
+    def ws_contratos(self):
+        """Aba Contratos_ADM ou None se o arquivo não possuir a aba"""
+        if 'Contratos_ADM' not in self.workbook.sheetnames:
+            return None
+        return self.workbook['Contratos_ADM']
+
+    @property
+    def nome_cliente(self):
+        return self.ws_resumo['A3'].value
+
+    @property
+    def endereco_cliente(self):
+        return self.ws_resumo['A4'].value
+
+    def dados(self):
+        """
+        Retorna a aba Dados como DataFrame, equivalente a
+        pd.read_excel(arquivo, sheet_name='Dados'). A leitura passa pelo cache
+        colunar; se ele estiver desatualizado, é reconstruído a partir da
+        planilha (leitura própria do pandas, que fecha o workbook ao terminar e
+        por isso não usa o da sessão). Cada chamada devolve uma cópia para que
+        o chamador possa alterá-la.
+        """
+        if self._dados is None:
+            self._dados = carregar_dados_cliente(self.arquivo)
+        return self._dados.copy()
+
+    def serie_acumulada(self):
+        """
+        Série acumulada de VALOR por DATA_REL (ver cache_dados), lida do cache
+        da planilha ou, se indisponível, calculada a partir da aba Dados
+        """
+        if self._serie is None:
+            if self._dados is None:
+                self._dados = carregar_dados_cliente(self.arquivo)
+            self._serie = ler_serie_acumulada(self.arquivo) or serie_acumulada(self._dados)
+        return self._serie
+
+    def fechar(self):
+        """Libera o workbook da memória"""
+        if self._workbook is not None:
+            self._workbook.close()
+        self._workbook = None
+        self._dados = None
+        self._serie = None
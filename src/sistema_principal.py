@@ -30,7 +30,6 @@ import importlib
 import sys
 import os
 import logging
-from io import StringIO
 from datetime import datetime
 from dotenv import load_dotenv
 load_dotenv()
@@ -73,6 +72,11 @@ except ImportError:
 
 from src.gestao_taxas import GestaoTaxasAdministracao
 
+try:
+    from src.saida_limitada import SaidaLimitada, MAX_LINHAS_PADRAO
+except ImportError:
+    from saida_limitada import SaidaLimitada, MAX_LINHAS_PADRAO
+
 # Importar o módulo de controle de versões
 try:
     import version_control
@@ -105,8 +109,9 @@ def resource_path(relative_path):
 
 
 class SistemaPrincipal:
-    def __init__(self):
+    def __init__(self, output_manager=None):
         self.usuario_atual = None
+        self.output_manager = output_manager
         self.root = tk.Tk()
         
         # Configurar a janela principal
@@ -211,6 +216,15 @@ class SistemaPrincipal:
             command=lambda: version_control.show_version_dialog(self.root)
         )
         about_button.pack(side='left', padx=10)
+
+        # Botão Saída (últimas linhas capturadas pelo OutputManager em produção)
+        if self.output_manager is not None and not self.output_manager.dev_mode:
+            saida_button = ttk.Button(
+                bottom_frame,
+                text="Saída",
+                command=self.mostrar_saida
+            )
+            saida_button.pack(side='left', padx=10)
         
         # Botão Sair em destaque (lado direito)
         adicionar_btn = ttk.Button(bottom_frame, text="Sair", 
@@ -351,6 +365,43 @@ class SistemaPrincipal:
             self.root.deiconify()
 
 
+    def mostrar_saida(self):
+        """Mostra as últimas linhas de saída (stdout/stderr) capturadas"""
+        janela = tk.Toplevel(self.root)
+        janela.title("Saída do Sistema")
+        janela.geometry("900x500")
+
+        controles = ttk.Frame(janela)
+        controles.pack(fill='x', padx=10, pady=5)
+        ttk.Label(controles, text="Últimas linhas:").pack(side='left')
+        quantidade = tk.IntVar(janela, value=200)
+        ttk.Spinbox(controles, from_=10, to=self.output_manager.max_linhas, increment=50,
+                    textvariable=quantidade, width=8).pack(side='left', padx=5)
+
+        quadro_texto = ttk.Frame(janela)
+        quadro_texto.pack(expand=True, fill='both', padx=10, pady=(0, 10))
+        texto = tk.Text(quadro_texto, wrap='none', font=('Courier', 9))
+        barra = ttk.Scrollbar(quadro_texto, orient='vertical', command=texto.yview)
+        texto.configure(yscrollcommand=barra.set)
+        barra.pack(side='right', fill='y')
+        texto.pack(side='left', expand=True, fill='both')
+
+        def atualizar():
+            try:
+                n = quantidade.get()
+            except tk.TclError:
+                n = 200
+            saida = self.output_manager.ultimas_linhas(n)
+            texto.configure(state='normal')
+            texto.delete('1.0', 'end')
+            texto.insert('end', "=== stdout ===\n" + "\n".join(saida['stdout']) + "\n\n")
+            texto.insert('end', "=== stderr ===\n" + "\n".join(saida['stderr']) + "\n")
+            texto.configure(state='disabled')
+            texto.see('end')
+
+        ttk.Button(controles, text="Atualizar", command=atualizar).pack(side='left', padx=5)
+        atualizar()
+
     def sair_sistema(self):
         """Fecha o sistema após confirmação"""
         if messagebox.askyesno("Confirmar Saída", "Deseja realmente sair do sistema?"):
@@ -368,13 +419,33 @@ class SistemaPrincipal:
 
 
 class OutputManager:
-    def __init__(self, logger=None):
+    """
+    Captura stdout/stderr em produção
+
+    Os buffers guardam só as últimas max_linhas linhas (SaidaLimitada), para a
+    memória não crescer com os prints ao longo do dia. Com gravar_arquivo, todas
+    as linhas também vão para logs/saida_<data>.log e logs/erros_<data>.log,
+    com rotação por tamanho. Padrões nas variáveis de ambiente SAIDA_MAX_LINHAS
+    e SAIDA_ARQUIVO.
+    """
+    def __init__(self, logger=None, max_linhas=None, gravar_arquivo=None):
         self.dev_mode = os.getenv('DEV_MODE', 'False').lower() == 'true'
         self.logger = logger
+        if max_linhas is None:
+            max_linhas = int(os.getenv('SAIDA_MAX_LINHAS', MAX_LINHAS_PADRAO))
+        if gravar_arquivo is None:
+            gravar_arquivo = os.getenv('SAIDA_ARQUIVO', 'False').lower() == 'true'
+        self.max_linhas = max_linhas
         
         if not self.dev_mode:
-            self.stdout_buffer = StringIO()
-            self.stderr_buffer = StringIO()
+            arquivo_saida = arquivo_erros = None
+            if gravar_arquivo:
+                os.makedirs('logs', exist_ok=True)
+                data = datetime.now().strftime("%Y%m%d")
+                arquivo_saida = os.path.join('logs', f'saida_{data}.log')
+                arquivo_erros = os.path.join('logs', f'erros_{data}.log')
+            self.stdout_buffer = SaidaLimitada(max_linhas, arquivo_saida)
+            self.stderr_buffer = SaidaLimitada(max_linhas, arquivo_erros)
             self.original_stdout = sys.stdout
             self.original_stderr = sys.stderr
             
@@ -411,6 +482,8 @@ class OutputManager:
         if not self.dev_mode:
             sys.stdout = self.original_stdout
             sys.stderr = self.original_stderr
+            self.stdout_buffer.close()
+            self.stderr_buffer.close()
     
     def get_output(self):
         """Retorna o conteúdo dos buffers"""
@@ -421,6 +494,15 @@ class OutputManager:
             }
         return None
 
+    def ultimas_linhas(self, n=None):
+        """Últimas n linhas capturadas de stdout e stderr"""
+        if not self.dev_mode:
+            return {
+                'stdout': self.stdout_buffer.ultimas_linhas(n),
+                'stderr': self.stderr_buffer.ultimas_linhas(n)
+            }
+        return None
+
 # Modificar o sistema_principal.py para usar assim:
 def main():
     from config.logger_config import system_logger
@@ -429,10 +511,13 @@ def main():
     output_manager.start()
     
     try:
-        app = SistemaPrincipal()
+        app = SistemaPrincipal(output_manager=output_manager)
         app.run()
     finally:
         output_manager.stop()
 
 if __name__ == '__main__':
+    # Necessário para os pools de processos no executável (PyInstaller/Windows)
+    import multiprocessing
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file